@@ -70,6 +70,30 @@ class ChatResponse(BaseModel):
     response: str
     actions: Optional[List[Action]] = None
 
+class ChatMetrics(BaseModel):
+    cached_turns: int
+    uncached_turns: int
+    input_tokens_saved: int
+    mean_cached_latency: Optional[float] = None
+    mean_uncached_latency: Optional[float] = None
+    latency_saved: Optional[float] = None
+    context_cache_created: int = 0
+    context_cache_refreshed: int = 0
+    context_cache_failures: int = 0
+    response_cache_hits: int = 0
+    response_cache_misses: int = 0
+    fast_path_hits: int = 0
+    fast_path_misses: int = 0
+    fast_path_hit_rate: Optional[float] = None
+    fast_path_latency_saved: Optional[float] = None
+    llm_retries: int = 0
+    llm_timeouts: int = 0
+    llm_hedges: int = 0
+    llm_hedge_wins: int = 0
+    circuit_state: Optional[str] = None
+    circuit_short_circuits: int = 0
+    last_prompt_tokens: Optional[int] = None
+
 class EstimateRequest(BaseModel):
     isFirstTimeBuyer: bool
     grossIncome: float
@@ -93,12 +117,23 @@ class EstimateRequest(BaseModel):
     loanTerm: int
     interestRate: float
     borrowingType: str
+    financialYear: Optional[str] = None # Tax and HECS tables to use, defaults to the current year
 
 class EstimateResponse(BaseModel):
     estimate: float
     loan_repayment: float
     summary: str
 
+class ChatTurnResponse(ChatResponse):
+    """
+    Response model for a chat turn.
+    
+    Attributes:
+        estimate (Optional[EstimateResponse]): The session's estimate after applying the turn's
+            field updates, or None if the session has no estimate or the turn updated no fields
+    """
+    estimate: Optional[EstimateResponse] = None
+
 class BorrowingResponse(BaseModel):
     total_income: float
     total_income_after_tax: float
@@ -114,6 +149,162 @@ class BorrowingResponse(BaseModel):
     loan_purpose: str
     loan_repayment: float
 
+class BatchEstimateRequest(BaseModel):
+    profiles: List[EstimateRequest] = PydanticField(min_length=1, max_length=1000)
+
+class BatchEstimateResponse(BaseModel):
+    results: List[BorrowingResponse]
+
+class EstimateCacheStats(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    version: str
+
+class SensitivityRange(BaseModel):
+    """
+    An evenly spaced range of values to try for one field.
+    
+    Attributes:
+        start (float): First value in the range
+        stop (float): Last value in the range (inclusive)
+        steps (int): Number of values between start and stop
+    """
+    start: float
+    stop: float
+    steps: int = PydanticField(default=5, ge=1, le=200)
+
+class SensitivityRequest(BaseModel):
+    """
+    Request model for a borrowing power sensitivity grid.
+    
+    Fields left as None keep the value from the profile. Ranges use the same units
+    as the profile, e.g. grossIncome is in the profile's incomeFrequency.
+    """
+    profile: EstimateRequest
+    interestRate: Optional[SensitivityRange] = None
+    loanTerm: Optional[SensitivityRange] = None
+    grossIncome: Optional[SensitivityRange] = None
+    livingExpenses: Optional[SensitivityRange] = None
+    creditCardLimits: Optional[SensitivityRange] = None
+
+class SensitivityAxis(BaseModel):
+    field: str
+    values: List[float]
+
+class SensitivityResponse(BaseModel):
+    """
+    Response model for a borrowing power sensitivity grid.
+    
+    Attributes:
+        axes (List[SensitivityAxis]): The varied fields, in grid dimension order
+        borrowing_power (List): Nested lists indexed by the axes in order
+        loan_repayment (List): Nested lists indexed by the axes in order
+    """
+    axes: List[SensitivityAxis]
+    borrowing_power: List[Any]
+    loan_repayment: List[Any]
+
+class SolveRequest(BaseModel):
+    """
+    Request model for solving a profile backwards from target loan amounts.
+    
+    Attributes:
+        profile (EstimateRequest): The profile to hold fixed apart from solveFor
+        solveFor (str): The field to solve for
+        targets (List[float]): Target loan amounts
+    """
+    profile: EstimateRequest
+    solveFor: Literal["grossIncome", "livingExpenses", "interestRate", "loanTerm"]
+    targets: List[float] = PydanticField(min_length=1, max_length=1000)
+
+class SolveResponse(BaseModel):
+    """
+    Response model for the inverse borrowing solver.
+    
+    Attributes:
+        solveFor (str): The field that was solved for
+        targets (List[float]): Target loan amounts, in request order
+        solutions (List[Optional[float]]): The value of solveFor needed for each target,
+            or None if the target cannot be reached by changing that field alone
+    """
+    solveFor: str
+    targets: List[float]
+    solutions: List[Optional[float]]
+
+class AmortizationScenario(BaseModel):
+    """
+    One loan to build an amortization schedule for.
+    
+    Attributes:
+        principal (float): Loan amount, e.g. the borrowing_power from an estimate
+        interestRate (float): Yearly interest rate in percent
+        loanTerm (int): Loan term in years
+        extraRepayment (float): Extra repayment made every month
+        offsetBalance (float): Balance held in an offset account
+    """
+    principal: float = PydanticField(ge=0)
+    interestRate: float = PydanticField(ge=0)
+    loanTerm: int = PydanticField(ge=1, le=40)
+    extraRepayment: float = PydanticField(default=0, ge=0)
+    offsetBalance: float = PydanticField(default=0, ge=0)
+
+class AmortizationRequest(BaseModel):
+    scenarios: List[AmortizationScenario] = PydanticField(min_length=1, max_length=5000)
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+class StressTestOptions(BaseModel):
+    """
+    Rate path settings for a Monte Carlo stress test. Rates are in percent.
+    
+    Attributes:
+        paths (int): Number of simulated rate paths per profile
+        horizonYears (int): Number of years to simulate
+        volatility (float): Standard deviation of the yearly rate change
+        meanReversion (float): Fraction of the gap to longRunRate closed each year
+        longRunRate (Optional[float]): Rate paths revert to, defaults to the profile's rate
+        seed (Optional[int]): Seed for reproducible results
+    """
+    paths: int = PydanticField(default=2000, ge=1, le=20000)
+    horizonYears: int = PydanticField(default=5, ge=1, le=40)
+    volatility: float = PydanticField(default=1.0, ge=0)
+    meanReversion: float = PydanticField(default=0.2, ge=0, le=1)
+    longRunRate: Optional[float] = None
+    seed: Optional[int] = None
+
+class StressTestRequest(BaseModel):
+    profile: EstimateRequest
+    loanAmount: Optional[float] = None # Defaults to the profile's borrowing power
+    options: StressTestOptions = StressTestOptions()
+
+class BatchStressTestRequest(BaseModel):
+    profiles: List[EstimateRequest] = PydanticField(min_length=1, max_length=1000)
+    options: StressTestOptions = StressTestOptions()
+
+class StressTestResponse(BaseModel):
+    """
+    Response model for a Monte Carlo stress test.
+    
+    Attributes:
+        probability_exceeds_income (float): Share of paths where yearly repayments exceed
+            net income in at least one year
+        yearly_exceedance_probability (List[float]): Share of paths exceeding net income in each year
+        rate_percentiles (Dict[str, List[float]]): p5/p50/p95 interest rate for each year
+        repayment_percentiles (Dict[str, List[float]]): p5/p50/p95 monthly repayment for each year
+    """
+    probability_exceeds_income: float
+    yearly_exceedance_probability: List[float]
+    rate_percentiles: Dict[str, List[float]]
+    repayment_percentiles: Dict[str, List[float]]
+
+class BatchStressTestResponse(BaseModel):
+    results: List[StressTestResponse]
+
 class PropertyInitializationRequest(BaseModel):
     """
     Request model for property initialization.
@@ -143,6 +334,52 @@ class PropertyInitializationResponse(BaseModel):
     distance_info: Optional[Dict] = None
     error: Optional[str] = None
 
+class WebDriverPoolStats(BaseModel):
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+    created: int
+    recycled: int
+    unhealthy: int
+    checkouts: int
+    waits: int
+    mean_wait_seconds: float
+    max_wait_seconds: float
+
+class PageStateStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+
+class RateLimiterStats(BaseModel):
+    rate: float
+    burst: int
+    acquired: int
+    waits: int
+    queued: int
+    mean_wait_seconds: float
+    max_wait_seconds: float
+    tokens: Dict[str, float]
+
+class ListingCacheStats(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    stale_hits: int
+    misses: int
+    revalidations: int
+    evictions: int
+    hit_rate: float
+
+class ScraperStats(BaseModel):
+    started: bool # False until the first property is scraped, with every other field empty
+    page_state: Optional[PageStateStats] = None
+    pool: Optional[WebDriverPoolStats] = None
+    rate_limiter: Optional[RateLimiterStats] = None
+    cache: Optional[ListingCacheStats] = None
+
 class GovernmentSchemesRequest(BaseModel):
     state: str
     
@@ -154,4 +391,14 @@ class GovernmentScheme(BaseModel):
     eligibilityRequirements: List[Tuple[str, bool]] # Requirement, is met
 
 class GovernmentSchemesResponse(BaseModel):
-    schemes: List[GovernmentScheme]
\ No newline at end of file
+    schemes: List[GovernmentScheme]
+
+class GovernmentSchemesBatchItem(BaseModel):
+    state: str
+    profile: EstimateRequest
+
+class BatchGovernmentSchemesRequest(BaseModel):
+    items: List[GovernmentSchemesBatchItem] = PydanticField(min_length=1, max_length=1000)
+
+class BatchGovernmentSchemesResponse(BaseModel):
+    results: List[GovernmentSchemesResponse]
\ No newline at end of file
@@ -1,24 +1,46 @@
-from fastapi import FastAPI, HTTPException, APIRouter, Depends
+from fastapi import FastAPI, HTTPException, APIRouter, Depends, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
-from .models import ChatRequest, ChatResponse, EstimateRequest, EstimateResponse, GovernmentSchemesRequest, GovernmentSchemesResponse
+from fastapi.responses import StreamingResponse
+from .models import ChatRequest, ChatTurnResponse, ChatMetrics, EstimateRequest, EstimateResponse, GovernmentSchemesRequest, GovernmentSchemesResponse, BatchEstimateRequest, BatchEstimateResponse, SensitivityRequest, SensitivityResponse, SensitivityAxis, SolveRequest, SolveResponse, EstimateCacheStats, BatchGovernmentSchemesRequest, BatchGovernmentSchemesResponse, AmortizationRequest, StressTestRequest, BatchStressTestRequest, StressTestResponse, BatchStressTestResponse, StressTestOptions, GovernmentScheme
 import os
 import sys
+import json
+import asyncio
+import uuid
 from pathlib import Path
 from dotenv import load_dotenv
 from functools import lru_cache
 from threading import Lock
 import logging
 from datetime import datetime
-from typing import Dict
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add the project root directory to the Python path
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
-from backend.models.chat_model import ChatModel
-from backend.models.borrowing_model import BorrowingModel
+from backend.models.chat_model import ChatModel, ChatTimeoutError
+from backend.models.llm_clients import create_llm_client
+from backend.models.resilience import ResilienceSettings
+from backend.models.borrowing_model import BorrowingResult, calculate_borrowing, load_assumptions, load_government_schemes
+from backend.models.government_schemes import SchemeRulesEngine
+from backend.models.rate_stress import StressTester, StressTestSettings
+from backend.models.amortization import iter_schedule_batches, schedule_to_ndjson, schedule_to_csv
+from backend.models.batch_borrowing import BatchBorrowingModel, SENSITIVITY_FIELDS
+from backend.models.borrowing_solver import BorrowingSolver
+from backend.models.estimate_cache import EstimateCache, DataFileVersion
+from models.tax_rates import TAX_TABLES_PATH, reload_tax_tables
+from models.borrowing_graph import BorrowingGraph
+from backend.models.action_schema import validate_actions
+import numpy as np
 from backend.services.scraper import DomainScraper
+from backend.services.webdriver_pool import WebDriverPool
+from backend.services.rate_limiter import HostRateLimiter
+from backend.services.listing_cache import ListingCache
 from backend.services.map import DistanceCalculator
-from backend.api.models import PropertyInitializationRequest, PropertyInitializationResponse
+from backend.services.session_store import BorrowingSession, SessionStore
+from backend.services.conversation_store import ConversationStore
+from backend.api.models import PropertyInitializationRequest, PropertyInitializationResponse, ScraperStats
 
 # Load environment variables
 load_dotenv()
@@ -33,12 +55,77 @@ property_router = APIRouter(prefix="/property", tags=["property"])
 # Initialize models
 load_dotenv(project_root + '/config/.env')
 api_key = os.getenv("GEMINI_API_KEY")
-chat_model = ChatModel(api_key=api_key)
-borrowing_model = BorrowingModel()
+# CHAT_LLM_MODE selects the live Gemini API, a recording of it, a replay of a recording, or a fake client
+chat_llm_latency = os.getenv("CHAT_LLM_LATENCY")
+chat_client = create_llm_client(
+    os.getenv("CHAT_LLM_MODE", "gemini"),
+    api_key=api_key,
+    recording_path=os.getenv("CHAT_RECORDING_PATH"),
+    latency=float(chat_llm_latency) if chat_llm_latency else None
+)
+chat_model = ChatModel(api_key=api_key, client=chat_client, conversations=ConversationStore(
+    max_turns=int(os.getenv("CHAT_HISTORY_TURNS", "40")),
+    max_tokens=int(os.getenv("CHAT_HISTORY_TOKENS", "8000")),
+    idle_seconds=float(os.getenv("CHAT_SESSION_IDLE_SECONDS", "1800")),
+    max_bytes=int(os.getenv("CHAT_HISTORY_MAX_BYTES", str(32 * 1024 * 1024)))
+), context_cache_ttl=float(os.getenv("CHAT_CONTEXT_CACHE_TTL", "3600")) or None,
+    max_concurrent_requests=int(os.getenv("CHAT_MAX_CONCURRENT_REQUESTS", "8")),
+    request_timeout=float(os.getenv("CHAT_REQUEST_TIMEOUT", "30")),
+    response_cache_size=int(os.getenv("CHAT_RESPONSE_CACHE_SIZE", "1024")),
+    response_cache_ttl=float(os.getenv("CHAT_RESPONSE_CACHE_TTL", "3600")) or None,
+    fast_path=os.getenv("CHAT_FAST_PATH", "true").lower() != "false",
+    resilience=ResilienceSettings(
+        deadline=float(os.getenv("CHAT_LLM_DEADLINE", "15")),
+        retries=int(os.getenv("CHAT_LLM_RETRIES", "2")),
+        hedge=os.getenv("CHAT_LLM_HEDGE", "false").lower() == "true",
+        failure_threshold=int(os.getenv("CHAT_CIRCUIT_FAILURES", "5")),
+        reset_after=float(os.getenv("CHAT_CIRCUIT_RESET_SECONDS", "30"))
+    ))
+assumptions = load_assumptions()
+government_schemes = load_government_schemes()
+scheme_rules = SchemeRulesEngine(government_schemes)
+batch_borrowing_model = BatchBorrowingModel()
+borrowing_solver = BorrowingSolver(batch_borrowing_model)
+
+def reload_borrowing_data():
+    """Reload assumptions and tax tables after the data files change."""
+    global assumptions
+    logger.info("Borrowing data files changed, reloading assumptions and tax tables")
+    assumptions = load_assumptions()
+    reload_tax_tables()
+    batch_borrowing_model.reload_assumptions()
+
+stress_tester = StressTester(batch_borrowing_model, max_workers=int(os.getenv("STRESS_TEST_WORKERS", "2")))
+
+# Memoized borrowing results, dropped whenever assumptions.json or the tax tables change
+estimate_cache = EstimateCache(
+    max_size=int(os.getenv("ESTIMATE_CACHE_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("ESTIMATE_CACHE_TTL", "600")),
+    version=DataFileVersion([Path(project_root) / "backend" / "utils" / "assumptions.json", TAX_TABLES_PATH]),
+    on_invalidate=reload_borrowing_data
+)
 
 # In-memory storage for analysis sessions (replace with database in production)
 analysis_sessions: Dict[str, Dict] = {}
 
+# Per-session borrowing results, keyed by the X-Session-ID header
+session_store = SessionStore(
+    max_sessions=int(os.getenv("SESSION_STORE_MAX_SESSIONS", "10000")),
+    idle_seconds=float(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+)
+
+def get_session_id(response: Response, x_session_id: Optional[str] = Header(default=None, max_length=128)) -> str:
+    """
+    Dependency injection function for the caller's session ID.
+    Clients that don't send an X-Session-ID header are given a new session, whose ID
+    is returned in the X-Session-ID response header for them to send from then on.
+    """
+    if x_session_id:
+        return x_session_id
+    session_id = uuid.uuid4().hex
+    response.headers["X-Session-ID"] = session_id
+    return session_id
+
 class ServiceManager:
     """
     Manages service instances for property analysis.
@@ -47,15 +134,41 @@ class ServiceManager:
     def __init__(self):
         self._scraper = None
         self._distance_calculator = None
-        self._lock = None  # Will be used for thread safety if needed
+        self._lock = Lock()
 
     @property
     def scraper(self) -> DomainScraper:
-        """Lazy initialization of DomainScraper."""
-        if self._scraper is None:
-            logger.info("Initializing DomainScraper")
-            self._scraper = DomainScraper()
-        return self._scraper
+        """Lazy initialization of DomainScraper and its pool of warm browsers."""
+        with self._lock:
+            if self._scraper is None:
+                logger.info("Initializing DomainScraper")
+                cache_path = os.getenv("SCRAPER_CACHE_PATH", str(Path(project_root) / "backend" / "cache" / "listings.sqlite3"))
+                self._scraper = DomainScraper(
+                    pool=WebDriverPool(
+                        size=int(os.getenv("SCRAPER_POOL_SIZE", "2")),
+                        max_pages=int(os.getenv("SCRAPER_MAX_PAGES", "50")),
+                        max_memory_mb=float(os.getenv("SCRAPER_MAX_MEMORY_MB", "512")) or None,
+                        checkout_timeout=float(os.getenv("SCRAPER_CHECKOUT_TIMEOUT", "60"))
+                    ),
+                    page_state=os.getenv("SCRAPER_PAGE_STATE", "true").lower() != "false",
+                    rate_limiter=HostRateLimiter(
+                        rate=float(os.getenv("SCRAPER_RATE_PER_SECOND", "0.5")),
+                        burst=int(os.getenv("SCRAPER_BURST", "2"))
+                    ),
+                    # An empty SCRAPER_CACHE_PATH turns the listing cache off
+                    cache=ListingCache(
+                        cache_path,
+                        ttl_seconds=float(os.getenv("SCRAPER_CACHE_TTL", "21600")),
+                        max_entries=int(os.getenv("SCRAPER_CACHE_SIZE", "5000"))
+                    ) if cache_path else None
+                )
+            return self._scraper
+
+    def scraper_stats(self) -> Optional[Dict[str, Any]]:
+        """Stats of the scraper, or None if it hasn't been started. Never starts the scraper or its browsers."""
+        with self._lock:
+            scraper = self._scraper
+        return scraper.stats() if scraper is not None else None
 
     @property
     def distance_calculator(self) -> DistanceCalculator:
@@ -73,42 +186,139 @@ def get_service_manager() -> ServiceManager:
     """
     return ServiceManager()
 
-@chat_router.post("", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+def recheck_government_schemes(session: BorrowingSession, result: BorrowingResult) -> Tuple[GovernmentScheme, ...]:
+    """Re-check the session's scheme eligibility against a new result, for the state it was last checked for."""
+    if session.schemes_state is None:
+        return ()
+    return tuple(scheme_rules.check(session.schemes_state, result.details, result.household_income))
+
+def apply_chat_actions(session_id: str, actions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[EstimateResponse]]:
+    """
+    Validate a chat turn's actions and apply its field updates to the session's profile.
+    
+    Only the borrowing stages that read a changed field are recomputed, and the new
+    result replaces the session's along with re-checked government schemes, so the
+    next chat turn sees the updated details.
+    
+    Args:
+        session_id (str): The caller's session ID
+        actions (List[Dict[str, Any]]): Actions returned by the chat model
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[EstimateResponse]]: The valid actions, and the
+            updated estimate if the session has one and the actions changed the profile
+    """
+    validated = validate_actions(actions)
+    session = session_store.get(session_id)
+    if not validated.changes or session.result is None:
+        return validated.actions, None
+    try:
+        update = BorrowingGraph(session.result, assumptions).apply(validated.changes)
+    except (ArithmeticError, ValueError) as e:
+        # The chat answer still stands; only the estimate can't follow these details
+        logger.warning(f"Could not apply chat updates to {sorted(validated.changes)}: {str(e)}")
+        return validated.actions, None
+    session_store.update(session_id, result=update.result, response=update.result.to_response(),
+                         eligible_government_schemes=recheck_government_schemes(session, update.result))
+    logger.info(f"Applied chat updates to {sorted(validated.changes)}, recomputed {', '.join(update.recomputed) or 'nothing'}")
+    borrowing = update.result.borrowing
+    return validated.actions, EstimateResponse(estimate=borrowing.borrowing_power, loan_repayment=borrowing.loan_repayment, summary="Coming soon")
+
+@chat_router.post("", response_model=ChatTurnResponse)
+async def chat(request: ChatRequest, session_id: str = Depends(get_session_id)) -> ChatTurnResponse:
     """
     Process a chat message and return the AI's response.
     Accepts an optional context string.
     
+    Field updates suggested by the AI are validated and applied to the session's
+    profile, and the recomputed estimate is returned with the response.
+    
     Args:
         request (ChatRequest): The chat request containing the user's message and context
+        session_id (str): The caller's session ID
         
     Returns:
-        ChatResponse: The AI's response and any suggested actions
+        ChatTurnResponse: The AI's response, any suggested actions and the updated estimate
         
     Raises:
         HTTPException: If there's an error processing the request
     """
     try:    
         context = request.context
-        if borrowing_model.details != None:
-            borrowing_response = borrowing_model.get_borrowing_response()
-            eligible_government_schemes = borrowing_model.get_eligible_government_schemes()
+        session = session_store.get(session_id)
+        if session.result != None:
+            borrowing_response = session.response
+            eligible_government_schemes = list(session.eligible_government_schemes)
         else:   
             borrowing_response = None
             eligible_government_schemes = []
-        response_text, actions = chat_model.chat(request.message, context=context, borrowing_response=borrowing_response, eligible_government_schemes=eligible_government_schemes)
-        print(actions)
-        return ChatResponse(response=response_text, actions=actions)    
+        response_text, actions = await chat_model.achat(request.message, context=context, borrowing_response=borrowing_response, eligible_government_schemes=eligible_government_schemes, session_id=session_id)
+        actions, estimate = apply_chat_actions(session_id, actions)
+        return ChatTurnResponse(response=response_text, actions=actions, estimate=estimate)
+    except ChatTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@chat_router.post("/stream")
+async def chat_stream(request: ChatRequest, session_id: str = Depends(get_session_id)) -> StreamingResponse:
+    """
+    Stream the AI's response as server-sent events.
+    
+    Emits "token" events with response text as it is generated, an "estimate" event
+    if the AI's field updates changed the session's estimate, an "actions" event once
+    the full response has been parsed, then a "done" event with the complete
+    response. Failures after the stream has started are sent as an "error" event.
+    
+    Args:
+        request (ChatRequest): The chat request containing the user's message and context
+        session_id (str): The caller's session ID
+        
+    Returns:
+        StreamingResponse: A text/event-stream of chat events
+    """
+    session = session_store.get(session_id)
+    if session.result != None:
+        borrowing_response = session.response
+        eligible_government_schemes = list(session.eligible_government_schemes)
+    else:
+        borrowing_response = None
+        eligible_government_schemes = []
+
+    async def events():
+        try:
+            async for event, data in chat_model.astream_chat(request.message, context=request.context, borrowing_response=borrowing_response, eligible_government_schemes=eligible_government_schemes, session_id=session_id):
+                if event == "token":
+                    payload = {"text": data}
+                elif event == "actions":
+                    data, estimate = apply_chat_actions(session_id, data)
+                    payload = {"actions": data}
+                    if estimate is not None:
+                        yield f"event: estimate\ndata: {estimate.model_dump_json()}\n\n"
+                else:
+                    payload = {"response": data}
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream failed: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Session-ID": session_id})
+
+@chat_router.get("/metrics", response_model=ChatMetrics)
+async def get_chat_metrics() -> ChatMetrics:
+    """Return cache and fast path savings, and retries, hedges and circuit breaker state for model calls."""
+    return ChatMetrics(**chat_model.metrics())
+
 @borrowing_router.post("/estimate", response_model=EstimateResponse)
-async def estimate_borrowing_power(request: EstimateRequest) -> EstimateResponse:
+async def estimate_borrowing_power(request: EstimateRequest, session_id: str = Depends(get_session_id)) -> EstimateResponse:
     """
     Estimate borrowing power based on user details.
+    The result is stored against the caller's session for later chat turns.
     
     Args:
         request (EstimateRequest): The user's financial details
+        session_id (str): The caller's session ID
         
     Returns:
         EstimateResponse: The estimated borrowing power and loan repayment
@@ -117,14 +327,192 @@ async def estimate_borrowing_power(request: EstimateRequest) -> EstimateResponse
         HTTPException: If there's an error processing the request
     """
     try:
-        borrowing_model.update_details(request)
-        response = borrowing_model.get_borrowing_response()
-        estimate = response.borrowing_power
-        loan_repayment = response.loan_repayment
+        result = estimate_cache.get_or_compute(request, lambda details: calculate_borrowing(details, assumptions))
+        session = session_store.get(session_id)
+        session_store.update(session_id, result=result, response=result.to_response(),
+                             eligible_government_schemes=recheck_government_schemes(session, result))
+        estimate = result.borrowing.borrowing_power
+        loan_repayment = result.borrowing.loan_repayment
         return EstimateResponse(estimate=estimate, loan_repayment=loan_repayment, summary="Coming soon")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@borrowing_router.get("/estimate/cache", response_model=EstimateCacheStats)
+async def get_estimate_cache_stats() -> EstimateCacheStats:
+    """Return hit, miss and eviction counters for the estimate cache."""
+    return EstimateCacheStats(**estimate_cache.stats())
+
+@borrowing_router.post("/estimate/batch", response_model=BatchEstimateResponse)
+async def estimate_borrowing_power_batch(request: BatchEstimateRequest) -> BatchEstimateResponse:
+    """
+    Estimate borrowing power for many profiles in one vectorized pass.
+    
+    Args:
+        request (BatchEstimateRequest): The profiles to estimate
+        
+    Returns:
+        BatchEstimateResponse: One borrowing response per profile, in request order
+        
+    Raises:
+        HTTPException: If a profile is invalid or there's an error processing the request
+    """
+    try:
+        return BatchEstimateResponse(results=batch_borrowing_model.calculate(request.profiles))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@borrowing_router.post("/estimate/sensitivity", response_model=SensitivityResponse)
+async def estimate_sensitivity(request: SensitivityRequest) -> SensitivityResponse:
+    """
+    Calculate the borrowing power and loan repayment surface for one profile.
+    
+    Every combination of the requested ranges is evaluated in one vectorized pass,
+    so sliders and what-if questions can be answered without repeated estimate calls.
+    
+    Args:
+        request (SensitivityRequest): The base profile and the ranges to vary
+        
+    Returns:
+        SensitivityResponse: The grid axes and the borrowing power/loan repayment grids
+        
+    Raises:
+        HTTPException: If the grid is invalid or there's an error processing the request
+    """
+    try:
+        axes = {}
+        for field in SENSITIVITY_FIELDS:
+            value_range = getattr(request, field)
+            if value_range is not None:
+                values = np.linspace(value_range.start, value_range.stop, value_range.steps)
+                if field == "loanTerm":
+                    values = np.unique(np.round(values))
+                axes[field] = values
+        grid = batch_borrowing_model.calculate_grid(request.profile, axes)
+        return SensitivityResponse(
+            axes=[SensitivityAxis(field=field, values=values.tolist()) for field, values in axes.items()],
+            borrowing_power=grid["borrowing_power"].tolist(),
+            loan_repayment=grid["loan_repayment"].tolist()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@borrowing_router.post("/estimate/solve", response_model=SolveResponse)
+async def solve_borrowing_target(request: SolveRequest) -> SolveResponse:
+    """
+    Find the income, living expenses, interest rate or loan term needed to reach
+    each target loan amount.
+    
+    Args:
+        request (SolveRequest): The profile, the field to solve for and the target loan amounts
+        
+    Returns:
+        SolveResponse: One solution per target, None where the target is unreachable
+        
+    Raises:
+        HTTPException: If the request is invalid or there's an error processing the request
+    """
+    try:
+        solutions = borrowing_solver.solve(request.profile, request.solveFor, np.array(request.targets))
+        return SolveResponse(
+            solveFor=request.solveFor,
+            targets=request.targets,
+            solutions=[None if np.isnan(value) else value for value in solutions.tolist()]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@borrowing_router.post("/amortization")
+async def stream_amortization_schedule(request: AmortizationRequest) -> StreamingResponse:
+    """
+    Stream month-by-month amortization schedules for one or more loans.
+    
+    Rows are generated a year of months at a time for every scenario, and written
+    out as they are produced, so large exports are never held in memory.
+    
+    Args:
+        request (AmortizationRequest): The loans to schedule and the output format
+        
+    Returns:
+        StreamingResponse: NDJSON or CSV rows of scenario, month, repayment, principal,
+        interest, balance and cumulative_interest
+    """
+    scenarios = request.scenarios
+    batches = iter_schedule_batches(
+        np.array([scenario.principal for scenario in scenarios]),
+        np.array([scenario.interestRate for scenario in scenarios]),
+        np.array([scenario.loanTerm for scenario in scenarios]),
+        np.array([scenario.extraRepayment for scenario in scenarios]),
+        np.array([scenario.offsetBalance for scenario in scenarios])
+    )
+    if request.format == "csv":
+        return StreamingResponse(
+            schedule_to_csv(batches),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=amortization.csv"}
+        )
+    return StreamingResponse(schedule_to_ndjson(batches), media_type="application/x-ndjson")
+
+def stress_test_settings(options: StressTestOptions) -> StressTestSettings:
+    return StressTestSettings(
+        paths=options.paths,
+        horizon_years=options.horizonYears,
+        volatility=options.volatility,
+        mean_reversion=options.meanReversion,
+        long_run_rate=options.longRunRate,
+        seed=options.seed
+    )
+
+@borrowing_router.post("/estimate/stress", response_model=StressTestResponse)
+def stress_test(request: StressTestRequest) -> StressTestResponse:
+    """
+    Simulate interest rate paths for one profile and report how often the loan
+    repayments would exceed the income left after tax and expenses.
+    
+    Args:
+        request (StressTestRequest): The profile, optional loan amount and rate path options
+        
+    Returns:
+        StressTestResponse: Exceedance probabilities and rate/repayment percentiles
+        
+    Raises:
+        HTTPException: If the request is invalid or there's an error processing the request
+    """
+    try:
+        result = stress_tester.run([request.profile], stress_test_settings(request.options), [request.loanAmount])[0]
+        return StressTestResponse(**asdict(result))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@borrowing_router.post("/estimate/stress/batch", response_model=BatchStressTestResponse)
+def stress_test_batch(request: BatchStressTestRequest) -> BatchStressTestResponse:
+    """
+    Stress test many profiles, fanned out over the stress test process pool.
+    
+    Args:
+        request (BatchStressTestRequest): The profiles and rate path options
+        
+    Returns:
+        BatchStressTestResponse: One stress test result per profile, in request order
+        
+    Raises:
+        HTTPException: If the request is invalid or there's an error processing the request
+    """
+    try:
+        results = stress_tester.run(request.profiles, stress_test_settings(request.options))
+        return BatchStressTestResponse(results=[StressTestResponse(**asdict(result)) for result in results])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @property_router.post("/search", response_model=PropertyInitializationResponse)
 async def search_property(
     request: PropertyInitializationRequest,
@@ -178,7 +566,8 @@ async def search_property(
         
         # Scrape property data
         logger.info(f"Starting property data scraping for session {session_id}")
-        property_data = service_manager.scraper.get_property_data(request.url)
+        # Starting browsers and scraping both block, so run them off the event loop; the pool bounds how many scrapes run at once
+        property_data = await asyncio.to_thread(lambda: service_manager.scraper.get_property_data(request.url))
         
         if not property_data:
             error_msg = "Failed to fetch property data. The URL may be invalid or the property listing may no longer exist."
@@ -237,9 +626,52 @@ async def search_property(
             error=error_msg
         )
 
+@property_router.get("/scraper/stats", response_model=ScraperStats)
+async def get_scraper_stats(service_manager: ServiceManager = Depends(get_service_manager)) -> ScraperStats:
+    """
+    Return the page-state hit rate, browser pool usage, rate limiter state and listing cache counters for the property scraper.
+    Before the first property is scraped there is no scraper yet, and the stats are empty.
+    """
+    stats = await asyncio.to_thread(service_manager.scraper_stats)
+    return ScraperStats(started=stats is not None, **(stats or {}))
+
 @borrowing_router.post("/government-schemes", response_model=GovernmentSchemesResponse)
-async def get_government_schemes(request: GovernmentSchemesRequest) -> GovernmentSchemesResponse:
-    return GovernmentSchemesResponse(schemes=borrowing_model.check_government_schemes(request.state))
+async def get_government_schemes(request: GovernmentSchemesRequest, session_id: str = Depends(get_session_id)) -> GovernmentSchemesResponse:
+    session = session_store.get(session_id)
+    if session.result is None:
+        raise HTTPException(status_code=400, detail="No borrowing details for this session, call /api/estimate first")
+    try:
+        schemes = scheme_rules.check(request.state, session.result.details, session.result.household_income)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session_store.update(session_id, eligible_government_schemes=tuple(schemes), schemes_state=request.state)
+    return GovernmentSchemesResponse(schemes=schemes)
+
+@borrowing_router.post("/government-schemes/batch", response_model=BatchGovernmentSchemesResponse)
+async def get_government_schemes_batch(request: BatchGovernmentSchemesRequest) -> BatchGovernmentSchemesResponse:
+    """
+    Check government scheme eligibility for many profiles and states in one call.
+    
+    Args:
+        request (BatchGovernmentSchemesRequest): Profile and state pairs to check
+        
+    Returns:
+        BatchGovernmentSchemesResponse: The schemes for each pair, in request order
+        
+    Raises:
+        HTTPException: If a state or profile is invalid or there's an error processing the request
+    """
+    try:
+        if not request.items:
+            return BatchGovernmentSchemesResponse(results=[])
+        profiles = [item.profile for item in request.items]
+        household_incomes = batch_borrowing_model.calculate_columns(batch_borrowing_model.to_columns(profiles))["household_income"]
+        results = scheme_rules.evaluate(profiles, household_incomes, [item.state for item in request.items])
+        return BatchGovernmentSchemesResponse(results=[GovernmentSchemesResponse(schemes=schemes) for schemes in results])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 # Create FastAPI app
 app = FastAPI(
@@ -255,6 +687,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Session-ID"],  # Lets the browser read session IDs issued by get_session_id
 )
 
 # Include routers
@@ -0,0 +1,140 @@
+"""
+Validation of the actions returned by the chat model.
+
+Each profile field has a converter, built once at import, that turns the
+model's value (usually a string) into the type EstimateRequest expects or
+raises ValueError. UPDATE_FIELD actions that fail validation are dropped and
+logged rather than failing the chat turn; other actions pass through unchanged.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+import logging
+import math
+from pathlib import Path
+import sys
+
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+from backend.api.models import ActionType, Field, EmploymentType, LoanPurpose, BorrowingType, IncomeFrequency
+
+logger = logging.getLogger(__name__)
+
+_TRUE = {"true", "yes", "y", "1"}
+_FALSE = {"false", "no", "n", "0"}
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+
+def _number(low: float, high: float = math.inf, integer: bool = False, exclusive_low: bool = False) -> Callable[[Any], float]:
+    def convert(value: Any) -> float:
+        if isinstance(value, bool):
+            raise ValueError(f"Expected a number, got {value!r}")
+        number = float(str(value).replace(",", "").replace("$", "").strip()) if isinstance(value, str) else float(value)
+        if not math.isfinite(number) or not low <= number <= high or (exclusive_low and number == low):
+            raise ValueError(f"{number} is outside {low} to {high}" + (f", excluding {low}" if exclusive_low else ""))
+        if integer:
+            if number != int(number):
+                raise ValueError(f"Expected a whole number, got {value!r}")
+            return int(number)
+        return number
+    return convert
+
+
+def _choice(enum_type) -> Callable[[Any], str]:
+    choices = {member.value.lower(): member.value for member in enum_type}
+
+    def convert(value: Any) -> str:
+        try:
+            return choices[str(value).strip().lower()]
+        except KeyError:
+            raise ValueError(f"Expected one of {', '.join(choices.values())}, got {value!r}")
+    return convert
+
+
+_money = _number(0)
+_frequency = _choice(IncomeFrequency)
+
+# Converter for every field an UPDATE_FIELD action may set
+FIELD_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    Field.IS_FIRST_TIME_BUYER.value: _flag,
+    Field.GROSS_INCOME.value: _money,
+    Field.INCOME_FREQUENCY.value: _frequency,
+    Field.OTHER_INCOME.value: _money,
+    Field.OTHER_INCOME_FREQUENCY.value: _frequency,
+    Field.SECOND_PERSON_INCOME.value: _money,
+    Field.SECOND_PERSON_INCOME_FREQUENCY.value: _frequency,
+    Field.SECOND_PERSON_OTHER_INCOME.value: _money,
+    Field.SECOND_PERSON_OTHER_INCOME_FREQUENCY.value: _frequency,
+    Field.RENTAL_INCOME.value: _money,
+    Field.LIVING_EXPENSES.value: _money,
+    Field.RENT_BOARD.value: _money,
+    Field.DEPENDENTS.value: _number(0, 20, integer=True),
+    Field.CREDIT_CARD_LIMITS.value: _money,
+    Field.LOAN_REPAYMENT.value: _money,
+    Field.HAS_HECS.value: _flag,
+    Field.AGE.value: _number(18, 120, integer=True),
+    Field.EMPLOYMENT_TYPE.value: _choice(EmploymentType),
+    Field.LOAN_PURPOSE.value: _choice(LoanPurpose),
+    Field.LOAN_TERM.value: _number(1, 40, integer=True),
+    # The repayment calculation divides by the rate, so a rate of 0 is rejected
+    Field.INTEREST_RATE.value: _number(0, 30, exclusive_low=True),
+    Field.BORROWING_TYPE.value: _choice(BorrowingType),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ValidatedActions:
+    """
+    Actions that passed validation and the profile changes they make.
+
+    Attributes:
+        actions: Valid actions, with update values converted
+        changes: EstimateRequest field names to converted values, later actions winning
+        rejected: Dropped actions with the reason each was rejected
+    """
+    actions: List[Dict[str, Any]]
+    changes: Dict[str, Any]
+    rejected: List[Tuple[Dict[str, Any], str]]
+
+
+def validate_actions(actions: List[Dict[str, Any]]) -> ValidatedActions:
+    """
+    Validate model actions against the field table.
+
+    Args:
+        actions (List[Dict[str, Any]]): Actions as parsed from the model's JSON
+
+    Returns:
+        ValidatedActions: The valid actions, profile changes and rejected actions
+    """
+    valid, changes, rejected = [], {}, []
+    for action in actions or []:
+        try:
+            action_type = action.get("type")
+            payload = action.get("payload") or {}
+            if action_type != ActionType.UPDATE_FIELD.value:
+                ActionType(action_type)
+                valid.append(action)
+                continue
+            field = payload.get("field")
+            convert = FIELD_CONVERTERS.get(field)
+            if convert is None:
+                raise ValueError(f"Unknown field {field!r}")
+            value = convert(payload.get("value"))
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.warning(f"Dropping invalid action {action!r}: {str(e)}")
+            rejected.append((action, str(e)))
+            continue
+        changes[field] = value
+        valid.append({"type": action_type, "payload": {"field": field, "value": value}})
+    return ValidatedActions(actions=valid, changes=changes, rejected=rejected)
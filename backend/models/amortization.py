@@ -0,0 +1,113 @@
+# Amortization Schedule
+import json
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+SCHEDULE_COLUMNS = ["scenario", "month", "repayment", "principal", "interest", "balance", "cumulative_interest"]
+
+
+def scheduled_repayment(principal: np.ndarray, annual_rate: np.ndarray, term_years: np.ndarray) -> np.ndarray:
+    """
+    Monthly principal and interest repayment, the same formula used for loan_repayment
+    in the borrowing model, with straight-line repayment for a zero rate.
+
+    Args:
+        principal: Loan amounts
+        annual_rate: Interest rates in percent
+        term_years: Loan terms in years
+    """
+    principal = np.asarray(principal, dtype=float)
+    monthly_rate = np.asarray(annual_rate, dtype=float) / 100 / 12
+    months = np.asarray(term_years, dtype=float) * 12
+    growth = (1 + monthly_rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortised = principal * monthly_rate * growth / (growth - 1)
+    return np.where(monthly_rate == 0, principal / months, amortised)
+
+
+def amortization_schedule(principal: np.ndarray, annual_rate: np.ndarray, term_years: np.ndarray,
+                          extra_repayment: np.ndarray = 0, offset_balance: np.ndarray = 0,
+                          chunk_months: int = 12) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Generate month-by-month schedules for many loans at once, a chunk of months at a time.
+
+    Each month is computed for every scenario in one set of array operations.
+    Interest is charged on the balance less the offset balance, and extra monthly
+    repayments go straight to principal, so loans may finish before their term.
+    Only chunk_months of history is held in memory at any point.
+
+    Args:
+        principal: Loan amounts
+        annual_rate: Interest rates in percent
+        term_years: Loan terms in years
+        extra_repayment: Extra repayment made each month
+        offset_balance: Balance held in an offset account
+        chunk_months: Months per yielded chunk
+
+    Yields:
+        Dict[str, np.ndarray]: SCHEDULE_COLUMNS (except scenario) as arrays shaped
+        (scenarios, months in chunk), plus "active" marking months where the loan
+        still had a balance at the start of the month
+    """
+    principal, annual_rate, term_years, extra_repayment, offset_balance = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (principal, annual_rate, term_years, extra_repayment, offset_balance))
+    )
+    monthly_rate = annual_rate / 100 / 12
+    repayment = scheduled_repayment(principal, annual_rate, term_years) + extra_repayment
+    total_months = int(np.ceil(np.max(term_years, initial=0) * 12))
+
+    balance = principal.copy()
+    cumulative_interest = np.zeros_like(balance)
+    for start in range(0, total_months, chunk_months):
+        months = min(chunk_months, total_months - start)
+        chunk = {name: np.zeros(balance.shape + (months,)) for name in SCHEDULE_COLUMNS[1:]}
+        chunk["active"] = np.zeros(balance.shape + (months,), dtype=bool)
+        for i in range(months):
+            active = balance > 0.005
+            interest = np.maximum(balance - offset_balance, 0) * monthly_rate
+            paid = np.where(active, np.minimum(repayment, balance + interest), 0.0)
+            interest = np.where(active, interest, 0.0)
+            balance = np.maximum(balance + interest - paid, 0.0)
+            cumulative_interest += interest
+
+            chunk["month"][..., i] = start + i + 1
+            chunk["repayment"][..., i] = paid
+            chunk["principal"][..., i] = paid - interest
+            chunk["interest"][..., i] = interest
+            chunk["balance"][..., i] = balance
+            chunk["cumulative_interest"][..., i] = cumulative_interest
+            chunk["active"][..., i] = active
+        yield chunk
+        if not np.any(balance > 0.005):
+            return
+
+
+def iter_schedule_batches(principal: np.ndarray, annual_rate: np.ndarray, term_years: np.ndarray,
+                          extra_repayment: np.ndarray = 0, offset_balance: np.ndarray = 0,
+                          chunk_months: int = 12) -> Iterator[List[tuple]]:
+    """
+    Yield the schedule as batches of (scenario, month, repayment, principal, interest,
+    balance, cumulative_interest) rows, one batch per chunk of months. Within a batch
+    rows are ordered by scenario, then month. Months after a loan is repaid are skipped.
+    """
+    for chunk in amortization_schedule(principal, annual_rate, term_years, extra_repayment, offset_balance, chunk_months):
+        active = chunk["active"].reshape(-1, chunk["active"].shape[-1])
+        values = [np.round(chunk[name].reshape(active.shape), 2) for name in SCHEDULE_COLUMNS[1:]]
+        batch = []
+        for scenario, row_mask in enumerate(active):
+            columns = [column[scenario][row_mask].tolist() for column in values]
+            batch.extend((scenario, int(row[0])) + row[1:] for row in zip(*columns))
+        if batch:
+            yield batch
+
+
+def schedule_to_ndjson(batches: Iterator[List[tuple]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(json.dumps(dict(zip(SCHEDULE_COLUMNS, row))) + "\n" for row in batch)
+
+
+def schedule_to_csv(batches: Iterator[List[tuple]]) -> Iterator[str]:
+    yield ",".join(SCHEDULE_COLUMNS) + "\n"
+    for batch in batches:
+        yield "".join(",".join(str(value) for value in row) + "\n" for row in batch)
@@ -0,0 +1,269 @@
+# Batch Borrowing Model
+import json
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from models.tax_rates import calculate_tax_array, resolve_financial_year
+from models.hec_rates import calculate_hecs_repayment_array
+from models.borrowing_model import BUFFER_RATE
+from api.models import EstimateRequest, BorrowingResponse
+
+FREQUENCY_MULTIPLIERS = {
+    "weekly": 52,
+    "monthly": 12,
+}
+
+BORROWING_TYPES = ["Individual", "Couple"]
+
+RENTAL_INCOME_HAIRCUT = 0.85
+CREDIT_CARD_LIMIT_RATE = 0.04
+MAX_HEM_DEPENDENTS = 3
+
+# EstimateRequest fields read straight into float columns
+NUMERIC_FIELDS = [
+    "grossIncome", "otherIncome", "secondPersonIncome", "secondPersonOtherIncome", "rentalIncome",
+    "livingExpenses", "rentBoard", "dependents", "creditCardLimits", "loanRepayment", "hasHecs",
+    "loanTerm", "interestRate",
+]
+numeric_fields = attrgetter(*NUMERIC_FIELDS)
+label_fields = attrgetter("incomeFrequency", "secondPersonIncomeFrequency", "borrowingType", "loanPurpose", "financialYear")
+
+# Fields that can be varied in a sensitivity grid, in axis order
+SENSITIVITY_FIELDS = ["interestRate", "loanTerm", "grossIncome", "livingExpenses", "creditCardLimits"]
+MAX_SENSITIVITY_CELLS = 100000
+
+
+class BatchBorrowingModel:
+    """
+    Computes borrowing power for many profiles at once.
+
+    Mirrors the calculation chain of BorrowingModel (income, tax, expenses, HECS,
+    HEM floor and the PV borrowing formula) but operates on NumPy columns, so N
+    profiles cost a handful of array operations instead of N round trips through
+    update_details.
+    """
+
+    def __init__(self):
+        self.reload_assumptions()
+
+    def reload_assumptions(self):
+        self.assumptions = self.load_assumptions()
+        self.hem_table = self._build_hem_table()
+
+    def load_assumptions(self):
+        assumptions_path = Path(__file__).parent.parent / "utils" / "assumptions.json"
+        with open(assumptions_path, 'r') as f:
+            return json.load(f)
+
+    def _build_hem_table(self) -> np.ndarray:
+        """Monthly HEM benchmark indexed by [borrowing type, dependents]."""
+        simple = self.assumptions['hem_benchmark']['simple']
+        return np.array([
+            [simple[borrowing_type][str(dependents)] for dependents in range(MAX_HEM_DEPENDENTS + 1)]
+            for borrowing_type in BORROWING_TYPES
+        ], dtype=float)
+
+    def to_columns(self, requests: List[EstimateRequest]) -> Dict[str, np.ndarray]:
+        """
+        Convert a list of requests into a dictionary of NumPy columns.
+
+        Args:
+            requests: The profiles to convert (at least one)
+
+        Returns:
+            Dict[str, np.ndarray]: One array per EstimateRequest field, with string
+            fields that drive the calculation encoded as numbers or masks
+        """
+        numeric = np.array([numeric_fields(r) for r in requests], dtype=float)
+        columns = {name: numeric[:, i] for i, name in enumerate(NUMERIC_FIELDS)}
+        columns["dependents"] = columns["dependents"].astype(np.int64)
+        columns["hasHecs"] = columns["hasHecs"].astype(bool)
+
+        labels = [label_fields(r) for r in requests]
+        income_frequency, second_income_frequency, borrowing_type, loan_purpose, financial_year = zip(*labels)
+        for value in set(borrowing_type):
+            if value not in BORROWING_TYPES:
+                raise ValueError(f"Invalid borrowing type: {value}")
+        financial_years = {year: resolve_financial_year(year) for year in set(financial_year)}
+
+        columns["incomeMultiplier"] = np.array([FREQUENCY_MULTIPLIERS.get(f, 1) for f in income_frequency], dtype=float)
+        columns["secondPersonIncomeMultiplier"] = np.array(
+            [FREQUENCY_MULTIPLIERS.get(f, 1) for f in second_income_frequency], dtype=float
+        )
+        columns["isCouple"] = np.array([b == "Couple" for b in borrowing_type], dtype=bool)
+        columns["isInvestor"] = np.array([p == "Investor" for p in loan_purpose], dtype=bool)
+        columns["financialYear"] = np.array([financial_years[year] for year in financial_year], dtype=str)
+        return columns
+
+    def _by_financial_year(self, calculate, values: np.ndarray, financial_year: np.ndarray) -> np.ndarray:
+        """Apply a tax table function to each financial year's rows separately."""
+        values, financial_year = np.broadcast_arrays(values, financial_year)
+        years = np.unique(financial_year)
+        if len(years) == 1:
+            return calculate(values, str(years[0]))
+        result = np.empty(values.shape)
+        for year in years:
+            rows = financial_year == year
+            result[rows] = calculate(values[rows], str(year))
+        return result
+
+    def calculate_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Run the borrowing calculation over columns produced by to_columns.
+
+        All input columns must broadcast against each other. The returned arrays
+        are named after the BorrowingResponse fields they populate.
+        """
+        is_couple = columns["isCouple"]
+
+        # 1. Calculate the total income
+        yearly_income = columns["grossIncome"] * columns["incomeMultiplier"]
+        yearly_other_income = columns["otherIncome"] * columns["incomeMultiplier"]
+        yearly_second_income = np.where(
+            is_couple, columns["secondPersonIncome"] * columns["secondPersonIncomeMultiplier"], 0.0
+        )
+        yearly_second_other_income = np.where(
+            is_couple, columns["secondPersonOtherIncome"] * columns["secondPersonIncomeMultiplier"], 0.0
+        )
+
+        # Rental income is split into equal parts for couples
+        yearly_rental_income = np.where(
+            columns["isInvestor"], columns["rentalIncome"] * 52 * RENTAL_INCOME_HAIRCUT, 0.0
+        )
+        yearly_other_income = yearly_other_income + np.where(is_couple, yearly_rental_income / 2, yearly_rental_income)
+        yearly_second_other_income = yearly_second_other_income + np.where(is_couple, yearly_rental_income / 2, 0.0)
+
+        first_income = yearly_income + yearly_other_income
+        second_income = yearly_second_income + yearly_second_other_income
+        household_income = first_income + second_income
+        financial_year = columns["financialYear"]
+        yearly_income_after_tax = (
+            first_income - self._by_financial_year(calculate_tax_array, first_income, financial_year)
+            + second_income - self._by_financial_year(calculate_tax_array, second_income, financial_year)
+        )
+
+        # 2. Calculate the total expenses
+        yearly_rent_board = columns["rentBoard"] * 12
+        yearly_stated_living_expenses = columns["livingExpenses"] * 12
+        dependents = np.clip(columns["dependents"], 0, MAX_HEM_DEPENDENTS).astype(np.int64)
+        hem_benchmark = self.hem_table[is_couple.astype(np.int64), dependents] * 12
+        yearly_living_expenses = np.maximum(yearly_stated_living_expenses, hem_benchmark)
+
+        yearly_hecs_repayment = np.where(
+            columns["hasHecs"],
+            self._by_financial_year(calculate_hecs_repayment_array, yearly_income_after_tax, financial_year),
+            0.0
+        )
+        yearly_total_loan_repayment = (
+            columns["loanRepayment"] * 12
+            + columns["creditCardLimits"] * CREDIT_CARD_LIMIT_RATE
+            + yearly_hecs_repayment
+        )
+        total_expense = yearly_rent_board + yearly_living_expenses + yearly_total_loan_repayment
+
+        # 3. Calculate the borrowing power
+        # PV = P * (1 - (1 + r)^-n) / r
+        net_income = yearly_income_after_tax - total_expense
+        loan_term = columns["loanTerm"]
+        pre_buffer_rate = columns["interestRate"] / 100
+        rate = pre_buffer_rate + BUFFER_RATE
+        borrowing_power = np.where(
+            net_income < 0, 0.0, np.round(net_income * (1 - (1 + rate) ** -loan_term) / rate, 0)
+        )
+
+        # Monthly loan repayment, falling back to straight-line repayment for a zero rate
+        monthly_rate = pre_buffer_rate / 12
+        months = loan_term * 12
+        growth = (1 + monthly_rate) ** months
+        with np.errstate(divide="ignore", invalid="ignore"):
+            amortised = borrowing_power * monthly_rate * growth / (growth - 1)
+            straight_line = borrowing_power / months
+        loan_repayment = np.where(monthly_rate == 0, straight_line, amortised)
+        loan_repayment = np.where(net_income < 0, 0.0, loan_repayment)
+
+        return {
+            "total_income": yearly_income + yearly_other_income,
+            "total_income_after_tax": yearly_income_after_tax,
+            "total_expenses": total_expense,
+            "stated_living_expenses": yearly_stated_living_expenses,
+            "hem_benchmark": hem_benchmark,
+            "monthly_hem_benchmark": hem_benchmark / 12,
+            "yearly_hecs_repayment": yearly_hecs_repayment,
+            "household_income": household_income,
+            "net_income": net_income,
+            "borrowing_power": borrowing_power,
+            "loan_repayment": loan_repayment,
+        }
+
+    def calculate(self, requests: List[EstimateRequest]) -> List[BorrowingResponse]:
+        """
+        Calculate the borrowing response for every request.
+
+        Args:
+            requests: The profiles to estimate
+
+        Returns:
+            List[BorrowingResponse]: One response per request, in the same order
+        """
+        if not requests:
+            return []
+        results = self.calculate_columns(self.to_columns(requests))
+        rows = {name: values.tolist() for name, values in results.items()}
+        return [
+            BorrowingResponse(
+                total_income=rows["total_income"][i],
+                total_income_after_tax=rows["total_income_after_tax"][i],
+                total_expenses=rows["total_expenses"][i],
+                hasHecs=request.hasHecs,
+                net_income=rows["net_income"][i],
+                borrowing_power=rows["borrowing_power"][i],
+                stated_living_expenses=rows["stated_living_expenses"][i],
+                yearly_hecs_repayment=rows["yearly_hecs_repayment"][i],
+                employment_type=request.employmentType,
+                loan_purpose=request.loanPurpose,
+                loan_repayment=rows["loan_repayment"][i],
+                hem_benchmark=rows["hem_benchmark"][i],
+                monthly_hem_benchmark=rows["monthly_hem_benchmark"][i],
+            )
+            for i, request in enumerate(requests)
+        ]
+
+    def calculate_grid(self, request: EstimateRequest, axes: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Calculate borrowing power over a grid of what-if values for one profile.
+
+        Each entry in axes replaces the profile's value for that field with a range
+        of values. The columns are reshaped so that calculate_columns broadcasts
+        them into the full grid in a single pass.
+
+        Args:
+            request: The base profile
+            axes: Field name (from SENSITIVITY_FIELDS) to the values to try, in grid order
+
+        Returns:
+            Dict[str, np.ndarray]: borrowing_power and loan_repayment, each shaped
+            (len(values) for each axis)
+        """
+        if not axes:
+            raise ValueError("At least one sensitivity range is required")
+        for field in axes:
+            if field not in SENSITIVITY_FIELDS:
+                raise ValueError(f"Invalid sensitivity field: {field}")
+        shape = tuple(len(values) for values in axes.values())
+        if int(np.prod(shape)) > MAX_SENSITIVITY_CELLS:
+            raise ValueError(f"Sensitivity grid has {int(np.prod(shape))} cells, the maximum is {MAX_SENSITIVITY_CELLS}")
+
+        columns = self.to_columns([request])
+        for axis, (field, values) in enumerate(axes.items()):
+            axis_shape = [1] * len(shape)
+            axis_shape[axis] = len(values)
+            columns[field] = np.asarray(values, dtype=float).reshape(axis_shape)
+
+        results = self.calculate_columns(columns)
+        return {
+            "borrowing_power": np.broadcast_to(results["borrowing_power"], shape),
+            "loan_repayment": np.broadcast_to(results["loan_repayment"], shape),
+        }
@@ -0,0 +1,156 @@
+# Incremental Borrowing Calculation
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from models.borrowing_model import (
+    BorrowingResult, calculate_total_income, calculate_living_expenses, calculate_loan_repayment,
+    calculate_borrowing_power,
+)
+from api.models import EstimateRequest
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of the borrowing calculation.
+
+    compute receives the profile, the assumptions and the outputs of the stages
+    listed in depends_on, in that order.
+    """
+    name: str
+    fields: frozenset
+    depends_on: Tuple[str, ...]
+    compute: Callable
+
+
+def _total_expense(details: EstimateRequest, assumptions: dict, living_expenses, loan_repayments) -> float:
+    return details.rentBoard*12 + living_expenses.yearly_living_expenses + loan_repayments.yearly_total_loan_repayment
+
+
+# Stages in dependency order, mirroring calculate_borrowing
+STAGES = [
+    Stage(
+        name="income",
+        fields=frozenset({
+            "grossIncome", "incomeFrequency", "otherIncome", "secondPersonIncome", "secondPersonIncomeFrequency",
+            "secondPersonOtherIncome", "rentalIncome", "loanPurpose", "borrowingType", "financialYear",
+        }),
+        depends_on=(),
+        compute=lambda details, assumptions: calculate_total_income(details),
+    ),
+    Stage(
+        name="living_expenses",
+        fields=frozenset({"livingExpenses", "dependents", "borrowingType"}),
+        depends_on=(),
+        compute=calculate_living_expenses,
+    ),
+    Stage(
+        name="loan_repayments",
+        fields=frozenset({"hasHecs", "creditCardLimits", "loanRepayment", "financialYear"}),
+        depends_on=("income",),
+        compute=lambda details, assumptions, income: calculate_loan_repayment(details, income.yearly_income_after_tax),
+    ),
+    Stage(
+        name="total_expense",
+        fields=frozenset({"rentBoard"}),
+        depends_on=("living_expenses", "loan_repayments"),
+        compute=_total_expense,
+    ),
+    Stage(
+        name="borrowing",
+        fields=frozenset({"interestRate", "loanTerm"}),
+        depends_on=("income", "total_expense"),
+        compute=lambda details, assumptions, income, total_expense: calculate_borrowing_power(
+            details, income.yearly_income_after_tax - total_expense
+        ),
+    ),
+]
+
+
+@dataclass(frozen=True, slots=True)
+class GraphUpdate:
+    """
+    Outcome of applying a field delta.
+
+    Attributes:
+        result: The updated borrowing result
+        recomputed: Stages that were recomputed, in order
+        changed: BorrowingResponse fields whose value changed, with their new values
+    """
+    result: BorrowingResult
+    recomputed: Tuple[str, ...]
+    changed: Dict[str, Any]
+
+
+class BorrowingGraph:
+    """
+    The borrowing calculation as a small dependency graph of cached stages.
+
+    Applying a field delta only recomputes the stages that read a changed field,
+    plus downstream stages whose inputs actually changed value.
+    """
+
+    def __init__(self, result: BorrowingResult, assumptions: dict, stages: List[Stage] = None):
+        self.assumptions = assumptions
+        self.stages = stages or STAGES
+        self.result = result
+
+    @classmethod
+    def from_details(cls, details: EstimateRequest, assumptions: dict) -> "BorrowingGraph":
+        """Build a graph by computing every stage for details."""
+        graph = cls(None, assumptions)
+        graph.result = graph._build(details, {}, set())[0]
+        return graph
+
+    def _stage_values(self) -> Dict[str, Any]:
+        return {
+            "income": self.result.income,
+            "living_expenses": self.result.living_expenses,
+            "loan_repayments": self.result.loan_repayments,
+            "total_expense": self.result.total_expense,
+            "borrowing": self.result.borrowing,
+        }
+
+    def _build(self, details: EstimateRequest, values: Dict[str, Any], dirty_fields: set) -> Tuple[BorrowingResult, List[str]]:
+        values = dict(values)
+        changed_stages = set()
+        recomputed = []
+        for stage in self.stages:
+            if stage.name in values and not (stage.fields & dirty_fields) and not changed_stages.intersection(stage.depends_on):
+                continue
+            value = stage.compute(details, self.assumptions, *(values[name] for name in stage.depends_on))
+            recomputed.append(stage.name)
+            if values.get(stage.name) != value:
+                changed_stages.add(stage.name)
+            values[stage.name] = value
+        result = BorrowingResult(
+            details=details,
+            income=values["income"],
+            living_expenses=values["living_expenses"],
+            loan_repayments=values["loan_repayments"],
+            total_expense=values["total_expense"],
+            borrowing=values["borrowing"],
+        )
+        return result, recomputed
+
+    def apply(self, changes: Dict[str, Any]) -> GraphUpdate:
+        """
+        Apply field changes and recompute only the affected stages.
+
+        Args:
+            changes: EstimateRequest field names to new values
+
+        Returns:
+            GraphUpdate: The new result, the stages recomputed and the outputs that changed
+        """
+        old_details = self.result.details
+        details = EstimateRequest(**{**old_details.model_dump(), **changes})
+        dirty_fields = {field for field in changes if getattr(details, field) != getattr(old_details, field)}
+
+        result, recomputed = self._build(details, self._stage_values(), dirty_fields)
+        old_response = self.result.to_response().model_dump()
+        new_response = result.to_response().model_dump()
+        changed = {field: value for field, value in new_response.items() if old_response[field] != value}
+
+        self.result = result
+        return GraphUpdate(result=result, recomputed=tuple(recomputed), changed=changed)
@@ -1,187 +1,267 @@
 # Borrowing Model
+from dataclasses import dataclass
 from pydantic import BaseModel
 import json
+from typing import Optional
 from models.tax_rates import calculate_tax
 from models.hec_rates import calculate_hecs_repayment
-from api.models import EstimateRequest, BorrowingResponse, GovernmentScheme
+from models.government_schemes import SchemeRulesEngine
+from api.models import EstimateRequest, BorrowingResponse
+
+BUFFER_RATE = 0.03
+
+
+def load_assumptions():
+    with open('backend/utils/assumptions.json', 'r') as f:
+        return json.load(f)
+
+
+def load_government_schemes():
+    with open('backend/utils/government_schemes.json', 'r') as f:
+        return json.load(f)
+
+
+@dataclass(frozen=True, slots=True)
+class IncomeBreakdown:
+    yearly_income: float
+    yearly_other_income: float
+    yearly_second_person_income: float
+    yearly_second_person_other_income: float
+    household_income: float
+    yearly_income_after_tax: float
+
+
+@dataclass(frozen=True, slots=True)
+class LivingExpenses:
+    yearly_stated_living_expenses: float
+    hem_benchmark: float
+    yearly_living_expenses: float
+
+
+@dataclass(frozen=True, slots=True)
+class LoanRepayments:
+    yearly_hecs_repayment: float
+    yearly_total_loan_repayment: float
+
+
+@dataclass(frozen=True, slots=True)
+class BorrowingPower:
+    net_income: float
+    borrowing_power: float
+    loan_repayment: float
+
+
+@dataclass(frozen=True, slots=True)
+class BorrowingResult:
+    """
+    Immutable result of the borrowing calculation for one profile.
+    Safe to share between threads and to keep per session.
+    """
+    details: EstimateRequest
+    income: IncomeBreakdown
+    living_expenses: LivingExpenses
+    loan_repayments: LoanRepayments
+    total_expense: float
+    borrowing: BorrowingPower
+
+    @property
+    def household_income(self) -> float:
+        return self.income.household_income
+
+    @property
+    def borrowing_power(self) -> float:
+        return self.borrowing.borrowing_power
+
+    def to_response(self) -> BorrowingResponse:
+        return BorrowingResponse(
+            total_income=self.income.yearly_income+self.income.yearly_other_income,
+            total_income_after_tax=self.income.yearly_income_after_tax,
+            total_expenses=self.total_expense,
+            hasHecs=self.details.hasHecs,
+            net_income=self.borrowing.net_income,
+            borrowing_power=self.borrowing.borrowing_power,
+            stated_living_expenses=self.living_expenses.yearly_stated_living_expenses,
+            yearly_hecs_repayment=self.loan_repayments.yearly_hecs_repayment,
+            employment_type=self.details.employmentType,
+            loan_purpose=self.details.loanPurpose,
+            loan_repayment=self.borrowing.loan_repayment,
+            hem_benchmark=self.living_expenses.hem_benchmark,
+            monthly_hem_benchmark=self.living_expenses.hem_benchmark/12
+        )
+
+
+def calculate_total_income(details: EstimateRequest) -> IncomeBreakdown: # Convert all income to yearly
+    # First person's income
+    if details.incomeFrequency == "weekly":
+        yearly_income = details.grossIncome * 52
+        yearly_other_income = details.otherIncome * 52
+    elif details.incomeFrequency == "monthly":
+        yearly_income = details.grossIncome * 12
+        yearly_other_income = details.otherIncome * 12
+    else:
+        yearly_income = details.grossIncome
+        yearly_other_income = details.otherIncome
+
+    # Second person's income
+    if details.borrowingType == "Individual":
+        yearly_secondPersonIncome = 0
+        yearly_secondPersonOtherIncome = 0
+    else:
+        if details.secondPersonIncomeFrequency == "weekly":
+            yearly_secondPersonIncome = details.secondPersonIncome * 52
+            yearly_secondPersonOtherIncome = details.secondPersonOtherIncome * 52
+        elif details.secondPersonIncomeFrequency == "monthly":
+            yearly_secondPersonIncome = details.secondPersonIncome * 12
+            yearly_secondPersonOtherIncome = details.secondPersonOtherIncome * 12
+        else:
+            yearly_secondPersonIncome = details.secondPersonIncome
+            yearly_secondPersonOtherIncome = details.secondPersonOtherIncome
+
+    # Rental income
+    if details.loanPurpose == "Investor":
+        yearly_rentalIncome = details.rentalIncome * 52 * 0.85 # Take a haircut for maintenance and repairs
+    else:
+        yearly_rentalIncome = 0
+
+    # Add rental income to other income, split into equal parts for couples
+    if details.borrowingType == "Individual":
+        yearly_other_income += yearly_rentalIncome
+    else:
+        yearly_other_income += yearly_rentalIncome / 2
+        yearly_secondPersonOtherIncome += yearly_rentalIncome / 2
+
+    # Need to apply taxes to income
+    household_income = yearly_income + yearly_other_income + yearly_secondPersonIncome + yearly_secondPersonOtherIncome
+    yearly_income_after_tax = yearly_income + yearly_other_income - calculate_tax(yearly_income+yearly_other_income, details.financialYear)
+    yearly_secondPersonIncome_after_tax = yearly_secondPersonIncome + yearly_secondPersonOtherIncome - calculate_tax(yearly_secondPersonIncome+yearly_secondPersonOtherIncome, details.financialYear)
+
+    return IncomeBreakdown(
+        yearly_income=yearly_income,
+        yearly_other_income=yearly_other_income,
+        yearly_second_person_income=yearly_secondPersonIncome,
+        yearly_second_person_other_income=yearly_secondPersonOtherIncome,
+        household_income=household_income,
+        # Total income
+        yearly_income_after_tax=yearly_income_after_tax + yearly_secondPersonIncome_after_tax
+    )
+
+
+def calculate_living_expenses(details: EstimateRequest, assumptions: dict) -> LivingExpenses: # Convert all living expenses to yearly
+    yearly_livingExpenses = details.livingExpenses*12
+    yearly_stated_livingExpenses = yearly_livingExpenses # Stated expenses
+    # Living expenses cannot be below the HEM benchmark
+    if details.dependents > 3:
+        dependents = 3
+    else:
+        dependents = details.dependents
+    hem_benchmark = assumptions['hem_benchmark']['simple'][details.borrowingType][str(dependents)] * 12
+    if yearly_livingExpenses < hem_benchmark:
+        yearly_livingExpenses = hem_benchmark
+    return LivingExpenses(
+        yearly_stated_living_expenses=yearly_stated_livingExpenses,
+        hem_benchmark=hem_benchmark,
+        yearly_living_expenses=yearly_livingExpenses
+    )
+
+
+def calculate_loan_repayment(details: EstimateRequest, yearly_income_after_tax: float) -> LoanRepayments:
+    if details.hasHecs == True:
+        yearly_hecs_repayment = calculate_hecs_repayment(yearly_income_after_tax, details.financialYear)
+    else:
+        yearly_hecs_repayment = 0
+
+    yearly_credit_card_limits = details.creditCardLimits
+    yearly_loan_repayment = details.loanRepayment * 12
+    return LoanRepayments(
+        yearly_hecs_repayment=yearly_hecs_repayment,
+        yearly_total_loan_repayment=yearly_loan_repayment + yearly_credit_card_limits * 0.04 + yearly_hecs_repayment
+    )
+
+
+def calculate_borrowing_power(details: EstimateRequest, yearly_income_after_expenses: float) -> BorrowingPower:
+    if yearly_income_after_expenses < 0:
+        return BorrowingPower(net_income=yearly_income_after_expenses, borrowing_power=0, loan_repayment=0)
+    # PV = P * (1 - (1 + r)^-n) / r
+    pre_buffer_rate = details.interestRate/100
+    rate = details.interestRate/100 + BUFFER_RATE
+    borrowing_power = round(yearly_income_after_expenses * (1 - (1 + rate)**-details.loanTerm) / rate, 0)
+    # calculate loan repayment on a monthly basis
+    expected_loan_repayment = borrowing_power * pre_buffer_rate/12 * (1 + pre_buffer_rate/12)**(details.loanTerm*12) / ((1 + pre_buffer_rate/12)**(details.loanTerm*12) - 1)
+    return BorrowingPower(
+        net_income=yearly_income_after_expenses,
+        borrowing_power=borrowing_power,
+        loan_repayment=expected_loan_repayment
+    )
+
+
+def calculate_borrowing(details: EstimateRequest, assumptions: dict) -> BorrowingResult:
+    """
+    Calculate borrowing power for one profile without touching any shared state.
+
+    Args:
+        details: The user's financial details
+        assumptions: The loaded assumptions.json
+
+    Returns:
+        BorrowingResult: The immutable result of every stage of the calculation
+    """
+    # 1. Calculate the total income
+    income = calculate_total_income(details)
+    # 2. Calculate the total expenses
+    yearly_rentBoard = details.rentBoard*12
+    living_expenses = calculate_living_expenses(details, assumptions)
+    loan_repayments = calculate_loan_repayment(details, income.yearly_income_after_tax)
+    total_expense = yearly_rentBoard + living_expenses.yearly_living_expenses + loan_repayments.yearly_total_loan_repayment
+    # 3. Calculate the borrowing power
+    borrowing = calculate_borrowing_power(details, income.yearly_income_after_tax - total_expense)
+    return BorrowingResult(
+        details=details,
+        income=income,
+        living_expenses=living_expenses,
+        loan_repayments=loan_repayments,
+        total_expense=total_expense,
+        borrowing=borrowing
+    )
+
 
 class BorrowingModel:
+    """
+    Holds one user's borrowing details and latest result.
+
+    The calculation itself is done by the pure calculate_borrowing function; this
+    class only keeps the result around, so give each session its own instance.
+    """
     def __init__(self):
         self.details = None
+        self.result: Optional[BorrowingResult] = None
         self.assumptions = self.load_assumptions()
         self.government_schemes = self.load_government_schemes()
+        self.scheme_rules = SchemeRulesEngine(self.government_schemes)
         self.eligible_government_schemes = []
-        
+
     def load_assumptions(self):
-        with open('backend/utils/assumptions.json', 'r') as f:
-            return json.load(f)
-        
+        return load_assumptions()
+
     def load_government_schemes(self):
-        with open('backend/utils/government_schemes.json', 'r') as f:
-            return json.load(f)
+        return load_government_schemes()
 
     def update_details(self, request: EstimateRequest):
+        self.result = calculate_borrowing(request, self.assumptions)
         self.details = request
-        # Calculate borrowing power
-        # 1. Calculate the total income
-        self.calculate_total_income()
-        # 2. Calculate the total expenses
-        self.calculate_total_expenses()
-        # 3. Calculate the borrowing power
-        self.calculate_borrowing_power()
 
     def get_borrowing_response(self):
-        if self.details != None:
-            return BorrowingResponse(
-                total_income=self.yearly_income+self.yearly_other_income,
-                total_income_after_tax=self.yearly_income_after_tax,
-                total_expenses=self.total_expense,
-                hasHecs=self.details.hasHecs,
-                net_income=self.yearly_income_after_expenses,
-                borrowing_power=self.borrowing_power,
-                stated_living_expenses=self.yearly_stated_livingExpenses,
-                yearly_hecs_repayment=self.yearly_hecs_repayment,
-                employment_type=self.details.employmentType,
-                loan_purpose=self.details.loanPurpose,
-                loan_repayment=self.expected_loan_repayment,
-                hem_benchmark=self.hem_benchmark,
-                monthly_hem_benchmark=self.hem_benchmark/12
-            )
+        if self.result != None:
+            return self.result.to_response()
         else:
             return None
-        
+
     def get_eligible_government_schemes(self):
         if self.eligible_government_schemes is not None:
             return self.eligible_government_schemes
         else:
             return []
-    
-    def calculate_total_income(self): # Convert all income to yearly
-        # First person's income
-        if self.details.incomeFrequency == "weekly":
-            self.yearly_income = self.details.grossIncome * 52
-            self.yearly_other_income = self.details.otherIncome * 52
-        elif self.details.incomeFrequency == "monthly":
-            self.yearly_income = self.details.grossIncome * 12
-            self.yearly_other_income = self.details.otherIncome * 12
-        else:
-            self.yearly_income = self.details.grossIncome
-            self.yearly_other_income = self.details.otherIncome
-
-        # Second person's income
-        if self.details.borrowingType == "Individual":
-            self.yearly_secondPersonIncome = 0
-            self.yearly_secondPersonOtherIncome = 0
-        else:
-            if self.details.secondPersonIncomeFrequency == "weekly":
-                self.yearly_secondPersonIncome = self.details.secondPersonIncome * 52
-                self.yearly_secondPersonOtherIncome = self.details.secondPersonOtherIncome * 52
-            elif self.details.secondPersonIncomeFrequency == "monthly":
-                self.yearly_secondPersonIncome = self.details.secondPersonIncome * 12
-                self.yearly_secondPersonOtherIncome = self.details.secondPersonOtherIncome * 12
-            else:
-                self.yearly_secondPersonIncome = self.details.secondPersonIncome
-                self.yearly_secondPersonOtherIncome = self.details.secondPersonOtherIncome
-
-        # Rental income
-        if self.details.loanPurpose == "Investor":
-            self.yearly_rentalIncome = self.details.rentalIncome * 52 * 0.85 # Take a haircut for maintenance and repairs
-        else:
-            self.yearly_rentalIncome = 0
-
-        # Add rental income to other income, split into equal parts for couples
-        if self.details.borrowingType == "Individual":
-            self.yearly_other_income += self.yearly_rentalIncome
-        else:
-            self.yearly_other_income += self.yearly_rentalIncome / 2
-            self.yearly_secondPersonOtherIncome += self.yearly_rentalIncome / 2
-
-        # Need to apply taxes to income
-        self.household_income = self.yearly_income + self.yearly_other_income + self.yearly_secondPersonIncome + self.yearly_secondPersonOtherIncome
-        self.yearly_income_after_tax = self.yearly_income + self.yearly_other_income - calculate_tax(self.yearly_income+self.yearly_other_income)
-        self.yearly_secondPersonIncome_after_tax = self.yearly_secondPersonIncome + self.yearly_secondPersonOtherIncome - calculate_tax(self.yearly_secondPersonIncome+self.yearly_secondPersonOtherIncome)
-        
-        # Total income
-        self.yearly_income_after_tax += self.yearly_secondPersonIncome_after_tax
-
-    def calculate_total_expenses(self): # Convert all expenses to yearly
-        # Rent/Board expenses
-        self.yearly_rentBoard = self.details.rentBoard*12
-
-        self.calculate_living_expenses()
-        self.calculate_loan_repayment()
-        self.total_expense = self.yearly_rentBoard + self.yearly_livingExpenses + self.yearly_total_loan_repayment
-
-    def calculate_loan_repayment(self):
-        if self.details.hasHecs == True:
-            self.yearly_hecs_repayment = calculate_hecs_repayment(self.yearly_income_after_tax)
-        else:
-            self.yearly_hecs_repayment = 0
-
-        self.yearly_credit_card_limits = self.details.creditCardLimits
-        self.yearly_loan_repayment = self.details.loanRepayment * 12
-        self.yearly_total_loan_repayment = self.yearly_loan_repayment + self.yearly_credit_card_limits * 0.04 + self.yearly_hecs_repayment
-
-    def calculate_living_expenses(self): # Convert all living expenses to yearly
-        self.yearly_livingExpenses = self.details.livingExpenses*12
-        self.yearly_stated_livingExpenses = self.yearly_livingExpenses # Stated expenses
-        # Living expenses cannot be below the HEM benchmark
-        if self.details.dependents > 3:
-            dependents = 3
-        else:
-            dependents = self.details.dependents
-        hem_benchmark = self.assumptions['hem_benchmark']['simple'][self.details.borrowingType][str(dependents)]
-        self.hem_benchmark = hem_benchmark * 12
-        if self.yearly_livingExpenses < self.hem_benchmark:
-            self.yearly_livingExpenses = self.hem_benchmark
-
-    def calculate_borrowing_power(self):
-        self.yearly_income_after_expenses = self.yearly_income_after_tax - self.total_expense
-        if self.yearly_income_after_expenses < 0:
-            self.borrowing_power = 0
-            self.expected_loan_repayment = 0
-        else:
-            # PV = P * (1 - (1 + r)^-n) / r 
-            buffer_rate = 0.03
-            pre_buffer_rate = self.details.interestRate/100
-            rate = self.details.interestRate/100 + buffer_rate
-            self.borrowing_power = round(self.yearly_income_after_expenses * (1 - (1 + rate)**-self.details.loanTerm) / rate, 0)
-            # calculate loan repayment on a monthly basis
-            self.expected_loan_repayment = self.borrowing_power * pre_buffer_rate/12 * (1 + pre_buffer_rate/12)**(self.details.loanTerm*12) / ((1 + pre_buffer_rate/12)**(self.details.loanTerm*12) - 1)
 
     def check_government_schemes(self, state):
-        schemes = []
-        for scheme_name, scheme in self.government_schemes[state]['first_home_schemes'].items():
-            new_scheme = GovernmentScheme(
-                name=scheme['name'],
-                eligibilityDescription=scheme['eligibility'],
-                offer=scheme['offer'],
-                eligibilityRequirements=[]
-            )
-            for requirement in scheme['eligibilityRequirements']:
-                if requirement == "isFirstTimeBuyer":
-                    if self.details.isFirstTimeBuyer:
-                        new_scheme.eligibilityRequirements.append(("First time buyer", True))
-                    else:
-                        new_scheme.eligibilityRequirements.append(("First time buyer", False))
-                elif requirement == "borrowingType":
-                    if self.details.borrowingType is not None and self.details.borrowingType == "Individual":
-                        if self.household_income <= scheme['eligibilityRequirements']['borrowingType']['Individual']['householdIncome']:
-                            new_scheme.eligibilityRequirements.append(("Household income below $125,000", True))
-                        else:
-                            new_scheme.eligibilityRequirements.append(("Household income below $125,000", False))
-                    else:
-                        if self.household_income <= scheme['eligibilityRequirements']['borrowingType']['Couple']['householdIncome']:
-                            new_scheme.eligibilityRequirements.append(("Household income below $200,000", True))
-                        else:
-                            new_scheme.eligibilityRequirements.append(("Household income below $200,000", False))
-                elif requirement == "loanPurpose":
-                    if self.details.loanPurpose is not None and self.details.loanPurpose == "Owner-occupied":
-                        new_scheme.eligibilityRequirements.append(("Owner-occupied", True))
-                    else:
-                        new_scheme.eligibilityRequirements.append(("Owner-occupied", False))
-
-            schemes.append(new_scheme)
-
+        schemes = self.scheme_rules.check(state, self.details, self.result.household_income)
         self.eligible_government_schemes = schemes
-        return schemes
\ No newline at end of file
+        return schemes
@@ -0,0 +1,144 @@
+# Borrowing Solver
+from typing import Dict
+
+import numpy as np
+
+from models.batch_borrowing import BatchBorrowingModel, BUFFER_RATE
+from models.tax_rates import get_tax_table
+from api.models import EstimateRequest
+
+SOLVABLE_FIELDS = ["grossIncome", "livingExpenses", "interestRate", "loanTerm"]
+
+BISECTION_ITERATIONS = 60
+MAX_YEARLY_INCOME = 10000000
+MAX_INTEREST_RATE = 1.0
+
+
+class BorrowingSolver:
+    """
+    Solves the borrowing calculation backwards: given a target loan amount, find the
+    value of one field that makes the profile's borrowing power reach it.
+
+    Loan term and living expenses are solved analytically from the PV formula.
+    Gross income crosses the piecewise tax, HECS and HEM brackets, and interest rate
+    has no closed form, so both use bisection vectorized across all targets.
+    The flat HECS rate makes borrowing power drop each time income enters a higher
+    HECS bracket, so gross income is bisected within each bracket separately.
+    Targets that cannot be reached come back as NaN.
+    """
+
+    def __init__(self, batch_model: BatchBorrowingModel = None):
+        self.batch_model = batch_model or BatchBorrowingModel()
+
+    def solve(self, request: EstimateRequest, solve_for: str, targets: np.ndarray) -> np.ndarray:
+        """
+        Solve for one field over many target loan amounts.
+
+        Args:
+            request: The profile to hold fixed apart from solve_for
+            solve_for: The field to solve for (one of SOLVABLE_FIELDS)
+            targets: Target loan amounts
+
+        Returns:
+            np.ndarray: For each target, the minimum grossIncome (in the profile's
+            incomeFrequency), the maximum monthly livingExpenses, the maximum
+            interestRate (percent) or the minimum whole-year loanTerm. NaN where
+            the target cannot be reached.
+        """
+        if solve_for not in SOLVABLE_FIELDS:
+            raise ValueError(f"Invalid field to solve for: {solve_for}")
+        targets = np.asarray(targets, dtype=float)
+        columns = self.batch_model.to_columns([request])
+        solver = getattr(self, f"_solve_{solve_for}")
+        return solver(columns, targets)
+
+    def _required_surplus(self, columns: Dict[str, np.ndarray], targets: np.ndarray) -> np.ndarray:
+        """Yearly net income needed for each target under the buffered rate (inverse PV formula)."""
+        rate = columns["interestRate"] / 100 + BUFFER_RATE
+        return targets * rate / (1 - (1 + rate) ** -columns["loanTerm"])
+
+    def _bisect(self, columns: Dict[str, np.ndarray], field: str, targets: np.ndarray, low: float, high: float,
+                increasing: bool) -> np.ndarray:
+        """
+        Find where borrowing power crosses each target by varying one column.
+
+        Returns the smallest value that reaches the target when borrowing power is
+        increasing in the field, or the largest when it is decreasing.
+        """
+        lows = np.full(targets.shape, low)
+        highs = np.full(targets.shape, high)
+        for _ in range(BISECTION_ITERATIONS):
+            mids = (lows + highs) / 2
+            reached = self.batch_model.calculate_columns({**columns, field: mids})["borrowing_power"] >= targets
+            if increasing:
+                highs = np.where(reached, mids, highs)
+                lows = np.where(reached, lows, mids)
+            else:
+                lows = np.where(reached, mids, lows)
+                highs = np.where(reached, highs, mids)
+
+        solution = highs if increasing else lows
+        feasible = self.batch_model.calculate_columns({**columns, field: solution})["borrowing_power"] >= targets
+        return np.where(feasible, solution, np.nan)
+
+    def _income_crossings(self, columns: Dict[str, np.ndarray], output: str, levels: np.ndarray, high: float) -> np.ndarray:
+        """Largest grossIncome at which an output increasing in income is still at or below each level."""
+        lows = np.zeros(levels.shape)
+        highs = np.full(levels.shape, high)
+        for _ in range(BISECTION_ITERATIONS):
+            mids = (lows + highs) / 2
+            above = self.batch_model.calculate_columns({**columns, "grossIncome": mids})[output] > levels
+            highs = np.where(above, mids, highs)
+            lows = np.where(above, lows, mids)
+        return lows
+
+    def _income_edges(self, columns: Dict[str, np.ndarray], high: float) -> np.ndarray:
+        """
+        Gross incomes at the tax and HECS bracket edges, from 0 to high.
+
+        Borrowing power is increasing in gross income between consecutive edges.
+        Tax brackets apply to the person's total income and HECS brackets to the
+        household's income after tax.
+        """
+        table = get_tax_table(columns["financialYear"][0])
+        edges = [0.0, high]
+        edges.extend(self._income_crossings(columns, "total_income", np.array(table.brackets.upper_bounds), high))
+        if columns["hasHecs"][0]:
+            edges.extend(self._income_crossings(
+                columns, "total_income_after_tax", np.array(table.hecs_brackets.upper_bounds), high
+            ))
+        return np.unique(np.clip(edges, 0.0, high))
+
+    def _solve_grossIncome(self, columns: Dict[str, np.ndarray], targets: np.ndarray) -> np.ndarray:
+        high = MAX_YEARLY_INCOME / columns["incomeMultiplier"][0]
+        edges = self._income_edges(columns, high)
+        # Search the brackets from the lowest income up and keep the first that reaches each target
+        incomes = np.full(targets.shape, np.nan)
+        for low, segment_high in zip(edges[:-1], edges[1:]):
+            unsolved = np.isnan(incomes)
+            if not unsolved.any():
+                break
+            incomes[unsolved] = self._bisect(columns, "grossIncome", targets[unsolved], low, segment_high, increasing=True)
+        return incomes
+
+    def _solve_interestRate(self, columns: Dict[str, np.ndarray], targets: np.ndarray) -> np.ndarray:
+        # Borrowing power is decreasing in the rate, so search for the highest rate that still reaches the target
+        return self._bisect(columns, "interestRate", targets, 0.0, MAX_INTEREST_RATE * 100, increasing=False)
+
+    def _solve_livingExpenses(self, columns: Dict[str, np.ndarray], targets: np.ndarray) -> np.ndarray:
+        results = self.batch_model.calculate_columns(columns)
+        living_expenses = np.maximum(results["stated_living_expenses"], results["hem_benchmark"])
+        other_expenses = results["total_expenses"] - living_expenses
+        available = results["total_income_after_tax"] - other_expenses - self._required_surplus(columns, targets)
+        # Living expenses are floored at the HEM benchmark, so targets needing less than it cannot be reached
+        return np.where(available >= results["hem_benchmark"], available / 12, np.nan)
+
+    def _solve_loanTerm(self, columns: Dict[str, np.ndarray], targets: np.ndarray) -> np.ndarray:
+        # PV = P * (1 - (1 + r)^-n) / r  =>  n = -ln(1 - PV * r / P) / ln(1 + r)
+        net_income = self.batch_model.calculate_columns(columns)["net_income"]
+        rate = columns["interestRate"] / 100 + BUFFER_RATE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            remaining = 1 - targets * rate / net_income
+            terms = np.ceil(-np.log(remaining) / np.log(1 + rate) - 1e-9)
+        feasible = (net_income > 0) & (remaining > 0)
+        return np.where(targets <= 0, 0.0, np.where(feasible, terms, np.nan))
@@ -4,29 +4,64 @@ This module contains the ChatModel class, which is used to interact with the cha
 
 import os
 import json
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from weakref import WeakKeyDictionary
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Deque, AsyncIterator, Awaitable
+from collections import deque
 from google import genai
 import logging
+import time
 from pathlib import Path
 import sys
 
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
-from backend.api.models import ChatResponse, Action, ActionType, Field, GovernmentScheme
+from backend.api.models import ChatResponse, GovernmentScheme
 from backend.models.borrowing_model import BorrowingResponse
+from backend.models.prompt_builder import Prompt, PromptBuilder, PromptStats
+from backend.models.context_cache import ContextCacheMetrics, PromptContextCache
+from backend.models.stream_parser import ChatResponseStreamParser
+from backend.models.response_cache import ResponseCache, load_generic_questions, state_hash
+from backend.models.field_extractor import FieldExtractor
+from backend.models.resilience import CircuitOpenError, ResilienceSettings, ResilientClient, is_transient, request_deadline
+from backend.services.conversation_store import ConversationStore, Message
+from backend.services.session_store import DEFAULT_SESSION_ID
 
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "gemini-2.0-flash"
+# Sent without calling the model while the circuit breaker is open
+FALLBACK_REPLY = "Sorry, I can't answer right now. Please try again in a minute, your details are still saved."
+
+
+class ChatTimeoutError(TimeoutError):
+    """Raised when the chat model does not respond within the request timeout."""
+
+
 class ChatModel:
     """
     A class for interacting with the chat model.
     """
 
-    def __init__(self, api_key: str, system_messages: Optional[List[str]] = None):
+    def __init__(self, api_key: str, system_messages: Optional[List[str]] = None, conversations: Optional[ConversationStore] = None,
+                 prompt_max_tokens: int = 12000, client: Any = None, context_cache_ttl: Optional[float] = 3600,
+                 max_concurrent_requests: int = 8, request_timeout: float = 30.0,
+                 response_cache_size: int = 1024, response_cache_ttl: Optional[float] = 3600, fast_path: bool = True,
+                 resilience: Optional[ResilienceSettings] = ResilienceSettings()):
         self.api_key = api_key
+        self.client = client
+        # Limits for achat: concurrent model calls per process, and seconds per request
+        self.max_concurrent_requests = max_concurrent_requests
+        self.request_timeout = request_timeout
+        self._semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.logger = logger
-        self.message_history: List[Dict[str, str]] = []
+        # Conversation history per session, bounded in turns, tokens and memory
+        self.conversations = conversations or ConversationStore()
         
         # Initialize with default system messages if none provided
         self.system_messages = system_messages or [
@@ -56,20 +91,48 @@ class ChatModel:
             self.government_schemes = json.load(f)
         self.system_messages.append(f"Government schemes in NSW: {self.government_schemes}")
         
-        # Add system messages to history
-        for message in self.system_messages:
-            self.message_history.append({
-                "role": "system",
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            })
+        # System messages are shared by every session, so they are kept once rather than in each history
+        created_at = datetime.now().isoformat()
+        self.system_history = [
+            {"role": "system", "content": message, "timestamp": created_at} for message in self.system_messages
+        ]
+        # The static part of the prompt is rendered once; prompt_stats keeps token counts for recent turns
+        self.prompt_builder = PromptBuilder(self.system_messages, max_tokens=prompt_max_tokens)
+        self.prompt_stats: Deque[PromptStats] = deque(maxlen=1000)
+        self.last_prompt_stats: Optional[PromptStats] = None
         
         self._setup_gemini()
+        # Deadlines, retries, hedging and a circuit breaker around model calls; set resilience to None to disable
+        if self.client is not None and resilience is not None:
+            self.client = ResilientClient(self.client, resilience)
+
+        # Answers to repeated questions, shared across sessions for profile-independent questions;
+        # set response_cache_ttl to None to disable
+        self.response_cache = None
+        if response_cache_size and response_cache_ttl:
+            self.response_cache = ResponseCache(max_size=response_cache_size, ttl_seconds=response_cache_ttl,
+                                                profile_independent=load_generic_questions())
+
+        # Plain data-entry messages are turned into actions without a model call
+        self.field_extractor = FieldExtractor() if fast_path else None
+
+        # The static prefix is registered once as a cached context; set context_cache_ttl to None to disable
+        self.context_cache_metrics = ContextCacheMetrics()
+        self.context_cache = None
+        if self.client is not None and context_cache_ttl:
+            self.context_cache = PromptContextCache(self.client, MODEL_NAME, self.prompt_builder.prefix, ttl_seconds=context_cache_ttl)
+
+    @property
+    def message_history(self) -> List[Dict[str, str]]:
+        """System messages followed by the default session's conversation."""
+        return self.system_history + [message.to_dict() for message in self.conversations.history(DEFAULT_SESSION_ID)]
 
     def _setup_gemini(self) -> None:
         """Set up the Gemini API with the provided key."""
         try:
-            if self.api_key:
+            if self.client is not None:
+                self.logger.info("Using the provided chat client")
+            elif self.api_key:
                 # genai.configure(api_key=self.api_key)
                 # self.model = genai.GenerativeModel('gemini-2.0-flash')
                 self.client = genai.Client(api_key=self.api_key)
@@ -81,22 +144,204 @@ class ChatModel:
             self.logger.error(f"Failed to configure Gemini API: {str(e)}")
             raise
 
-    def _format_conversation_history(self) -> str:
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Lazy initialization of the thread pool used for clients without an async API."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_requests, thread_name_prefix="chat")
+        return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives belong to one event loop, so keep one semaphore per loop
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent_requests)
+        return semaphore
+
+    def metrics(self) -> Dict[str, Any]:
+        """Context cache, response cache and fast path savings and the size of the most recent prompt."""
+        metrics = self.context_cache_metrics.stats()
+        if self.context_cache is not None:
+            metrics["context_cache_created"] = self.context_cache.created
+            metrics["context_cache_refreshed"] = self.context_cache.refreshed
+            metrics["context_cache_failures"] = self.context_cache.failures
+        if self.response_cache is not None:
+            response_cache = self.response_cache.stats()
+            metrics["response_cache_hits"] = response_cache["hits"]
+            metrics["response_cache_misses"] = response_cache["misses"]
+        if self.field_extractor is not None:
+            fast_path = self.field_extractor.stats()
+            metrics["fast_path_hits"] = fast_path["hits"]
+            metrics["fast_path_misses"] = fast_path["misses"]
+            metrics["fast_path_hit_rate"] = fast_path["hit_rate"]
+            # Each hit saves a model call of average latency, less the time spent extracting
+            mean_latency = self.context_cache_metrics.mean_latency()
+            if mean_latency is not None:
+                metrics["fast_path_latency_saved"] = fast_path["hits"] * mean_latency - fast_path["seconds"]
+        if isinstance(self.client, ResilientClient):
+            resilience = self.client.stats()
+            metrics["llm_retries"] = resilience["retries"]
+            metrics["llm_timeouts"] = resilience["timeouts"]
+            metrics["llm_hedges"] = resilience["hedges"]
+            metrics["llm_hedge_wins"] = resilience["hedge_wins"]
+            metrics["circuit_state"] = resilience["circuit_state"]
+            metrics["circuit_short_circuits"] = resilience["short_circuits"]
+        metrics["last_prompt_tokens"] = self.last_prompt_stats.total_tokens if self.last_prompt_stats else None
+        return metrics
+
+    def _lookup_response(self, question: str, context: str, borrowing_response: BorrowingResponse, eligible_government_schemes: List[GovernmentScheme], session_id: str) -> Tuple[Any, Optional[Tuple[str, List[Dict[str, Any]]]]]:
+        """
+        Response cache key for a turn and the cached answer, if there is one.
+        Must be called before the turn is added to the session's history.
+        """
+        if self.response_cache is None:
+            return None, None
+
+        def state() -> str:
+            return state_hash(context, borrowing_response, eligible_government_schemes, self._previous_answer(session_id))
+
+        key = self.response_cache.key(question, state)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.logger.info("Answered from the response cache")
+        return key, cached
+
+    def _store_response(self, key, response_text: str, actions: List[Dict[str, Any]]) -> None:
+        if key is not None:
+            self.response_cache.put(key, response_text, actions)
+
+    def _fallback_reply(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """Canned reply while the circuit breaker is open. It is neither cached nor added to the conversation."""
+        self.logger.warning("Chat model circuit is open, sending the fallback reply")
+        return FALLBACK_REPLY, []
+
+    def _previous_answer(self, session_id: str) -> Optional[str]:
+        return next(
+            (message.content for message in reversed(self.conversations.history(session_id)) if message.role == "assistant"), None
+        )
+
+    def _extract_fields(self, question: str, session_id: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Answer a plain data-entry message with UPDATE_FIELD actions, without calling the model.
+        The turn is added to the session's history when it is answered.
+        """
+        if self.field_extractor is None:
+            return None
+        extracted = self.field_extractor.extract(question, self._previous_answer(session_id))
+        if extracted is not None:
+            self.logger.info("Answered by the field extractor")
+            self._add_turn(session_id, question, extracted[0])
+        return extracted
+
+    def _add_turn(self, session_id: str, question: str, response_text: str) -> None:
+        """
+        Add an answered turn to the session's history.
+        Questions are only added with their answer, so a timed out, failed or
+        short-circuited turn doesn't leave an unanswered question behind.
         """
-        Format the conversation history into a string that can be used as context.
+        self.conversations.append(session_id, "user", question)
+        self.conversations.append(session_id, "assistant", response_text)
+
+    def _prompt_request(self, prompt: Prompt, cache_name: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        """Contents and config for a prompt, sending only the dynamic part when the prefix is cached."""
+        config = {
+            "response_mime_type": "application/json",
+            "response_schema": ChatResponse
+        }
+        if cache_name is None:
+            return prompt.text, config
+        config["cached_content"] = cache_name
+        return prompt.dynamic, config
+
+    def _record_usage(self, prompt: Prompt, cache_name: Optional[str], response, latency: float) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        tokens_saved = (getattr(usage, "cached_content_token_count", None) or prompt.stats.prefix_tokens) if cache_name else 0
+        self.context_cache_metrics.record(cache_name is not None, latency, tokens_saved)
+
+    def _send_prompt(self, prompt: Prompt, use_cache: bool = True):
+        """
+        Send a prompt to the model, referencing the cached prefix when one is available.
         
+        Args:
+            prompt (Prompt): The prompt to send
+            use_cache (bool): Whether to use the cached prefix
+            
         Returns:
-            str: Formatted conversation history
+            The model's response
+        """
+        cache_name = self.context_cache.name() if use_cache and self.context_cache is not None else None
+        contents, config = self._prompt_request(prompt, cache_name)
+        
+        started = time.perf_counter()
+        try:
+            response = self.client.models.generate_content(contents=contents, model=MODEL_NAME, config=config)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            # Only a missing or expired cache is worth resending without it
+            if cache_name is None or is_transient(e):
+                raise
+            # The cache may have expired or been deleted on the server, so resend the full prompt
+            self.logger.warning(f"Generation with context cache {cache_name} failed, retrying without it: {str(e)}")
+            self.context_cache.invalidate()
+            return self._send_prompt(prompt, use_cache=False)
+        self._record_usage(prompt, cache_name, response, time.perf_counter() - started)
+        return response
+
+    async def _asend_prompt(self, prompt: Prompt, use_cache: bool = True):
+        """
+        Async version of _send_prompt.
+        
+        Uses the SDK's async client when the client has one, otherwise runs the
+        blocking call on a thread pool sized to the concurrency limit.
         """
-        formatted_history = []
-        for msg in self.message_history:
-            role = msg["role"].capitalize()
-            content = msg["content"]
-            formatted_history.append(f"{role}: {content}")
+        cache_name = None
+        if use_cache and self.context_cache is not None:
+            # Creating or refreshing the cache is a blocking call, made at most once per TTL
+            cache_name = await asyncio.to_thread(self.context_cache.name)
+        contents, config = self._prompt_request(prompt, cache_name)
         
-        return "\n".join(formatted_history)
+        started = time.perf_counter()
+        try:
+            if hasattr(self.client, "aio"):
+                response = await self.client.aio.models.generate_content(contents=contents, model=MODEL_NAME, config=config)
+            else:
+                # Run in a copy of this context so the request deadline reaches the client
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, partial(contextvars.copy_context().run, self.client.models.generate_content,
+                                           contents=contents, model=MODEL_NAME, config=config)
+                )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if cache_name is None or is_transient(e):
+                raise
+            self.logger.warning(f"Generation with context cache {cache_name} failed, retrying without it: {str(e)}")
+            self.context_cache.invalidate()
+            return await self._asend_prompt(prompt, use_cache=False)
+        self._record_usage(prompt, cache_name, response, time.perf_counter() - started)
+        return response
+
+    async def _aopen_stream(self, prompt: Prompt, use_cache: bool = True):
+        """Start a streamed generation, returning the chunk iterator and the cache name used."""
+        cache_name = None
+        if use_cache and self.context_cache is not None:
+            cache_name = await asyncio.to_thread(self.context_cache.name)
+        contents, config = self._prompt_request(prompt, cache_name)
+        try:
+            stream = await self.client.aio.models.generate_content_stream(contents=contents, model=MODEL_NAME, config=config)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if cache_name is None or is_transient(e):
+                raise
+            self.logger.warning(f"Streaming with context cache {cache_name} failed, retrying without it: {str(e)}")
+            self.context_cache.invalidate()
+            return await self._aopen_stream(prompt, use_cache=False)
+        return stream, cache_name
 
-    def _generate_response(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    def _generate_response(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None, history: Optional[List[Message]] = None) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Generate a response using the model, taking into account conversation history.
         
@@ -104,83 +349,36 @@ class ChatModel:
             question (str): The user's question
             context (str): Optional context about the user's situation
             borrowing_response (BorrowingResponse): The borrowing model if it exists
+            history (List[Message]): The conversation before this question
             
         Returns:
             Tuple[str, List[Dict[str, Any]]]: The model's response text and list of actions
         """
-        # Format the conversation history
-        conversation_history = self._format_conversation_history()
-        
-        # Create the prompt with conversation history
-        prompt = f"""Previous conversation:
-            {conversation_history}
-
-            Current question: {question}
-
-            Valid field names and their allowed values:
-            - isFirstTimeBuyer: "true", "false"
-            - grossIncome: number
-            - incomeFrequency: "weekly", "monthly", "yearly"
-            - otherIncome: number
-            - otherIncomeFrequency: "weekly", "monthly", "yearly"
-            - secondPersonIncome: number
-            - secondPersonIncomeFrequency: "weekly", "monthly", "yearly"
-            - secondPersonOtherIncome: number
-            - secondPersonOtherIncomeFrequency: "weekly", "monthly", "yearly"
-            - rentalIncome: number
-            - livingExpenses: number
-            - rentBoard: number
-            - dependents: number
-            - creditCardLimits: number
-            - loanRepayment: number
-            - hasHecs: "true", "false"
-            - age: number
-            - employmentType: "Full-time", "Part-time", "Self-employed", "Unemployed"
-            - loanPurpose: "Owner-occupied", "Investor"
-            - loanTerm: number
-            - interestRate: number
-            - borrowingType: "Individual", "Couple"
-
-            A few notes: 
-            - rentalIncome is a weekly amount, ONLY use the weekly amount, otherwise convert it to weekly. This is the only frequency that is allowed when the loan purpose is investor.
-            - livingExpenses is a monthly amount
-            - rentBoard is a monthly amount
-            - if someone provides information that is not in the right frequency, adjust it to the annual amount and change the relevant frequency to annual. Eg. if someone said they earn 1k a fortnight, convert that to be 26k a year and change the frequency to yearly.
-            - household income is the total income of the household, including the income of the second person if they are a couple. it is not something the user provides, but calculated. do not ask for this, only ask for what fields are in the context or borrowing model.
-            - if an 'update_field' action is created, if the field has a related frequency, make sure to update the frequency to the correct frequency.
-            - loan repayments is a monthly amount, if a number is provided but the frequency is not monthly, convert it to monthly.
-            - regarding hecs, we only need to ask if they have hecs debt and not the amount.
-
-            The response should be helpful and take into account the conversation history
-            and the context of the user including their details. If there is a borrowing model, 
-            please use refer to it if relevant. 
-
-            If the user is providing details that are not in the context or borrowing model or correct information that is already in the context or borrowing model, create an UPDATE_FIELD action to update that field.
-
-            Chat history: {context}
-
-            Borrowing model: {borrowing_response}
-
-            Eligible government schemes: {eligible_government_schemes}
-
-            Actions:
-            UPDATE_FIELD: Create when the user provides information that is not in the context or borrowing model. Or if the user is correcting information that is already in the context or borrowing model.
-            SUGGESTED_ANSWERS: Create when you are asking a question to the user, an example is when asking if a user has HECs debt, you can suggest answers like "Yes" or "No".
-            """
+        prompt = self._build_prompt(question, context, borrowing_response, eligible_government_schemes, history)
+        return self._parse_response(self._send_prompt(prompt))
+
+    async def _agenerate_response(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None, history: Optional[List[Message]] = None) -> Tuple[str, List[Dict[str, Any]]]:
+        """Async version of _generate_response."""
+        prompt = self._build_prompt(question, context, borrowing_response, eligible_government_schemes, history)
+        return self._parse_response(await self._asend_prompt(prompt))
+
+    def _build_prompt(self, question: str, context: str, borrowing_response: BorrowingResponse, eligible_government_schemes: List[GovernmentScheme], history: Optional[List[Message]]) -> Prompt:
+        # history is the snapshot taken when this turn started, so concurrent turns in the
+        # same session don't see each other's questions in place of their own
+        prompt = self.prompt_builder.build(question, history or [], context, borrowing_response, eligible_government_schemes)
+        self.last_prompt_stats = prompt.stats
+        self.prompt_stats.append(prompt.stats)
         
         self.logger.info("Generating response with conversation history...")
-        self.logger.debug(f"Using prompt: {prompt}")
-        
-        # Generate response
-        response = self.client.models.generate_content(
-            contents=prompt,
-            model="gemini-2.0-flash",   
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": ChatResponse
-            }
+        self.logger.info(
+            f"Prompt tokens: {prompt.stats.total_tokens} (prefix {prompt.stats.prefix_tokens}, "
+            f"history {prompt.stats.history_tokens}, {prompt.stats.turns_included} turns included, "
+            f"{prompt.stats.turns_summarised} summarised, {prompt.stats.turns_dropped} dropped)"
         )
-        
+        self.logger.debug(f"Using prompt: {prompt.text}")
+        return prompt
+
+    def _parse_response(self, response) -> Tuple[str, List[Dict[str, Any]]]:
         try:
             # Log the raw response for debugging
             self.logger.info("Raw model response:")
@@ -201,58 +399,7 @@ class ChatModel:
             self.logger.error(response.text)
             return response.text, []  # Fallback to raw text if JSON parsing fails
         
-    def _validate_actions(self, actions: List[Action]) -> List[Action]:
-        """
-        Validate the actions to make sure they are valid.
-        """
-        field_names = [field.value for field in Field]
-        # Check if the actions are valid
-        for action in actions:
-            if action.type not in [ActionType.UPDATE_FIELD, ActionType.DO_NOTHING]:
-                raise ValueError(f"Invalid action type: {action.type}")
-            if action.field not in field_names:
-                raise ValueError(f"Invalid field: {action.field}")
-            if action.field == Field.INCOME_FREQUENCY:
-                if action.value not in ["weekly", "monthly", "yearly"]:
-                    raise ValueError(f"Invalid income frequency: {action.value}")
-            if action.field == Field.OTHER_INCOME_FREQUENCY:
-                if action.value not in ["weekly", "monthly", "yearly"]:
-                    raise ValueError(f"Invalid other income frequency: {action.value}")
-            if action.field == Field.SECOND_PERSON_INCOME_FREQUENCY:
-                if action.value not in ["weekly", "monthly", "yearly"]:
-                    raise ValueError(f"Invalid second person income frequency: {action.value}")
-            if action.field == Field.SECOND_PERSON_OTHER_INCOME_FREQUENCY:
-                if action.value not in ["weekly", "monthly", "yearly"]:
-                    raise ValueError(f"Invalid second person other income frequency: {action.value}")
-            # Make sure the value is a number
-            if action.field == Field.IS_FIRST_TIME_BUYER:
-                if action.value not in ["true", "false"]:
-                    raise ValueError(f"Invalid is first time buyer: {action.value}")
-                action.value = action.value == "true"
-            if action.field in [Field.GROSS_INCOME, 
-                                Field.OTHER_INCOME, 
-                                Field.SECOND_PERSON_INCOME, 
-                                Field.SECOND_PERSON_OTHER_INCOME, 
-                                Field.RENTAL_INCOME, 
-                                Field.RENT_BOARD, 
-                                Field.LIVING_EXPENSES, 
-                                Field.INTEREST_RATE, 
-                                Field.CREDIT_CARD_LIMITS, 
-                                Field.LOAN_REPAYMENT, 
-                                Field.AGE, 
-                                Field.DEPENDENTS,
-                                Field.LOAN_TERM]:
-                if float(action.value) < 0:
-                    raise ValueError(f"{action.field} cannot be negative: {action.value}")
-                if isinstance(action.value, str):
-                    try:
-                        action.value = float(action.value)
-                    except ValueError:
-                        raise ValueError(f"Invalid value for {action.field}: {action.value}")
-            
-        return actions
-
-    def chat(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    def chat(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None, session_id: str = DEFAULT_SESSION_ID) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Process a user question and generate a response.
         
@@ -260,24 +407,156 @@ class ChatModel:
             question (str): The user's question
             context (str): The context of the user including their details
             borrow_model (BorrowingResponse): The borrowing model if it exists
+            session_id (str): The conversation this question belongs to
         Returns:
             Tuple[str, List[Dict[str, Any]]]: The assistant's response text and list of actions
         """
-        # Add user message to history
-        self.message_history.append({
-            "role": "user",
-            "content": question,
-            "timestamp": datetime.now().isoformat()
-        })
-        # Generate response
-        response_text, actions = self._generate_response(question, context, borrowing_response, eligible_government_schemes)
-        # Add assistant response to history
-        self.message_history.append({
-            "role": "assistant",
-            "content": response_text,
-            "timestamp": datetime.now().isoformat()
-        })
+        extracted = self._extract_fields(question, session_id)
+        if extracted is not None:
+            return extracted
+        cache_key, cached = self._lookup_response(question, context, borrowing_response, eligible_government_schemes, session_id)
+        history = self.conversations.history(session_id)
+        # Generate response, unless the same question was answered for the same state
+        if cached is not None:
+            response_text, actions = cached
+        else:
+            try:
+                response_text, actions = self._generate_response(question, context, borrowing_response, eligible_government_schemes, history)
+            except CircuitOpenError:
+                return self._fallback_reply()
+            self._store_response(cache_key, response_text, actions)
+        self._add_turn(session_id, question, response_text)
         
         return response_text, actions
 
+    async def achat(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None, session_id: str = DEFAULT_SESSION_ID) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Async version of chat that does not block the event loop.
+        
+        At most max_concurrent_requests model calls run at once per process; further
+        requests wait for a slot. Waiting and generation together are limited to
+        request_timeout seconds.
+        
+        Args:
+            question (str): The user's question
+            context (str): The context of the user including their details
+            borrowing_response (BorrowingResponse): The borrowing model if it exists
+            eligible_government_schemes (List[GovernmentScheme]): Schemes checked for the user
+            session_id (str): The conversation this question belongs to
+        Returns:
+            Tuple[str, List[Dict[str, Any]]]: The assistant's response text and list of actions
+        Raises:
+            ChatTimeoutError: If no response arrived within request_timeout
+        """
+        extracted = self._extract_fields(question, session_id)
+        if extracted is not None:
+            return extracted
+        cache_key, cached = self._lookup_response(question, context, borrowing_response, eligible_government_schemes, session_id)
+        history = self.conversations.history(session_id)
+        if cached is not None:
+            self._add_turn(session_id, question, cached[0])
+            return cached
+        deadline = time.perf_counter() + self.request_timeout
+
+        async def generate():
+            async with self._semaphore():
+                # Retries of the model call only get the time left after waiting for a slot
+                with request_deadline(deadline):
+                    return await self._agenerate_response(question, context, borrowing_response, eligible_government_schemes, history)
+
+        try:
+            response_text, actions = await asyncio.wait_for(generate(), timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            raise ChatTimeoutError(f"No response from the chat model within {self.request_timeout} seconds")
+        except CircuitOpenError:
+            return self._fallback_reply()
+        self._store_response(cache_key, response_text, actions)
+        self._add_turn(session_id, question, response_text)
+        return response_text, actions
+
+    async def astream_chat(self, question: str, context: str = None, borrowing_response: BorrowingResponse = False, eligible_government_schemes: List[GovernmentScheme] = None, session_id: str = DEFAULT_SESSION_ID) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a response while the model generates it.
+        
+        Yields ("token", text) events as the response text arrives, then
+        ("actions", actions) once the JSON is complete and finally ("done", response_text).
+        The same concurrency limit as achat applies, and request_timeout bounds the whole stream.
+        
+        Args:
+            question (str): The user's question
+            context (str): The context of the user including their details
+            borrowing_response (BorrowingResponse): The borrowing model if it exists
+            eligible_government_schemes (List[GovernmentScheme]): Schemes checked for the user
+            session_id (str): The conversation this question belongs to
+        Raises:
+            ChatTimeoutError: If the stream did not complete within request_timeout
+        """
+        extracted = self._extract_fields(question, session_id)
+        if extracted is not None:
+            yield "token", extracted[0]
+            yield "actions", extracted[1]
+            yield "done", extracted[0]
+            return
+        cache_key, cached = self._lookup_response(question, context, borrowing_response, eligible_government_schemes, session_id)
+        history = self.conversations.history(session_id)
+        if cached is not None:
+            response_text, actions = cached
+            self._add_turn(session_id, question, response_text)
+            yield "token", response_text
+            yield "actions", actions
+            yield "done", response_text
+            return
+        deadline = time.perf_counter() + self.request_timeout
+
+        async def before_deadline(awaitable: Awaitable):
+            try:
+                return await asyncio.wait_for(awaitable, timeout=max(deadline - time.perf_counter(), 0))
+            except asyncio.TimeoutError:
+                raise ChatTimeoutError(f"No complete response from the chat model within {self.request_timeout} seconds")
+
+        async def open_stream(prompt: Prompt):
+            with request_deadline(deadline):
+                return await self._aopen_stream(prompt)
+
+        semaphore = self._semaphore()
+        await before_deadline(semaphore.acquire())
+        try:
+            prompt = self._build_prompt(question, context, borrowing_response, eligible_government_schemes, history)
+            started = time.perf_counter()
+            try:
+                stream, cache_name = await before_deadline(open_stream(prompt))
+            except CircuitOpenError:
+                stream = None
+            if stream is not None:
+                parser = ChatResponseStreamParser()
+                chunks = stream.__aiter__()
+                chunk = None
+                first_token_latency = None
+                while True:
+                    try:
+                        chunk = await before_deadline(chunks.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    text = parser.feed(chunk.text or "")
+                    if text:
+                        if first_token_latency is None:
+                            first_token_latency = time.perf_counter() - started
+                            self.logger.info(f"First streamed token after {first_token_latency:.3f}s")
+                        yield "token", text
+                self._record_usage(prompt, cache_name, chunk, time.perf_counter() - started)
+        finally:
+            semaphore.release()
+
+        if stream is None:
+            response_text, actions = self._fallback_reply()
+            yield "token", response_text
+            yield "actions", actions
+            yield "done", response_text
+            return
+        response_text, actions = parser.finish()
+        self._store_response(cache_key, response_text, actions)
+        self._add_turn(session_id, question, response_text)
+        yield "actions", actions
+        yield "done", response_text
+
         
\ No newline at end of file
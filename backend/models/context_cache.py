@@ -0,0 +1,156 @@
+"""
+Server-side context caching for the static part of the chat prompt.
+
+The prompt prefix (system messages, government schemes, field catalogue) is
+registered once with client.caches.create and referenced by name on each turn,
+so only the dynamic part of the prompt is sent. The cache's TTL is extended
+shortly before it expires, and a new cache is created if the old one is gone.
+If caching is unavailable the chat model falls back to sending the full prompt.
+"""
+
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCacheMetrics:
+    """
+    Input tokens saved and latency of turns sent with and without the cached prefix.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.cached_turns = 0
+        self.uncached_turns = 0
+        self.input_tokens_saved = 0
+        self.cached_latency = 0.0
+        self.uncached_latency = 0.0
+
+    def record(self, cached: bool, latency: float, tokens_saved: int = 0) -> None:
+        with self._lock:
+            if cached:
+                self.cached_turns += 1
+                self.cached_latency += latency
+                self.input_tokens_saved += tokens_saved
+            else:
+                self.uncached_turns += 1
+                self.uncached_latency += latency
+
+    def mean_latency(self) -> Optional[float]:
+        """Mean latency of all model calls, with or without the cached prefix."""
+        with self._lock:
+            turns = self.cached_turns + self.uncached_turns
+            return (self.cached_latency + self.uncached_latency) / turns if turns else None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            mean_cached = self.cached_latency / self.cached_turns if self.cached_turns else None
+            mean_uncached = self.uncached_latency / self.uncached_turns if self.uncached_turns else None
+            return {
+                "cached_turns": self.cached_turns,
+                "uncached_turns": self.uncached_turns,
+                "input_tokens_saved": self.input_tokens_saved,
+                "mean_cached_latency": mean_cached,
+                "mean_uncached_latency": mean_uncached,
+                "latency_saved": mean_uncached - mean_cached if mean_cached is not None and mean_uncached is not None else None,
+            }
+
+
+class PromptContextCache:
+    """
+    Keeps a cached context for a fixed prompt prefix alive on the Gemini API.
+
+    Args:
+        client: A genai.Client, or anything with the same caches API
+        model: The model the cache is created for, which must match generate_content
+        prefix: The static prompt prefix to cache
+        ttl_seconds: Lifetime requested for the cache
+        refresh_margin: Extend the TTL once the cache is this close to expiring
+        retry_after: After a failed create, send full prompts for this long before trying again
+        clock: Time source, time.monotonic by default
+    """
+
+    def __init__(self, client: Any, model: str, prefix: str, ttl_seconds: float = 3600, refresh_margin: float = 300,
+                 retry_after: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.model = model
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = min(refresh_margin, ttl_seconds / 2)
+        self.retry_after = retry_after
+        self.clock = clock
+        self.display_name = "chat-prefix-" + hashlib.sha256(prefix.encode()).hexdigest()[:12]
+        self._lock = Lock()
+        self._name: Optional[str] = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self.created = 0
+        self.refreshed = 0
+        self.failures = 0
+
+    def _ttl(self) -> str:
+        return f"{int(self.ttl_seconds)}s"
+
+    def _create(self, now: float) -> Optional[str]:
+        try:
+            cache = self.client.caches.create(model=self.model, config={
+                "system_instruction": self.prefix,
+                "display_name": self.display_name,
+                "ttl": self._ttl(),
+            })
+        except Exception as e:
+            # e.g. the prefix is below the model's minimum cacheable size
+            self.failures += 1
+            self._name = None
+            self._retry_at = now + self.retry_after
+            logger.warning(f"Context cache unavailable, sending full prompts: {str(e)}")
+            return None
+        self.created += 1
+        self._name = cache.name
+        self._expires_at = now + self.ttl_seconds
+        logger.info(f"Created context cache {cache.name} for the chat prompt prefix")
+        return self._name
+
+    def name(self) -> Optional[str]:
+        """
+        The name of a live cache for the prefix, creating or refreshing it as needed.
+
+        Returns:
+            Optional[str]: The cache name, or None when the full prompt should be sent
+        """
+        with self._lock:
+            now = self.clock()
+            if self._name is None:
+                if now < self._retry_at:
+                    return None
+                return self._create(now)
+            if now >= self._expires_at:
+                return self._create(now)
+            if now >= self._expires_at - self.refresh_margin:
+                try:
+                    self.client.caches.update(name=self._name, config={"ttl": self._ttl()})
+                    self._expires_at = now + self.ttl_seconds
+                    self.refreshed += 1
+                except Exception as e:
+                    logger.warning(f"Failed to refresh context cache {self._name}, recreating: {str(e)}")
+                    return self._create(now)
+            return self._name
+
+    def invalidate(self) -> None:
+        """Forget the current cache, e.g. after the API reports it missing."""
+        with self._lock:
+            self._name = None
+            self._retry_at = 0.0
+
+    def delete(self) -> None:
+        with self._lock:
+            if self._name is not None:
+                try:
+                    self.client.caches.delete(name=self._name)
+                except Exception as e:
+                    logger.warning(f"Failed to delete context cache {self._name}: {str(e)}")
+                self._name = None
@@ -0,0 +1,189 @@
+# Estimate Cache
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.batch_borrowing import FREQUENCY_MULTIPLIERS
+from models.borrowing_model import BorrowingResult
+from models.tax_rates import resolve_financial_year
+from api.models import EstimateRequest
+
+# Fields folded into yearly amounts (or dropped when unused) by canonical_profile
+FREQUENCY_FIELDS = {
+    "incomeFrequency", "otherIncomeFrequency", "secondPersonIncomeFrequency", "secondPersonOtherIncomeFrequency",
+}
+
+
+def canonical_profile(request: EstimateRequest) -> Dict:
+    """
+    Reduce a request to the values the borrowing calculation actually depends on.
+
+    Income is normalised to yearly amounts, and fields the calculation ignores for
+    this profile (second person income for individuals, rental income for owner
+    occupiers) are zeroed, so equivalent requests produce the same key.
+    """
+    profile = request.model_dump(exclude=FREQUENCY_FIELDS)
+    first_multiplier = FREQUENCY_MULTIPLIERS.get(request.incomeFrequency, 1)
+    second_multiplier = FREQUENCY_MULTIPLIERS.get(request.secondPersonIncomeFrequency, 1)
+    profile["grossIncome"] = request.grossIncome * first_multiplier
+    profile["otherIncome"] = request.otherIncome * first_multiplier
+    if request.borrowingType == "Individual":
+        profile["secondPersonIncome"] = 0
+        profile["secondPersonOtherIncome"] = 0
+    else:
+        profile["secondPersonIncome"] = request.secondPersonIncome * second_multiplier
+        profile["secondPersonOtherIncome"] = request.secondPersonOtherIncome * second_multiplier
+    if request.loanPurpose != "Investor":
+        profile["rentalIncome"] = 0
+    profile["financialYear"] = resolve_financial_year(request.financialYear)
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in profile.items()}
+
+
+def profile_hash(request: EstimateRequest) -> str:
+    """Stable hash of the canonical profile."""
+    canonical = json.dumps(canonical_profile(request), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class DataFileVersion:
+    """
+    Version token for a set of data files.
+
+    Files are stat'ed at most once per check_interval seconds, and only re-hashed
+    when their modification time or size changes.
+    """
+
+    def __init__(self, paths: List[Path], check_interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.paths = [Path(path) for path in paths]
+        self.check_interval = check_interval
+        self.clock = clock
+        self._stats: Optional[List[Tuple[int, int]]] = None
+        self._version = ""
+        self._checked_at = None
+
+    def __call__(self) -> str:
+        now = self.clock()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._version
+        self._checked_at = now
+        stats = []
+        for path in self.paths:
+            stat = os.stat(path)
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        if stats != self._stats:
+            digest = hashlib.sha256()
+            for path in self.paths:
+                digest.update(path.read_bytes())
+            self._stats = stats
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+
+class EstimateCache:
+    """
+    LRU + TTL cache of BorrowingResults keyed by canonical profile hash.
+
+    The whole cache is dropped when the data version changes (e.g. assumptions.json
+    or the tax tables are edited), after calling on_invalidate so the caller can
+    reload that data before the next computation.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300,
+                 version: Optional[Callable[[], str]] = None,
+                 on_invalidate: Optional[Callable[[], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version = version or (lambda: "")
+        self.on_invalidate = on_invalidate
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, BorrowingResult]]" = OrderedDict()
+        self._lock = Lock()
+        self._current_version = self.version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self) -> None:
+        version = self.version()
+        if version != self._current_version:
+            with self._lock:
+                if version == self._current_version:
+                    return
+                self._entries.clear()
+                self._current_version = version
+                self.invalidations += 1
+            if self.on_invalidate is not None:
+                self.on_invalidate()
+
+    def get(self, request: EstimateRequest) -> Optional[BorrowingResult]:
+        """Return the cached result for an equivalent profile, or None."""
+        self._check_version()
+        key = profile_hash(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, result = entry
+            if self.clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Equivalent profiles can differ in how income was entered, so hand back this request
+        return replace(result, details=request)
+
+    def put(self, request: EstimateRequest, result: BorrowingResult) -> None:
+        key = profile_hash(request)
+        with self._lock:
+            self._entries[key] = (self.clock(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, request: EstimateRequest, compute: Callable[[EstimateRequest], BorrowingResult]) -> BorrowingResult:
+        """
+        Return the cached result for the request, computing and storing it on a miss.
+
+        Args:
+            request: The profile to estimate
+            compute: Function that calculates the result for a request
+
+        Returns:
+            BorrowingResult: The cached or freshly computed result
+        """
+        result = self.get(request)
+        if result is None:
+            result = compute(request)
+            self.put(request, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "version": self._current_version,
+            }
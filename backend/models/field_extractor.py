@@ -0,0 +1,346 @@
+"""
+Rule-based extraction of profile fields from data-entry chat messages.
+
+Many chat turns only hand over details ("I earn 95k a year", "2 kids", "no HECS").
+These are turned into UPDATE_FIELD actions directly, without a model call. Each
+clause of the message must be explained by exactly one field rule plus numbers,
+frequencies and filler words; questions, unknown words, amounts without a
+frequency and conflicting values all fall through to the chat model.
+"""
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import re
+import time
+import unicodedata
+from pathlib import Path
+import sys
+
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+from backend.api.models import ActionType, Field
+
+# Periods per year for each frequency a user may give
+PER_YEAR = {"weekly": 52, "fortnightly": 26, "monthly": 12, "yearly": 1}
+
+_FREQUENCIES = [
+    ("fortnightly", r"(?:a|per|each|every|/)\s*fortnight|fortnightly|bi-?weekly|every (?:two|2) weeks"),
+    ("weekly", r"(?:a|per|each|every|/)\s*(?:week|wk)|weekly|pw|p/w"),
+    ("monthly", r"(?:a|per|each|every|/)\s*(?:month|mth)|monthly|pcm|p/m"),
+    ("yearly", r"(?:a|per|each|every|/)\s*(?:year|yr|annum)|yearly|annually|annual|pa|p\.a\.?"),
+]
+_FREQUENCY = re.compile("|".join(rf"(?P<{name}>\b(?:{pattern})(?!\w))" for name, pattern in _FREQUENCIES))
+_NUMBER = re.compile(r"\$?\s?(?P<number>\d+(?:,\d{3})*(?:\.\d+)?)\s?(?P<scale>k|m|mil|million|thousand|grand)?(?![\w.])\s?(?P<percent>%|percent|per cent)?")
+_SCALES = {"k": 1_000, "thousand": 1_000, "grand": 1_000, "m": 1_000_000, "mil": 1_000_000, "million": 1_000_000}
+_WORD_NUMBERS = {"zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+_WORD = re.compile(r"[a-z']+")
+
+# Clauses are split on punctuation followed by a space and on conjunctions
+_CLAUSE_SPLIT = re.compile(r"[,;!.\n](?:\s+|$)|\s+(?:and|but|also|plus)\s+")
+_QUESTION_WORDS = {"what", "how", "can", "could", "should", "would", "will", "why", "when", "which", "who", "where", "does", "is", "are", "am"}
+_NEGATIONS = {"no", "not", "don't", "dont", "doesn't", "doesnt", "never", "without", "none", "nil", "haven't", "havent", "zero", "aren't", "isn't"}
+_FILLER = {
+    "i", "i'm", "im", "i've", "ive", "me", "my", "we", "we're", "were", "we've", "our", "us", "am", "is", "are", "be",
+    "a", "an", "the", "of", "to", "in", "on", "at", "for", "about", "around", "roughly", "approx", "approximately",
+    "just", "only", "currently", "now", "have", "has", "got", "get", "gets", "it's", "its", "it", "that", "there",
+    "gross", "before", "tax", "total", "debt", "debts", "any", "do", "so", "ok", "okay", "thanks", "thank", "you",
+    "hi", "hello", "hey", "well", "actually", "yes", "yeah", "yep", "years", "year", "old", "limit", "limits",
+    "pay", "paying", "per", "each", "every", "dollars", "aud", "loan", "new",
+}
+_YES = {"yes", "yep", "yeah", "yup", "y", "correct", "i do", "we do", "true"}
+_NO = {"no", "nope", "nah", "n", "i don't", "i dont", "we don't", "we dont", "false"}
+_PARTNER = re.compile(r"\b(?:partner|wife|husband|spouse|other half)(?:'s)?(?!\w)")
+
+
+@dataclass(frozen=True, slots=True)
+class FieldRule:
+    """
+    One field a clause can set.
+
+    Attributes:
+        field: The field to update
+        pattern: Keywords that identify the field in a clause
+        kind: "amount", "count", "integer", "percent", "flag" or "choice"
+        value: The flag value when not negated, or the value of a choice
+        frequency_field: For incomes, the field holding the income's frequency
+        unit: For amounts stored in a fixed frequency, that frequency
+        bounds: Inclusive range accepted for integers and percentages
+        money_marker: For amounts, whether the number must be marked as money ($, a k or m
+            scale, "dollars" or the word "limit"), because a bare number may be a count ("2 credit cards")
+    """
+    field: Field
+    pattern: re.Pattern
+    kind: str
+    value: object = None
+    frequency_field: Optional[Field] = None
+    unit: Optional[str] = None
+    bounds: Tuple[float, float] = (0, float("inf"))
+    money_marker: bool = False
+
+
+def _rule(field: Field, pattern: str, kind: str, **kwargs) -> FieldRule:
+    return FieldRule(field, re.compile(rf"\b(?:{pattern})(?!\w)"), kind, **kwargs)
+
+
+# Ordered from most to least specific; a clause must match exactly one rule
+RULES = [
+    _rule(Field.RENTAL_INCOME, r"rental income|rent from (?:the |my |our )?(?:tenants?|investment(?: property)?)", "amount", unit="weekly"),
+    _rule(Field.OTHER_INCOME, r"other income|side income|second job|side hustle|bonus(?:es)?|overtime|commissions?", "amount",
+          frequency_field=Field.OTHER_INCOME_FREQUENCY),
+    _rule(Field.GROSS_INCOME, r"income|salary|earn(?:s|ing)?|make|makes|wage|wages|paid|package", "amount",
+          frequency_field=Field.INCOME_FREQUENCY),
+    _rule(Field.LIVING_EXPENSES, r"living expenses|living costs|expenses|spend(?:s|ing)?|cost of living", "amount", unit="monthly"),
+    _rule(Field.CREDIT_CARD_LIMITS, r"credit cards?|card", "amount", money_marker=True),
+    _rule(Field.LOAN_REPAYMENT, r"(?:car |personal |other )?loan repayments?|repayments?|car loan|personal loan", "amount",
+          unit="monthly", money_marker=True),
+    _rule(Field.RENT_BOARD, r"rent and board|board|rent|renting", "amount", unit="monthly"),
+    _rule(Field.DEPENDENTS, r"kids?|children|child|dependents?|dependants?", "count"),
+    _rule(Field.AGE, r"years old|yo|y/o|aged?", "integer", bounds=(18, 100)),
+    _rule(Field.LOAN_TERM, r"loan term|term|year loan|year mortgage", "integer", bounds=(1, 40)),
+    _rule(Field.INTEREST_RATE, r"interest rate|interest|rate", "percent", bounds=(0, 25)),
+    _rule(Field.HAS_HECS, r"hecs|help debt|student (?:loan|debt)", "flag", value=True),
+    _rule(Field.IS_FIRST_TIME_BUYER, r"first[- ](?:home|time)(?: home)?(?: buyers?)?", "flag", value=True),
+    _rule(Field.IS_FIRST_TIME_BUYER, r"(?:owned|bought) (?:a )?(?:home|house|property|place) before", "flag", value=False),
+    _rule(Field.EMPLOYMENT_TYPE, r"full[- ]?time|permanent", "choice", value="Full-time"),
+    _rule(Field.EMPLOYMENT_TYPE, r"part[- ]?time|casual", "choice", value="Part-time"),
+    _rule(Field.EMPLOYMENT_TYPE, r"self[- ]?employed|sole trader|contractor|own business", "choice", value="Self-employed"),
+    _rule(Field.EMPLOYMENT_TYPE, r"unemployed|not working|between jobs", "choice", value="Unemployed"),
+    _rule(Field.LOAN_PURPOSE, r"investment(?: property)?|investor|invest", "choice", value="Investor"),
+    _rule(Field.LOAN_PURPOSE, r"owner[- ]occupie[dr]|to live in|live in it", "choice", value="Owner-occupied"),
+    _rule(Field.BORROWING_TYPE, r"(?:buying |borrowing )?with my (?:partner|wife|husband|spouse)|as a couple|couple|jointly", "choice", value="Couple"),
+    _rule(Field.BORROWING_TYPE, r"(?:buying |borrowing )?(?:on my own|by myself|alone|solo|single|individual|just me)", "choice", value="Individual"),
+]
+_FLAG_RULES = [rule for rule in RULES if rule.kind == "flag" and rule.value is True]
+# Partner incomes are stored in their own fields
+_PARTNER_FIELDS = {
+    Field.GROSS_INCOME: (Field.SECOND_PERSON_INCOME, Field.SECOND_PERSON_INCOME_FREQUENCY),
+    Field.OTHER_INCOME: (Field.SECOND_PERSON_OTHER_INCOME, Field.SECOND_PERSON_OTHER_INCOME_FREQUENCY),
+}
+
+_LABELS = {
+    Field.IS_FIRST_TIME_BUYER: "first home buyer", Field.GROSS_INCOME: "gross income", Field.OTHER_INCOME: "other income",
+    Field.SECOND_PERSON_INCOME: "partner's income", Field.SECOND_PERSON_OTHER_INCOME: "partner's other income",
+    Field.RENTAL_INCOME: "rental income", Field.LIVING_EXPENSES: "living expenses", Field.RENT_BOARD: "rent and board",
+    Field.DEPENDENTS: "dependents", Field.CREDIT_CARD_LIMITS: "credit card limits", Field.LOAN_REPAYMENT: "loan repayments",
+    Field.HAS_HECS: "HECS debt", Field.AGE: "age", Field.EMPLOYMENT_TYPE: "employment type", Field.LOAN_PURPOSE: "loan purpose",
+    Field.LOAN_TERM: "loan term", Field.INTEREST_RATE: "interest rate", Field.BORROWING_TYPE: "borrowing type",
+}
+_PER = {"weekly": " a week", "monthly": " a month", "yearly": " a year"}
+
+
+def _format_number(value: float) -> str:
+    value = round(value, 2)
+    return str(int(value)) if value == int(value) else str(value)
+
+
+class FieldExtractor:
+    """
+    Deterministic fast path that turns data-entry messages into UPDATE_FIELD actions.
+
+    Args:
+        rules: Field rules to match, in priority order
+    """
+
+    def __init__(self, rules: List[FieldRule] = RULES):
+        self.rules = rules
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.seconds = 0.0
+
+    def extract(self, message: str, previous_answer: Optional[str] = None) -> Optional[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Extract field updates from a message.
+
+        Args:
+            message (str): The user's message
+            previous_answer (Optional[str]): The last assistant message, used to resolve a bare "yes" or "no"
+
+        Returns:
+            Optional[Tuple[str, List[Dict[str, object]]]]: A confirmation and the actions, or None
+                if the message needs the chat model
+        """
+        started = time.perf_counter()
+        values = self._extract(message, previous_answer)
+        result = None
+        if values:
+            actions = [
+                {"type": ActionType.UPDATE_FIELD.value, "payload": {"field": field.value, "value": value}}
+                for field, value in values.items()
+            ]
+            result = self._confirmation(values), actions
+        with self._lock:
+            self.seconds += time.perf_counter() - started
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None,
+                "seconds": self.seconds,
+            }
+
+    def _extract(self, message: str, previous_answer: Optional[str]) -> Optional[Dict[Field, str]]:
+        text = unicodedata.normalize("NFKC", message).lower().replace("’", "'").strip()
+        if not text or "?" in text:
+            return None
+        bare = text.rstrip(".!")
+        if bare in _YES or bare in _NO:
+            return self._answer(bare in _YES, previous_answer)
+
+        values: Dict[Field, str] = {}
+        for clause in _CLAUSE_SPLIT.split(text):
+            clause = clause.strip()
+            if not clause:
+                continue
+            words = _WORD.findall(clause)
+            if words and words[0] in _QUESTION_WORDS:
+                return None
+            clause_values = self._clause(clause)
+            if clause_values is None:
+                return None
+            for field, value in clause_values.items():
+                # The same field given two different values is ambiguous
+                if values.setdefault(field, value) != value:
+                    return None
+        return values or None
+
+    def _answer(self, yes: bool, previous_answer: Optional[str]) -> Optional[Dict[Field, str]]:
+        """Resolve a bare yes or no against the single yes/no field the assistant last asked about."""
+        if not previous_answer:
+            return None
+        asked = {rule.field for rule in _FLAG_RULES if rule.pattern.search(previous_answer.lower())}
+        if len(asked) != 1:
+            return None
+        return {asked.pop(): "true" if yes else "false"}
+
+    def _clause(self, clause: str) -> Optional[Dict[Field, str]]:
+        """Values set by one clause, {} for pure filler, or None if the clause is not understood."""
+        matched = []
+        for rule in self.rules:
+            match = rule.pattern.search(clause)
+            if match:
+                matched.append(rule)
+                clause = clause[:match.start()] + " " + clause[match.end():]
+        partner = _PARTNER.search(clause)
+        if partner:
+            clause = clause[:partner.start()] + " " + clause[partner.end():]
+
+        frequencies = [match.lastgroup for match in _FREQUENCY.finditer(clause)]
+        clause = _FREQUENCY.sub(" ", clause)
+        numbers = []
+        money = False
+        for match in _NUMBER.finditer(clause):
+            number = float(match.group("number").replace(",", "")) * _SCALES.get(match.group("scale"), 1)
+            numbers.append((number, bool(match.group("percent"))))
+            money = money or match.group(0).startswith("$") or match.group("scale") is not None
+        clause = _NUMBER.sub(" ", clause)
+        words = _WORD.findall(clause)
+        money = money or any(word in ("limit", "limits", "dollars", "aud") for word in words)
+        numbers += [(_WORD_NUMBERS[word], False) for word in words if word in _WORD_NUMBERS]
+        negated = any(word in _NEGATIONS for word in words)
+        if any(word not in _FILLER and word not in _NEGATIONS and word not in _WORD_NUMBERS for word in words):
+            return None
+
+        if not matched:
+            return {} if not numbers and not frequencies and not partner else None
+        if len(matched) > 1 or len(numbers) > 1 or len(frequencies) > 1:
+            return None
+        rule = matched[0]
+        number, percent = numbers[0] if numbers else (None, False)
+        frequency = frequencies[0] if frequencies else None
+        if percent and rule.kind != "percent":
+            return None
+        if partner and rule.field not in _PARTNER_FIELDS:
+            return None
+        if rule.kind != "amount" and frequency is not None:
+            return None
+
+        if rule.kind == "amount":
+            if rule.money_marker and number is not None and not money:
+                return None
+            return self._amount(rule, number, frequency, negated, bool(partner))
+        if rule.kind == "count":
+            if negated:
+                return {rule.field: "0"} if not number else None
+            if number is None:
+                # "a kid" is one, "kids" on its own is not a count
+                return {rule.field: "1"} if "a" in words or "an" in words else None
+            return {rule.field: _format_number(number)} if number == int(number) else None
+        if rule.kind in ("integer", "percent"):
+            low, high = rule.bounds
+            if negated or number is None or not low <= number <= high:
+                return None
+            if rule.kind == "integer" and number != int(number):
+                return None
+            return {rule.field: _format_number(number)}
+        if number is not None:
+            return None
+        if rule.kind == "flag":
+            return {rule.field: "true" if rule.value != negated else "false"}
+        return {rule.field: rule.value} if not negated else None
+
+    def _amount(self, rule: FieldRule, number: Optional[float], frequency: Optional[str], negated: bool,
+                partner: bool) -> Optional[Dict[Field, str]]:
+        field, frequency_field = rule.field, rule.frequency_field
+        if partner:
+            field, frequency_field = _PARTNER_FIELDS[field]
+        if negated:
+            # "no credit cards" or "no other income" clears the amount
+            if number not in (None, 0) or frequency is not None:
+                return None
+            values = {field: "0"}
+            if frequency_field is not None:
+                values[frequency_field] = "yearly"
+            return values
+        if number is None:
+            return None
+        if frequency_field is not None:
+            # Incomes keep weekly, monthly or yearly frequencies; anything else becomes yearly
+            if frequency is None:
+                return None
+            if frequency == "fortnightly":
+                number, frequency = number * PER_YEAR["fortnightly"], "yearly"
+            return {field: _format_number(number), frequency_field: frequency}
+        if rule.unit is None:
+            return {field: _format_number(number)} if frequency is None else None
+        if frequency is None:
+            return None
+        return {field: _format_number(number * PER_YEAR[frequency] / PER_YEAR[rule.unit])}
+
+    def _confirmation(self, values: Dict[Field, str]) -> str:
+        frequencies = {
+            Field.GROSS_INCOME: Field.INCOME_FREQUENCY,
+            Field.OTHER_INCOME: Field.OTHER_INCOME_FREQUENCY,
+            Field.SECOND_PERSON_INCOME: Field.SECOND_PERSON_INCOME_FREQUENCY,
+            Field.SECOND_PERSON_OTHER_INCOME: Field.SECOND_PERSON_OTHER_INCOME_FREQUENCY,
+        }
+        units = {rule.field: rule.unit for rule in self.rules if rule.unit}
+        parts = []
+        for field, value in values.items():
+            if field in frequencies.values():
+                continue
+            if field in frequencies or field in units or field == Field.CREDIT_CARD_LIMITS:
+                amount = float(value)
+                text = f"${amount:,.0f}" if amount == int(amount) else f"${amount:,.2f}"
+                frequency = values.get(frequencies.get(field)) or units.get(field)
+                text += _PER.get(frequency, "")
+            elif value in ("true", "false"):
+                text = "yes" if value == "true" else "no"
+            elif field == Field.INTEREST_RATE:
+                text = f"{value}%"
+            elif field == Field.LOAN_TERM:
+                text = f"{value} years"
+            else:
+                text = value
+            parts.append(f"{_LABELS[field]} to {text}")
+        listed = parts[0] if len(parts) == 1 else ", ".join(parts[:-1]) + " and " + parts[-1]
+        return f"Thanks, I've updated your {listed}."
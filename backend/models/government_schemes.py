@@ -0,0 +1,163 @@
+# Government Scheme Rules
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.models import EstimateRequest, GovernmentScheme
+
+# Labels for requirements that compare a profile field with an expected value.
+# Fields not listed here use the expected value itself, e.g. "Owner-occupied".
+REQUIREMENT_LABELS = {
+    "isFirstTimeBuyer": "First time buyer",
+}
+
+# Threshold keys a requirement can carry, and the profile column each is compared with
+THRESHOLD_COLUMNS = {
+    "householdIncome": "household_income",
+}
+
+
+def _parse_expected(value):
+    """Scheme files store booleans as "True"/"False" strings."""
+    if isinstance(value, str) and value in ("True", "False"):
+        return value == "True"
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Requirement:
+    """
+    One compiled eligibility rule.
+
+    Either an equality check (field == expected), or a maximum threshold on a
+    calculated column (household income) that depends on the value of field,
+    e.g. a different income cap for individuals and couples.
+    """
+    field: str
+    expected: object = None
+    threshold_column: Optional[str] = None
+    thresholds: Optional[Dict[str, float]] = None
+    label: str = ""
+
+    def evaluate(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        if self.thresholds is None:
+            return columns[self.field] == self.expected
+        limits = np.array([self.thresholds.get(value, np.nan) for value in columns[self.field]], dtype=float)
+        return columns[self.threshold_column] <= limits
+
+    def labels(self, columns: Dict[str, np.ndarray]) -> List[str]:
+        if self.thresholds is None:
+            return [self.label] * len(columns[self.field])
+        return [self.threshold_label(value) for value in columns[self.field]]
+
+    def threshold_label(self, value: str) -> str:
+        limit = self.thresholds.get(value)
+        if limit is None:
+            return "Household income threshold"
+        return f"Household income below ${limit:,.0f}"
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledScheme:
+    name: str
+    eligibility: str
+    offer: str
+    requirements: Tuple[Requirement, ...]
+
+
+def compile_requirement(field: str, rule) -> Requirement:
+    if not isinstance(rule, dict):
+        expected = _parse_expected(rule)
+        return Requirement(field=field, expected=expected, label=REQUIREMENT_LABELS.get(field, str(expected)))
+
+    # {field value: {threshold key: limit}}, e.g. {"Individual": {"householdIncome": 125000}}
+    thresholds = {}
+    threshold_column = None
+    for value, limits in rule.items():
+        for key, limit in limits.items():
+            if key not in THRESHOLD_COLUMNS:
+                raise ValueError(f"Unsupported threshold {key} for requirement {field}")
+            threshold_column = THRESHOLD_COLUMNS[key]
+            thresholds[value] = float(limit)
+    return Requirement(field=field, threshold_column=threshold_column, thresholds=thresholds)
+
+
+class SchemeRulesEngine:
+    """
+    Government scheme eligibility compiled from government_schemes.json.
+
+    Schemes are compiled once into per-state tuples of Requirement predicates.
+    Evaluation groups profiles by state and runs each requirement as one array
+    comparison over every profile in that state.
+    """
+
+    def __init__(self, government_schemes: dict):
+        self.states: Dict[str, Tuple[CompiledScheme, ...]] = {}
+        self.fields = set()
+        for state, state_schemes in government_schemes.items():
+            compiled = []
+            for scheme in state_schemes['first_home_schemes'].values():
+                requirements = tuple(
+                    compile_requirement(field, rule) for field, rule in scheme['eligibilityRequirements'].items()
+                )
+                self.fields.update(requirement.field for requirement in requirements)
+                compiled.append(CompiledScheme(
+                    name=scheme['name'],
+                    eligibility=scheme['eligibility'],
+                    offer=scheme['offer'],
+                    requirements=requirements
+                ))
+            self.states[state] = tuple(compiled)
+
+    def _columns(self, profiles: List[EstimateRequest], household_incomes: np.ndarray) -> Dict[str, np.ndarray]:
+        columns = {field: np.array([getattr(profile, field) for profile in profiles], dtype=object) for field in self.fields}
+        columns["household_income"] = np.asarray(household_incomes, dtype=float)
+        return columns
+
+    def evaluate(self, profiles: List[EstimateRequest], household_incomes: np.ndarray,
+                 states: List[str]) -> List[List[GovernmentScheme]]:
+        """
+        Check scheme eligibility for many profiles at once.
+
+        Args:
+            profiles: The profiles to check
+            household_incomes: Yearly household income for each profile
+            states: The state to check each profile against
+
+        Returns:
+            List[List[GovernmentScheme]]: The state's schemes for each profile, with
+            each requirement marked as met or not
+        """
+        for state in set(states):
+            if state not in self.states:
+                raise ValueError(f"No government schemes for state: {state}")
+        if not profiles:
+            return []
+
+        columns = self._columns(profiles, household_incomes)
+        states = np.array(states, dtype=object)
+        results: List[Optional[List[GovernmentScheme]]] = [None] * len(profiles)
+        for state in set(states):
+            rows = np.flatnonzero(states == state)
+            state_columns = {name: values[rows] for name, values in columns.items()}
+            evaluated = [
+                [(requirement.labels(state_columns), requirement.evaluate(state_columns).tolist())
+                 for requirement in scheme.requirements]
+                for scheme in self.states[state]
+            ]
+            for i, row in enumerate(rows):
+                results[row] = [
+                    GovernmentScheme(
+                        name=scheme.name,
+                        eligibilityDescription=scheme.eligibility,
+                        offer=scheme.offer,
+                        eligibilityRequirements=[(labels[i], met[i]) for labels, met in requirements]
+                    )
+                    for scheme, requirements in zip(self.states[state], evaluated)
+                ]
+        return results
+
+    def check(self, state: str, details: EstimateRequest, household_income: float) -> List[GovernmentScheme]:
+        """Check scheme eligibility for a single profile."""
+        return self.evaluate([details], np.array([household_income]), [state])[0]
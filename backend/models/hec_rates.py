@@ -1,32 +1,23 @@
+from typing import Optional
 
+import numpy as np
 
-def calculate_hecs_repayment(gross_income: float) -> float:
-    hecs_rates = {
-        54435: 0,
-        62850: 0.01,
-        66620: 0.02,
-        70618: 0.025,
-        74855: 0.03,
-        79346: 0.035,
-        84107: 0.04,
-        89154: 0.045,
-        94503: 0.05,
-        100174: 0.055,
-        106185: 0.06,
-        112545: 0.065,
-        119309: 0.07,
-        126467: 0.075,
-        134056: 0.08,
-        142100: 0.085, 
-        150626: 0.09,
-        159663: 0.095,
-        999999999: 0.1,
-    }
-    
-    for key, value in hecs_rates.items():
-        if gross_income <= key:
-            return gross_income * value
-        else:
-            continue
-    
-    return 0
\ No newline at end of file
+from models.tax_rates import BracketTable, get_tax_table
+
+
+def get_hecs_table(financial_year: Optional[str] = None) -> BracketTable:
+    """Return the compiled HECS repayment brackets for a financial year."""
+    return get_tax_table(financial_year).hecs_brackets
+
+
+def calculate_hecs_repayment(gross_income: float, financial_year: Optional[str] = None) -> float:
+    # The repayment rate applies to the whole income, not just the part above the threshold
+    return get_hecs_table(financial_year).flat(gross_income)
+
+
+def calculate_hecs_repayment_array(gross_income: np.ndarray, financial_year: Optional[str] = None) -> np.ndarray:
+    """
+    Vectorized version of calculate_hecs_repayment.
+    Takes an array of gross incomes and returns an array of yearly HECS repayments.
+    """
+    return get_hecs_table(financial_year).flat_array(np.asarray(gross_income, dtype=float))
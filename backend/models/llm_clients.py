@@ -0,0 +1,315 @@
+"""
+Clients for the chat model.
+
+ChatModel talks to any object with the parts of genai.Client it uses:
+client.models.generate_content, client.aio.models.generate_content(_stream)
+and client.caches.create/update/delete. Besides the real Gemini client there are:
+
+- FakeGeminiClient: canned replies with simulated token usage and latency
+- RecordingClient: wraps a real client and appends every exchange to a JSONL file
+- ReplayClient: answers from a recording, deterministically and without network access
+
+create_llm_client picks one from a mode name, e.g. the CHAT_LLM_MODE setting.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import itertools
+import json
+import time
+from collections import defaultdict
+from threading import Lock
+from pathlib import Path
+import sys
+
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+from backend.services.conversation_store import estimate_tokens
+
+DEFAULT_REPLY = '{"response": "Thanks, I have noted that.", "actions": []}'
+
+
+def _text(contents: Any) -> str:
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "".join(_text(part) for part in contents)
+    return str(contents or "")
+
+
+def _config_value(config: Any, key: str, default=None):
+    if config is None:
+        return default
+    if isinstance(config, dict):
+        return config.get(key, default)
+    return getattr(config, key, default)
+
+
+class FakeModels:
+    def __init__(self, client: "FakeGeminiClient"):
+        self._client = client
+
+    def generate_content(self, *, model: str, contents: Any, config: Any = None):
+        return self._client._generate(model, contents, config)
+
+
+class FakeAsyncModels:
+    def __init__(self, client: "FakeGeminiClient"):
+        self._client = client
+
+    async def generate_content(self, *, model: str, contents: Any, config: Any = None):
+        latency, response = self._client._respond(model, contents, config)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return response
+
+    async def generate_content_stream(self, *, model: str, contents: Any, config: Any = None):
+        latency, response = self._client._respond(model, contents, config)
+
+        async def chunks():
+            if latency > 0:
+                await asyncio.sleep(latency)
+            size = self._client.stream_chunk_chars
+            for start in range(0, len(response.text), size):
+                if start and self._client.chunk_interval > 0:
+                    await asyncio.sleep(self._client.chunk_interval)
+                yield SimpleNamespace(text=response.text[start:start + size], usage_metadata=response.usage_metadata)
+        return chunks()
+
+
+class FakeCaches:
+    def __init__(self, client: "FakeGeminiClient"):
+        self._client = client
+
+    def create(self, *, model: str, config: Any = None):
+        return self._client._create_cache(model, config)
+
+    def update(self, *, name: str, config: Any = None):
+        return self._client._update_cache(name, config)
+
+    def delete(self, *, name: str, config: Any = None) -> None:
+        self._client.cached_contents.pop(name, None)
+
+
+class FakeGeminiClient:
+    """
+    Offline Gemini client with simulated token usage and latency.
+
+    Latency is base_latency plus seconds_per_token for every input token that is
+    not served from a cached context, so cached and uncached prompts can be compared.
+
+    Args:
+        reply: Response text, or a function from the prompt text to the response text
+        base_latency: Seconds added to every call
+        seconds_per_token: Seconds added per uncached input token
+        sleep: Called with the simulated latency by the blocking API, time.sleep by default.
+            The async API always uses asyncio.sleep.
+        stream_chunk_chars: Characters per chunk when streaming
+        chunk_interval: Seconds between streamed chunks, after the first
+    """
+
+    def __init__(self, reply: Union[str, Callable[[str], str]] = DEFAULT_REPLY, base_latency: float = 0.0,
+                 seconds_per_token: float = 0.0, sleep: Callable[[float], None] = time.sleep,
+                 stream_chunk_chars: int = 16, chunk_interval: float = 0.0):
+        self.reply = reply
+        self.stream_chunk_chars = stream_chunk_chars
+        self.chunk_interval = chunk_interval
+        self.base_latency = base_latency
+        self.seconds_per_token = seconds_per_token
+        self.sleep = sleep
+        self.models = FakeModels(self)
+        self.aio = SimpleNamespace(models=FakeAsyncModels(self))
+        self.caches = FakeCaches(self)
+        self.cached_contents: Dict[str, str] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self._cache_ids = itertools.count(1)
+
+    def _create_cache(self, model: str, config: Any):
+        name = f"cachedContents/fake-{next(self._cache_ids)}"
+        self.cached_contents[name] = _text(_config_value(config, "system_instruction")) + _text(_config_value(config, "contents"))
+        return SimpleNamespace(name=name, model=model, display_name=_config_value(config, "display_name"),
+                               usage_metadata=SimpleNamespace(total_token_count=estimate_tokens(self.cached_contents[name])))
+
+    def _update_cache(self, name: str, config: Any):
+        if name not in self.cached_contents:
+            raise ValueError(f"Cached content not found: {name}")
+        return SimpleNamespace(name=name)
+
+    def _generate(self, model: str, contents: Any, config: Any):
+        latency, response = self._respond(model, contents, config)
+        if latency > 0:
+            self.sleep(latency)
+        return response
+
+    def _reply(self, model: str, prompt: str, cached: bool, input_tokens: int) -> Tuple[str, float]:
+        """Response text and simulated latency for a prompt."""
+        text = self.reply(prompt) if callable(self.reply) else self.reply
+        return text, self.base_latency + self.seconds_per_token * input_tokens
+
+    def _respond(self, model: str, contents: Any, config: Any):
+        """The simulated latency and response for a call."""
+        prompt = _text(contents)
+        cached_name = _config_value(config, "cached_content")
+        cached_tokens = 0
+        if cached_name is not None:
+            if cached_name not in self.cached_contents:
+                raise ValueError(f"Cached content not found: {cached_name}")
+            cached_tokens = estimate_tokens(self.cached_contents[cached_name])
+        input_tokens = estimate_tokens(prompt)
+        self.calls.append({"model": model, "contents": prompt, "cached_content": cached_name})
+
+        text, latency = self._reply(model, prompt, cached_name is not None, input_tokens)
+        return latency, SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=input_tokens + cached_tokens,
+                cached_content_token_count=cached_tokens or None,
+                candidates_token_count=estimate_tokens(text),
+            )
+        )
+
+
+def exchange_key(model: str, prompt: str, cached: bool) -> str:
+    """Key identifying a request in a recording. Cache names differ between runs, so only whether one was used counts."""
+    return hashlib.sha256(json.dumps([model, prompt, cached]).encode()).hexdigest()
+
+
+class RecordingClient:
+    """
+    Wraps a client and appends each generate_content exchange to a JSONL file.
+
+    Each line holds the request key, model, prompt, whether a cached context was
+    used, the response text, token usage and latency. Context caching calls are
+    passed straight through.
+    """
+
+    def __init__(self, client: Any, path: Union[str, Path]):
+        self.client = client
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+        self.aio = SimpleNamespace(models=SimpleNamespace(
+            generate_content=self._agenerate_content,
+            generate_content_stream=self._agenerate_content_stream,
+        ))
+        self.caches = client.caches
+
+    def _record(self, model: str, contents: Any, config: Any, text: str, usage: Any, latency: float) -> None:
+        prompt = _text(contents)
+        cached = _config_value(config, "cached_content") is not None
+        exchange = {
+            "key": exchange_key(model, prompt, cached),
+            "model": model,
+            "prompt": prompt,
+            "cached": cached,
+            "text": text,
+            "prompt_token_count": getattr(usage, "prompt_token_count", None),
+            "cached_content_token_count": getattr(usage, "cached_content_token_count", None),
+            "latency": round(latency, 4),
+        }
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(exchange) + "\n")
+
+    def _generate_content(self, *, model: str, contents: Any, config: Any = None):
+        started = time.perf_counter()
+        response = self.client.models.generate_content(model=model, contents=contents, config=config)
+        self._record(model, contents, config, response.text, getattr(response, "usage_metadata", None), time.perf_counter() - started)
+        return response
+
+    async def _agenerate_content(self, *, model: str, contents: Any, config: Any = None):
+        started = time.perf_counter()
+        response = await self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+        self._record(model, contents, config, response.text, getattr(response, "usage_metadata", None), time.perf_counter() - started)
+        return response
+
+    async def _agenerate_content_stream(self, *, model: str, contents: Any, config: Any = None):
+        started = time.perf_counter()
+        stream = await self.client.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+
+        async def chunks():
+            texts = []
+            chunk = None
+            async for chunk in stream:
+                texts.append(chunk.text or "")
+                yield chunk
+            self._record(model, contents, config, "".join(texts), getattr(chunk, "usage_metadata", None), time.perf_counter() - started)
+        return chunks()
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed request is not in the recording."""
+
+
+class ReplayClient(FakeGeminiClient):
+    """
+    Answers requests from a RecordingClient recording.
+
+    Requests are matched by model, prompt and whether a cached context was used.
+    A request recorded several times replays its responses in order, then starts over.
+
+    Args:
+        path: The JSONL recording
+        latency: Seconds per call; None replays each exchange's recorded latency
+        fallback: Reply for requests not in the recording; None raises ReplayMissError
+        **kwargs: Passed to FakeGeminiClient, e.g. sleep or stream_chunk_chars
+    """
+
+    def __init__(self, path: Union[str, Path], latency: Optional[float] = 0.0, fallback: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.fallback = fallback
+        self.exchanges: Dict[str, List[dict]] = defaultdict(list)
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    exchange = json.loads(line)
+                    self.exchanges[exchange["key"]].append(exchange)
+        self._positions: Dict[str, int] = defaultdict(int)
+        self.misses = 0
+
+    def _reply(self, model: str, prompt: str, cached: bool, input_tokens: int) -> Tuple[str, float]:
+        key = exchange_key(model, prompt, cached)
+        exchanges = self.exchanges.get(key)
+        if not exchanges:
+            self.misses += 1
+            if self.fallback is None:
+                raise ReplayMissError(f"No recorded response for this {model} prompt ({input_tokens} tokens)")
+            return self.fallback, self.latency or 0.0
+        exchange = exchanges[self._positions[key] % len(exchanges)]
+        self._positions[key] += 1
+        return exchange["text"], exchange["latency"] if self.latency is None else self.latency
+
+
+LLM_MODES = ("gemini", "record", "replay", "fake")
+
+
+def create_llm_client(mode: str, api_key: Optional[str] = None, recording_path: Optional[str] = None,
+                      latency: Optional[float] = None) -> Any:
+    """
+    Create the client for ChatModel.
+
+    Args:
+        mode: "gemini" (live API), "record" (live API, recorded), "replay" (from a recording) or "fake"
+        api_key: Gemini API key, for gemini and record
+        recording_path: JSONL recording, for record and replay
+        latency: Simulated seconds per call for replay and fake; None replays recorded latency
+
+    Returns:
+        The client, or None in gemini mode so ChatModel creates it from the API key
+    """
+    if mode not in LLM_MODES:
+        raise ValueError(f"Unknown chat client mode: {mode}, expected one of {', '.join(LLM_MODES)}")
+    if mode in ("record", "replay") and not recording_path:
+        raise ValueError(f"Chat client mode {mode} needs a recording path")
+    if mode == "gemini":
+        return None
+    if mode == "record":
+        from google import genai
+        return RecordingClient(genai.Client(api_key=api_key), recording_path)
+    if mode == "replay":
+        return ReplayClient(recording_path, latency=latency)
+    return FakeGeminiClient(base_latency=latency or 0.0)
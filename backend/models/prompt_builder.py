@@ -0,0 +1,188 @@
+"""
+Token-budgeted prompt construction for the chat model.
+
+The static part of the prompt (system messages, field catalogue, notes and action
+descriptions) is rendered and measured once. Each turn only renders the dynamic
+part: the user's context, borrowing results, the conversation and the question.
+The conversation is added newest first until the history budget is spent; older
+turns are condensed into a short summary and anything beyond that is dropped.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+from pathlib import Path
+import sys
+
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+from backend.services.conversation_store import Message, estimate_tokens
+
+FIELD_CATALOGUE = """Valid field names and their allowed values:
+- isFirstTimeBuyer: "true", "false"
+- grossIncome: number
+- incomeFrequency: "weekly", "monthly", "yearly"
+- otherIncome: number
+- otherIncomeFrequency: "weekly", "monthly", "yearly"
+- secondPersonIncome: number
+- secondPersonIncomeFrequency: "weekly", "monthly", "yearly"
+- secondPersonOtherIncome: number
+- secondPersonOtherIncomeFrequency: "weekly", "monthly", "yearly"
+- rentalIncome: number
+- livingExpenses: number
+- rentBoard: number
+- dependents: number
+- creditCardLimits: number
+- loanRepayment: number
+- hasHecs: "true", "false"
+- age: number
+- employmentType: "Full-time", "Part-time", "Self-employed", "Unemployed"
+- loanPurpose: "Owner-occupied", "Investor"
+- loanTerm: number
+- interestRate: number
+- borrowingType: "Individual", "Couple"
+
+A few notes:
+- rentalIncome is a weekly amount, ONLY use the weekly amount, otherwise convert it to weekly. This is the only frequency that is allowed when the loan purpose is investor.
+- livingExpenses is a monthly amount
+- rentBoard is a monthly amount
+- if someone provides information that is not in the right frequency, adjust it to the annual amount and change the relevant frequency to annual. Eg. if someone said they earn 1k a fortnight, convert that to be 26k a year and change the frequency to yearly.
+- household income is the total income of the household, including the income of the second person if they are a couple. it is not something the user provides, but calculated. do not ask for this, only ask for what fields are in the context or borrowing model.
+- if an 'update_field' action is created, if the field has a related frequency, make sure to update the frequency to the correct frequency.
+- loan repayments is a monthly amount, if a number is provided but the frequency is not monthly, convert it to monthly.
+- regarding hecs, we only need to ask if they have hecs debt and not the amount."""
+
+INSTRUCTIONS = """The response should be helpful and take into account the conversation history
+and the context of the user including their details. If there is a borrowing model,
+please use refer to it if relevant.
+
+If the user is providing details that are not in the context or borrowing model or correct information that is already in the context or borrowing model, create an UPDATE_FIELD action to update that field.
+
+Actions:
+UPDATE_FIELD: Create when the user provides information that is not in the context or borrowing model. Or if the user is correcting information that is already in the context or borrowing model.
+SUGGESTED_ANSWERS: Create when you are asking a question to the user, an example is when asking if a user has HECs debt, you can suggest answers like "Yes" or "No"."""
+
+# Allowance for the "Role: " label, line break and rounding added to each message
+ROLE_LABEL_TOKENS = 4
+# Allowance for the two conversation section headers
+SECTION_HEADER_TOKENS = 16
+
+
+@dataclass(frozen=True, slots=True)
+class PromptStats:
+    prefix_tokens: int
+    history_tokens: int
+    dynamic_tokens: int
+    total_tokens: int
+    turns_included: int
+    turns_summarised: int
+    turns_dropped: int
+
+
+@dataclass(frozen=True, slots=True)
+class Prompt:
+    prefix: str # Identical on every turn
+    dynamic: str
+    stats: PromptStats
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.dynamic
+
+
+class PromptBuilder:
+    """
+    Builds chat prompts from a cached static prefix and a budgeted dynamic part.
+
+    Args:
+        system_messages: System instructions, including the government schemes
+        max_tokens: Estimated token budget for the whole prompt
+        summary_share: Share of the history budget used to summarise older turns
+        summary_chars: Characters kept from each summarised message
+    """
+
+    def __init__(self, system_messages: Sequence[str], max_tokens: int = 12000,
+                 summary_share: float = 0.2, summary_chars: int = 120):
+        self.max_tokens = max_tokens
+        self.summary_share = summary_share
+        self.summary_chars = summary_chars
+        system = "\n".join(f"System: {message}" for message in system_messages)
+        self.prefix = f"{system}\n\n{FIELD_CATALOGUE}\n\n{INSTRUCTIONS}\n\n"
+        self.prefix_tokens = estimate_tokens(self.prefix)
+
+    def _summarise(self, messages: List[Message], budget: int) -> List[str]:
+        # Newest of the older turns are the most relevant, so fill the summary from the end
+        lines = []
+        for message in reversed(messages):
+            snippet = message.content[:self.summary_chars]
+            if len(message.content) > self.summary_chars:
+                snippet += "..."
+            line = f"- {message.role.capitalize()}: {snippet}"
+            tokens = estimate_tokens(line) + 1
+            if tokens > budget:
+                break
+            budget -= tokens
+            lines.append(line)
+        lines.reverse()
+        return lines
+
+    def build(self, question: str, history: Sequence[Message], context: Optional[str] = None,
+              borrowing_response=None, eligible_government_schemes=None) -> Prompt:
+        """
+        Build the prompt for one turn.
+
+        Args:
+            question: The user's question
+            history: The session's messages, oldest first, excluding the question
+            context: Optional context about the user's situation
+            borrowing_response: The user's borrowing results, if any
+            eligible_government_schemes: Government schemes checked for the user, if any
+
+        Returns:
+            Prompt: The static prefix, the dynamic part and token counts
+        """
+        details = (
+            f"Chat history: {context}\n\n"
+            f"Borrowing model: {borrowing_response}\n\n"
+            f"Eligible government schemes: {eligible_government_schemes}\n\n"
+            f"Current question: {question}\n"
+        )
+        details_tokens = estimate_tokens(details)
+        history_budget = max(self.max_tokens - self.prefix_tokens - details_tokens - SECTION_HEADER_TOKENS, 0)
+
+        # Walk back from the newest message, using the token counts stored with each record
+        recent_budget = int(history_budget * (1 - self.summary_share))
+        included = 0
+        history_tokens = 0
+        for message in reversed(history):
+            tokens = message.tokens + ROLE_LABEL_TOKENS
+            if history_tokens + tokens > recent_budget:
+                break
+            history_tokens += tokens
+            included += 1
+        older = list(history[:len(history) - included])
+        recent = history[len(history) - included:]
+
+        summary = self._summarise(older, history_budget - history_tokens) if older else []
+        sections = []
+        if summary:
+            sections.append("Earlier conversation (summarised):\n" + "\n".join(summary))
+        if recent:
+            sections.append("Previous conversation:\n" + "\n".join(f"{message.role.capitalize()}: {message.content}" for message in recent))
+        conversation = "\n\n".join(sections) + "\n\n" if sections else ""
+        conversation_tokens = estimate_tokens(conversation) if conversation else 0
+
+        dynamic = conversation + details
+        dynamic_tokens = conversation_tokens + details_tokens
+        return Prompt(
+            prefix=self.prefix,
+            dynamic=dynamic,
+            stats=PromptStats(
+                prefix_tokens=self.prefix_tokens,
+                history_tokens=conversation_tokens,
+                dynamic_tokens=dynamic_tokens,
+                total_tokens=self.prefix_tokens + dynamic_tokens,
+                turns_included=included,
+                turns_summarised=len(summary),
+                turns_dropped=len(older) - len(summary),
+            )
+        )
@@ -0,0 +1,184 @@
+# Interest Rate Stress Testing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.batch_borrowing import BatchBorrowingModel
+from api.models import EstimateRequest
+
+PERCENTILES = [5, 50, 95]
+
+
+@dataclass(frozen=True, slots=True)
+class StressTestSettings:
+    """
+    Parameters for the simulated rate paths.
+
+    Rates follow a mean-reverting random walk in yearly steps:
+    r[t+1] = r[t] + mean_reversion * (long_run_rate - r[t]) + volatility * N(0, 1),
+    floored at zero. All rates are in percent.
+    """
+    paths: int = 2000
+    horizon_years: int = 5
+    volatility: float = 1.0
+    mean_reversion: float = 0.2
+    long_run_rate: Optional[float] = None
+    seed: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class StressTestResult:
+    probability_exceeds_income: float
+    yearly_exceedance_probability: List[float]
+    rate_percentiles: Dict[str, List[float]]
+    repayment_percentiles: Dict[str, List[float]]
+
+
+def simulate_rate_paths(start_rate: float, settings: StressTestSettings, rng: np.random.Generator) -> np.ndarray:
+    """Simulate yearly rate paths, shaped (paths, horizon_years). Year 0 uses start_rate."""
+    long_run_rate = start_rate if settings.long_run_rate is None else settings.long_run_rate
+    shocks = rng.standard_normal((settings.paths, settings.horizon_years - 1)) * settings.volatility
+    rates = np.empty((settings.paths, settings.horizon_years))
+    rates[:, 0] = start_rate
+    for year in range(1, settings.horizon_years):
+        previous = rates[:, year - 1]
+        rates[:, year] = np.maximum(previous + settings.mean_reversion * (long_run_rate - previous) + shocks[:, year - 1], 0)
+    return rates
+
+
+def simulate_repayments(principal: float, loan_term: int, rates: np.ndarray) -> np.ndarray:
+    """
+    Yearly repayments on a variable-rate loan along each rate path.
+
+    Each year the monthly repayment is reset to amortise the remaining balance over
+    the remaining term at that year's rate, as a lender would on a rate change.
+
+    Returns:
+        np.ndarray: Total repayments per year, shaped like rates
+    """
+    balance = np.full(rates.shape[0], float(principal))
+    repayments = np.zeros_like(rates)
+    for year in range(rates.shape[1]):
+        months_left = max(loan_term - year, 0) * 12
+        if months_left == 0:
+            break
+        monthly_rate = rates[:, year] / 100 / 12
+        growth = (1 + monthly_rate) ** months_left
+        with np.errstate(divide="ignore", invalid="ignore"):
+            monthly = np.where(monthly_rate == 0, balance / months_left, balance * monthly_rate * growth / (growth - 1))
+            year_growth = (1 + monthly_rate) ** 12
+            balance = np.where(
+                monthly_rate == 0,
+                balance - monthly * 12,
+                balance * year_growth - monthly * (year_growth - 1) / monthly_rate
+            )
+        balance = np.maximum(balance, 0)
+        repayments[:, year] = monthly * 12
+    return repayments
+
+
+def stress_test_profile(principal: float, net_income: float, start_rate: float, loan_term: int,
+                        settings: StressTestSettings, seed: np.random.SeedSequence) -> StressTestResult:
+    """
+    Run the Monte Carlo stress test for one profile.
+
+    Args:
+        principal: Loan amount
+        net_income: Yearly income left after tax and expenses, available for repayments
+        start_rate: Current interest rate in percent
+        loan_term: Loan term in years
+        settings: Rate path parameters
+        seed: Seed for this profile's random generator
+
+    Returns:
+        StressTestResult: How often repayments exceed net income, plus rate and repayment percentiles per year
+    """
+    rng = np.random.default_rng(seed)
+    rates = simulate_rate_paths(start_rate, settings, rng)
+    repayments = simulate_repayments(principal, loan_term, rates)
+    exceeds = repayments > net_income
+    return StressTestResult(
+        probability_exceeds_income=float(np.mean(np.any(exceeds, axis=1))),
+        yearly_exceedance_probability=np.mean(exceeds, axis=0).tolist(),
+        rate_percentiles={f"p{p}": values.tolist() for p, values in zip(PERCENTILES, np.percentile(rates, PERCENTILES, axis=0))},
+        repayment_percentiles={f"p{p}": values.tolist() for p, values in zip(PERCENTILES, np.percentile(repayments, PERCENTILES, axis=0) / 12)},
+    )
+
+
+def _stress_test_chunk(principals, net_incomes, start_rates, loan_terms, settings, seeds) -> List[StressTestResult]:
+    return [
+        stress_test_profile(principal, net_income, start_rate, int(loan_term), settings, seed)
+        for principal, net_income, start_rate, loan_term, seed in zip(principals, net_incomes, start_rates, loan_terms, seeds)
+    ]
+
+
+class StressTester:
+    """
+    Monte Carlo interest-rate stress testing for borrowing profiles.
+
+    Each profile's loan (its borrowing power unless a loan amount is given) is run
+    along thousands of simulated rate paths. Batches are split into chunks and
+    fanned out over a process pool. Every profile gets its own seed spawned from
+    the settings seed, so results do not depend on how the work was split.
+    """
+
+    def __init__(self, batch_model: BatchBorrowingModel = None, max_workers: int = 0, chunk_size: int = 16):
+        self.batch_model = batch_model or BatchBorrowingModel()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Lazy initialization of the process pool."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, profiles: List[EstimateRequest], settings: StressTestSettings,
+            loan_amounts: Optional[List[Optional[float]]] = None) -> List[StressTestResult]:
+        """
+        Stress test many profiles.
+
+        Args:
+            profiles: The profiles to test
+            settings: Rate path parameters
+            loan_amounts: Optional loan amount per profile, defaulting to its borrowing power
+
+        Returns:
+            List[StressTestResult]: One result per profile, in order
+        """
+        if settings.paths < 1 or settings.horizon_years < 1:
+            raise ValueError("Stress tests need at least one path and one year")
+        if not profiles:
+            return []
+
+        columns = self.batch_model.to_columns(profiles)
+        results = self.batch_model.calculate_columns(columns)
+        principals = results["borrowing_power"].copy()
+        if loan_amounts is not None:
+            for i, amount in enumerate(loan_amounts):
+                if amount is not None:
+                    principals[i] = amount
+        # Repayments are tested against income left after tax and all other expenses
+        net_incomes = results["net_income"]
+        seeds = np.random.SeedSequence(settings.seed).spawn(len(profiles))
+
+        chunks = [
+            (principals[i:i + self.chunk_size], net_incomes[i:i + self.chunk_size],
+             columns["interestRate"][i:i + self.chunk_size], columns["loanTerm"][i:i + self.chunk_size],
+             settings, seeds[i:i + self.chunk_size])
+            for i in range(0, len(profiles), self.chunk_size)
+        ]
+        if self.max_workers and len(chunks) > 1:
+            chunk_results = self.executor.map(_stress_test_chunk, *zip(*chunks))
+        else:
+            chunk_results = (_stress_test_chunk(*chunk) for chunk in chunks)
+        return [result for chunk in chunk_results for result in chunk]
@@ -0,0 +1,428 @@
+"""
+Deadlines, retries, hedging and a circuit breaker for chat model calls.
+
+ResilientClient wraps a Gemini client, or anything with the same API such as
+FakeGeminiClient, and adds to each generate_content call:
+
+- a deadline on every attempt, cut short by the deadline of the request it
+  serves when one is set with request_deadline
+- bounded retries of transient errors, with full-jitter exponential backoff
+- optionally, a hedged duplicate request once an attempt has run longer than
+  the recent p95 latency; whichever answers first is used
+- a circuit breaker that fails fast with CircuitOpenError after repeated
+  failures, so ChatModel can send a canned reply instead of waiting on the API
+
+Blocking calls run on a thread pool so they can be timed out and hedged. A
+timed out blocking call cannot be interrupted; its result is discarded.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from threading import Lock
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional
+from collections import deque
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# time.perf_counter() by which the current request must be answered, if it has a limit
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the model while the circuit breaker is open."""
+
+
+class CallTimeoutError(TimeoutError):
+    """Raised when a single model call misses its deadline."""
+
+
+@dataclass(frozen=True, slots=True)
+class ResilienceSettings:
+    """
+    Parameters for ResilientClient.
+
+    Attributes:
+        deadline: Seconds allowed for each attempt, including any hedged request
+        retries: Retries after the first attempt for transient errors
+        backoff: Upper bound of the first retry's random delay, doubled for each later retry
+        max_backoff: Upper bound of any retry delay
+        hedge: Whether to send a duplicate request when an attempt is slower than usual
+        hedge_quantile: Latency quantile after which the duplicate is sent
+        hedge_min_samples: Successful calls needed before hedging starts
+        failure_threshold: Consecutive failures that open the circuit
+        reset_after: Seconds the circuit stays open before a trial call is let through
+    """
+    deadline: float = 15.0
+    retries: int = 2
+    backoff: float = 0.25
+    max_backoff: float = 2.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    failure_threshold: int = 5
+    reset_after: float = 30.0
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed call is worth retrying: timeouts, connection errors, rate limits and server errors."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None)
+    if not isinstance(code, int):
+        code = getattr(error, "status_code", None)
+    return isinstance(code, int) and (code == 429 or code >= 500)
+
+
+@contextmanager
+def request_deadline(deadline: float) -> Iterator[None]:
+    """
+    Limit model calls made in this context, including their retries, to finish by deadline.
+
+    Args:
+        deadline: A time.perf_counter() value; an enclosing earlier deadline still applies
+    """
+    current = _request_deadline.get()
+    token = _request_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current request's deadline, or None if it has none."""
+    deadline = _request_deadline.get()
+    return None if deadline is None else deadline - time.perf_counter()
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failures and stops calls for a while once there are too many.
+
+    The circuit opens after failure_threshold consecutive failures. After reset_after
+    seconds one trial call is allowed (half open): success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_after:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_after:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(f"Chat model circuit opened after {self._failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Let another trial call through after one ended without an outcome, e.g. because it was cancelled."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+
+class LatencyWindow:
+    """Latencies of the most recent successful calls."""
+
+    def __init__(self, size: int = 200):
+        self._lock = Lock()
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            samples = sorted(self._samples)
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class ResilientClient:
+    """
+    Wraps a chat client with deadlines, retries, hedging and a circuit breaker.
+
+    Args:
+        client: A genai.Client, or anything with the same API
+        settings: Deadlines, retry, hedging and circuit breaker parameters
+        clock: Time source for the circuit breaker, time.monotonic by default
+        jitter: Source of backoff jitter in [0, 1), random.random by default
+        sleep: Called with each retry delay by the blocking API, time.sleep by default.
+            The async API always uses asyncio.sleep.
+    """
+
+    def __init__(self, client: Any, settings: ResilienceSettings = ResilienceSettings(),
+                 clock: Callable[[], float] = time.monotonic, jitter: Callable[[], float] = random.random,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.client = client
+        self.settings = settings
+        self.breaker = CircuitBreaker(settings.failure_threshold, settings.reset_after, clock)
+        self.latencies = LatencyWindow()
+        self.jitter = jitter
+        self.sleep = sleep
+        self._lock = Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.counters = {"retries": 0, "timeouts": 0, "hedges": 0, "hedge_wins": 0, "short_circuits": 0}
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+        if hasattr(client, "aio"):
+            self.aio = SimpleNamespace(models=SimpleNamespace(
+                generate_content=self._agenerate_content,
+                generate_content_stream=self._agenerate_content_stream,
+            ))
+        self.caches = getattr(client, "caches", None)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Lazy initialization of the thread pool used for blocking calls."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="chat-call")
+            return self._executor
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counters)
+        stats["circuit_state"] = self.breaker.state
+        stats["circuit_trips"] = self.breaker.trips
+        stats["p95_latency"] = self.latencies.quantile(0.95, self.settings.hedge_min_samples)
+        return stats
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _hedge_delay(self, timeout: float) -> Optional[float]:
+        if not self.settings.hedge:
+            return None
+        delay = self.latencies.quantile(self.settings.hedge_quantile, self.settings.hedge_min_samples)
+        return delay if delay is not None and delay < timeout else None
+
+    def _attempt_timeout(self) -> float:
+        """Seconds allowed for the next attempt: the per-attempt deadline or the time left in the request."""
+        left = time_left()
+        return self.settings.deadline if left is None else max(min(self.settings.deadline, left), 0.0)
+
+    def _backoff(self, retry: int) -> float:
+        return self.jitter() * min(self.settings.max_backoff, self.settings.backoff * 2 ** retry)
+
+    @contextmanager
+    def _admitted(self) -> Iterator[None]:
+        """
+        Admit a call through the circuit breaker.
+
+        A call cancelled before it settles, by a request timeout or a client
+        disconnecting, frees the half-open trial so the circuit can still close.
+        """
+        if not self.breaker.allow():
+            self._count("short_circuits")
+            raise CircuitOpenError("The chat model is unavailable after repeated failures")
+        try:
+            yield
+        except Exception:
+            raise
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+
+    def _failed(self, error: Exception, retry: int) -> Optional[float]:
+        """Record a failed attempt and return the delay before retrying it, or None not to retry."""
+        if not is_transient(error):
+            # The API answered, so it is up even though this request was rejected
+            self.breaker.record_success()
+            return None
+        if isinstance(error, CallTimeoutError):
+            self._count("timeouts")
+        self.breaker.record_failure()
+        if retry >= self.settings.retries:
+            return None
+        delay = self._backoff(retry)
+        left = time_left()
+        # A retry needs time left in the request after its backoff
+        if left is not None and left <= delay:
+            return None
+        if not self.breaker.allow():
+            return None
+        self._count("retries")
+        logger.warning(f"Chat model call failed, retrying: {str(error)}")
+        return delay
+
+    def _generate_content(self, *, model: str, contents: Any, config: Any = None):
+        call = partial(self.client.models.generate_content, model=model, contents=contents, config=config)
+        with self._admitted():
+            retry = 0
+            while True:
+                try:
+                    response = self._attempt(call)
+                except Exception as e:
+                    delay = self._failed(e, retry)
+                    if delay is None:
+                        raise
+                    self.sleep(delay)
+                    retry += 1
+                    continue
+                self.breaker.record_success()
+                return response
+
+    def _attempt(self, call: Callable[[], Any]):
+        """One attempt on the thread pool, with a hedged duplicate if it runs long."""
+        started = time.perf_counter()
+        timeout = self._attempt_timeout()
+        deadline = started + timeout
+        hedge_delay = self._hedge_delay(timeout)
+        pending = {self.executor.submit(call)}
+        first = next(iter(pending))
+        error = None
+        while pending:
+            now = time.perf_counter()
+            timeout = deadline - now
+            if hedge_delay is not None:
+                timeout = min(timeout, started + hedge_delay - now)
+            done, pending = wait(pending, timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._succeeded(started, hedged=future is not first)
+                    return future.result()
+                error = future.exception()
+            if not done and hedge_delay is not None:
+                hedge_delay = None
+                self._count("hedges")
+                pending.add(self.executor.submit(call))
+            elif not done:
+                break
+        if error is not None and not pending:
+            raise error
+        raise CallTimeoutError(f"No response from the chat model within {timeout:.2f} seconds")
+
+    def _succeeded(self, started: float, hedged: bool) -> None:
+        self.latencies.record(time.perf_counter() - started)
+        if hedged:
+            self._count("hedge_wins")
+
+    async def _agenerate_content(self, *, model: str, contents: Any, config: Any = None):
+        call = partial(self.client.aio.models.generate_content, model=model, contents=contents, config=config)
+        with self._admitted():
+            retry = 0
+            while True:
+                try:
+                    response = await self._aattempt(call)
+                except Exception as e:
+                    delay = self._failed(e, retry)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    retry += 1
+                    continue
+                self.breaker.record_success()
+                return response
+
+    async def _aattempt(self, call: Callable[[], Awaitable]):
+        """Async version of _attempt; the losing request is cancelled."""
+        started = time.perf_counter()
+        timeout = self._attempt_timeout()
+        deadline = started + timeout
+        hedge_delay = self._hedge_delay(timeout)
+        first = asyncio.ensure_future(call())
+        pending = {first}
+        error = None
+        try:
+            while pending:
+                now = time.perf_counter()
+                timeout = deadline - now
+                if hedge_delay is not None:
+                    timeout = min(timeout, started + hedge_delay - now)
+                done, pending = await asyncio.wait(pending, timeout=max(timeout, 0), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._succeeded(started, hedged=task is not first)
+                        return task.result()
+                    error = task.exception()
+                if not done and hedge_delay is not None:
+                    hedge_delay = None
+                    self._count("hedges")
+                    pending.add(asyncio.ensure_future(call()))
+                elif not done:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        if error is not None and not pending:
+            raise error
+        raise CallTimeoutError(f"No response from the chat model within {timeout:.2f} seconds")
+
+    async def _agenerate_content_stream(self, *, model: str, contents: Any, config: Any = None):
+        """Open a stream with the same deadline, retries and circuit breaker. Streams are not hedged."""
+        with self._admitted():
+            retry = 0
+            while True:
+                timeout = self._attempt_timeout()
+                try:
+                    stream = await asyncio.wait_for(
+                        self.client.aio.models.generate_content_stream(model=model, contents=contents, config=config),
+                        timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    error = CallTimeoutError(f"The chat model did not start streaming within {timeout:.2f} seconds")
+                    delay = self._failed(error, retry)
+                    if delay is None:
+                        raise error
+                except Exception as e:
+                    delay = self._failed(e, retry)
+                    if delay is None:
+                        raise
+                else:
+                    self.breaker.record_success()
+                    return stream
+                await asyncio.sleep(delay)
+                retry += 1
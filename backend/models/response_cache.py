@@ -0,0 +1,144 @@
+"""
+Cache of chat answers for repeated questions.
+
+Questions are normalised (case, punctuation and whitespace) before lookup.
+Answers are keyed by the normalised question plus a hash of the state they
+depend on: the user's context, borrowing results, eligible schemes and the
+previous assistant message. Questions marked as profile-independent, such as
+"What is LMI?", are keyed by the question alone and shared by every session.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import re
+import time
+import unicodedata
+
+GENERIC_QUESTIONS_PATH = "backend/utils/generic_questions.json"
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def load_generic_questions(path: str = GENERIC_QUESTIONS_PATH) -> List[str]:
+    with open(path, "r") as f:
+        return json.load(f)["profile_independent_questions"]
+
+
+def normalise_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace, so trivially different phrasings match."""
+    question = unicodedata.normalize("NFKC", question).lower()
+    question = _PUNCTUATION.sub(" ", question)
+    return _WHITESPACE.sub(" ", question).strip()
+
+
+def state_hash(context: Optional[str], borrowing_response: Any, eligible_government_schemes: Any,
+               previous_answer: Optional[str]) -> str:
+    """Stable hash of everything besides the question that a profile-dependent answer depends on."""
+    if hasattr(borrowing_response, "model_dump"):
+        borrowing_response = borrowing_response.model_dump(mode="json")
+    schemes = [scheme.model_dump(mode="json") if hasattr(scheme, "model_dump") else scheme
+               for scheme in eligible_government_schemes or []]
+    state = [context, borrowing_response or None, schemes, previous_answer]
+    return hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of (response_text, actions) answers.
+
+    Args:
+        max_size: Maximum number of cached answers
+        ttl_seconds: How long an answer may be served
+        profile_independent: Questions whose answers do not depend on the user
+        clock: Time source, time.monotonic by default
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600,
+                 profile_independent: Iterable[str] = (), clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.profile_independent = {normalise_question(question) for question in profile_independent}
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, str, list]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def mark_profile_independent(self, question: str, independent: bool = True) -> None:
+        """Mark (or unmark) a question as having the same answer for every user."""
+        normalised = normalise_question(question)
+        with self._lock:
+            if independent:
+                self.profile_independent.add(normalised)
+            else:
+                self.profile_independent.discard(normalised)
+                self._entries.pop((normalised, None), None)
+
+    def key(self, question: str, state: Callable[[], str]) -> Tuple[str, Optional[str]]:
+        """
+        Cache key for a question.
+
+        Args:
+            question: The user's question
+            state: Returns the state hash, only called for profile-dependent questions
+        """
+        normalised = normalise_question(question)
+        if normalised in self.profile_independent:
+            return normalised, None
+        return normalised, state()
+
+    def get(self, key: Tuple[str, Optional[str]]) -> Optional[Tuple[str, list]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, response_text, actions = entry
+            if self.clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may modify the actions they are handed
+        return response_text, json.loads(json.dumps(actions, default=str))
+
+    def put(self, key: Tuple[str, Optional[str]], response_text: str, actions: list) -> None:
+        # A profile-independent answer must not carry updates to one user's details
+        if key[1] is None and any(_action_type(action) == "update_field" for action in actions):
+            return
+        with self._lock:
+            self._entries[key] = (self.clock(), response_text, json.loads(json.dumps(actions, default=str)))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "profile_independent_questions": len(self.profile_independent),
+            }
+
+
+def _action_type(action: Any) -> Optional[str]:
+    action_type = action.get("type") if isinstance(action, dict) else getattr(action, "type", None)
+    return getattr(action_type, "value", action_type)
@@ -0,0 +1,149 @@
+"""
+Incremental parser for streamed ChatResponse JSON.
+
+The model streams {"response": "...", "actions": [...]} a few characters at a
+time. ChatResponseStreamParser decodes the top-level "response" string as it
+arrives, so text can be shown before the JSON is complete, and parses the
+actions once the whole document has been received.
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+RESPONSE_KEY = "response"
+
+
+def _safe_escape_cut(raw: str) -> int:
+    """
+    Length of the prefix of raw (the inside of a JSON string) that can be decoded now.
+
+    An escape sequence cut off by the end of a chunk, or a high surrogate still
+    waiting for its low surrogate, is held back until more data arrives.
+    """
+    i = 0
+    length = len(raw)
+    while i < length:
+        if raw[i] != "\\":
+            i += 1
+            continue
+        if i + 1 >= length:
+            return i
+        if raw[i + 1] != "u":
+            i += 2
+            continue
+        if i + 6 > length:
+            return i
+        code = int(raw[i + 2:i + 6], 16)
+        if 0xD800 <= code <= 0xDBFF:
+            if i + 12 > length:
+                return i
+            i += 12
+        else:
+            i += 6
+    return length
+
+
+class ChatResponseStreamParser:
+    """
+    Feed chunks of the streamed JSON with feed(), which returns newly decoded
+    response text, then call finish() for the full response text and actions.
+    """
+
+    def __init__(self):
+        self.buffer: List[str] = []
+        self.text: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._after_colon = False
+        self._string_is_key = False
+        self._key: List[str] = []
+        self._last_key = None
+        self._capturing = False
+        self._raw: List[str] = [] # Undecoded characters of the response string
+
+    def _start_string(self) -> None:
+        self._in_string = True
+        if self._depth != 1:
+            self._string_is_key = False
+            self._capturing = False
+        elif self._after_colon:
+            self._string_is_key = False
+            self._capturing = self._last_key == RESPONSE_KEY
+        else:
+            self._string_is_key = True
+            self._key = []
+
+    def _end_string(self) -> None:
+        self._in_string = False
+        if self._string_is_key:
+            self._last_key = "".join(self._key)
+        self._capturing = False
+
+    def _decode(self, final: bool) -> str:
+        raw = "".join(self._raw)
+        cut = len(raw) if final else _safe_escape_cut(raw)
+        self._raw = [raw[cut:]] if cut < len(raw) else []
+        if cut == 0:
+            return ""
+        decoded = json.loads('"' + raw[:cut] + '"')
+        self.text.append(decoded)
+        return decoded
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next chunk.
+
+        Args:
+            chunk: The next piece of the streamed JSON
+
+        Returns:
+            str: Response text decoded from this chunk, possibly empty
+        """
+        self.buffer.append(chunk)
+        decoded = []
+        for char in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    if self._capturing:
+                        decoded.append(self._decode(final=True))
+                    self._end_string()
+                    continue
+                if self._capturing:
+                    self._raw.append(char)
+                elif self._string_is_key:
+                    self._key.append(char)
+            elif char == '"':
+                self._start_string()
+            elif char == ":":
+                self._after_colon = True
+            elif char == ",":
+                self._after_colon = False
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._after_colon = False
+            elif char in "}]":
+                self._depth -= 1
+        if self._capturing:
+            decoded.append(self._decode(final=False))
+        return "".join(decoded)
+
+    def finish(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Parse the complete document.
+
+        Returns:
+            Tuple[str, List[Dict[str, Any]]]: The response text and actions. If the
+            stream was not valid JSON, the raw text and no actions.
+        """
+        document = "".join(self.buffer)
+        try:
+            data = json.loads(document)
+        except json.JSONDecodeError:
+            return document, []
+        return data.get(RESPONSE_KEY, ""), data.get("actions", [])
@@ -1,31 +1,123 @@
+import bisect
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
 
+import numpy as np
 
+TAX_TABLES_PATH = Path(__file__).parent.parent / "utils" / "tax_tables.json"
 
-def calculate_tax(gross_income: float) -> float:
-    tax_rates = {
-        "resident": {
-            18200: [0,0],
-            45000: [0.16,0],
-            135000: [0.3,4288],
-            190000: [0.37,31288],
-            999999999: [0.45,51638],
-        }
-    }
 
-    medicare_levy_rate = 0.02
+@lru_cache()
+def load_tax_tables() -> dict:
+    """Load the raw tax and HECS bracket data for every financial year."""
+    with open(TAX_TABLES_PATH, 'r') as f:
+        return json.load(f)
 
 
+def available_financial_years() -> List[str]:
+    return list(load_tax_tables()["financial_years"])
+
+
+def resolve_financial_year(financial_year: Optional[str] = None) -> str:
+    """Return the financial year to use, defaulting to the current one."""
+    tables = load_tax_tables()
+    if financial_year is None:
+        return tables["default_financial_year"]
+    if financial_year not in tables["financial_years"]:
+        raise ValueError(f"Invalid financial year: {financial_year}")
+    return financial_year
+
+
+class BracketTable:
+    """
+    A compiled set of income brackets.
+
+    Brackets are stored as sorted upper bounds so the bracket for an income is a
+    single bisect (or np.searchsorted for arrays). An income equal to an upper bound
+    falls in that bracket. The last bracket has no upper bound.
+    """
+
+    __slots__ = ("upper_bounds", "lower_bounds", "rates", "base_amounts",
+                 "_upper_bounds_array", "_lower_bounds_array", "_rates_array", "_base_amounts_array")
+
+    def __init__(self, brackets: List[list]):
+        self.upper_bounds = [float(upper) for upper, _ in brackets[:-1]]
+        self.lower_bounds = [0.0] + self.upper_bounds
+        self.rates = [float(rate) for _, rate in brackets]
+        # Cumulative amount owed at the bottom of each bracket
+        self.base_amounts = [0.0]
+        for i in range(1, len(self.rates)):
+            width = self.lower_bounds[i] - self.lower_bounds[i - 1]
+            self.base_amounts.append(self.base_amounts[-1] + width * self.rates[i - 1])
+
+        self._upper_bounds_array = np.array(self.upper_bounds)
+        self._lower_bounds_array = np.array(self.lower_bounds)
+        self._rates_array = np.array(self.rates)
+        self._base_amounts_array = np.array(self.base_amounts)
+
+    def index(self, income: float) -> int:
+        return bisect.bisect_left(self.upper_bounds, income)
+
+    def index_array(self, income: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self._upper_bounds_array, income, side="left")
+
+    def marginal(self, income: float) -> float:
+        """Progressive amount: base amount for the bracket plus the rate on the excess."""
+        i = self.index(income)
+        return self.base_amounts[i] + (income - self.lower_bounds[i]) * self.rates[i]
+
+    def marginal_array(self, income: np.ndarray) -> np.ndarray:
+        i = self.index_array(income)
+        return self._base_amounts_array[i] + (income - self._lower_bounds_array[i]) * self._rates_array[i]
+
+    def flat(self, income: float) -> float:
+        """Whole-income amount: the bracket's rate applied to the entire income."""
+        return income * self.rates[self.index(income)]
+
+    def flat_array(self, income: np.ndarray) -> np.ndarray:
+        return income * self._rates_array[self.index_array(income)]
+
+
+class TaxTable:
+    """Compiled resident income tax, medicare levy and HECS brackets for one financial year."""
+
+    __slots__ = ("financial_year", "brackets", "medicare_levy_rate", "hecs_brackets")
+
+    def __init__(self, financial_year: str, data: dict):
+        self.financial_year = financial_year
+        self.brackets = BracketTable(data["income_tax"]["resident"]["brackets"])
+        self.medicare_levy_rate = data["medicare_levy_rate"]
+        self.hecs_brackets = BracketTable(data["hecs"]["brackets"])
+
+
+@lru_cache()
+def get_tax_table(financial_year: Optional[str] = None) -> TaxTable:
+    """Compile (once) and return the tax table for a financial year."""
+    financial_year = resolve_financial_year(financial_year)
+    return TaxTable(financial_year, load_tax_tables()["financial_years"][financial_year])
+
+
+def reload_tax_tables() -> None:
+    """Drop the loaded and compiled tables so the next lookup re-reads tax_tables.json."""
+    load_tax_tables.cache_clear()
+    get_tax_table.cache_clear()
+
+
+def calculate_tax(gross_income: float, financial_year: Optional[str] = None) -> float:
     # For now lets assume resident
-    tax_rate = 0
-    tax_amount = 0
-    cut_off = 0
-    for i in tax_rates["resident"]:
-        if gross_income <= i:
-            tax_rate = tax_rates["resident"][i][0]
-            tax_amount = tax_rates["resident"][i][1]
-            break
-        else:
-            cut_off = i
-    tax = (gross_income - cut_off) * tax_rate + tax_amount
-    medicare_levy = gross_income * medicare_levy_rate
-    return tax + medicare_levy
\ No newline at end of file
+    table = get_tax_table(financial_year)
+    tax = table.brackets.marginal(gross_income)
+    medicare_levy = gross_income * table.medicare_levy_rate
+    return tax + medicare_levy
+
+
+def calculate_tax_array(gross_income: np.ndarray, financial_year: Optional[str] = None) -> np.ndarray:
+    """
+    Vectorized version of calculate_tax.
+    Takes an array of gross incomes and returns an array of tax (including medicare levy).
+    """
+    table = get_tax_table(financial_year)
+    gross_income = np.asarray(gross_income, dtype=float)
+    return table.brackets.marginal_array(gross_income) + gross_income * table.medicare_levy_rate
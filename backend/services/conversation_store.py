@@ -0,0 +1,185 @@
+"""
+Per-session conversation history for the chat model.
+
+Messages are kept as compact slotted records in a bounded deque per session.
+Each session is trimmed to a turn and token budget, sessions idle for longer
+than idle_seconds are dropped, and when the store as a whole goes over its
+memory ceiling the least recently active sessions are evicted first.
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Deque, Dict, List, Optional
+import logging
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a Message record and its deque slot, excluding the content string
+MESSAGE_OVERHEAD_BYTES = 120
+# Roughly four characters per token for English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate, good enough for budgeting without a tokenizer."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    role: str
+    content: str
+    timestamp: float # Unix time
+    tokens: int
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+
+class Conversation:
+    __slots__ = ("messages", "tokens", "size", "last_active")
+
+    def __init__(self, now: float):
+        self.messages: Deque[Message] = deque()
+        self.tokens = 0
+        self.size = 0
+        self.last_active = now
+
+
+def _message_size(message: Message) -> int:
+    return sys.getsizeof(message.content) + MESSAGE_OVERHEAD_BYTES
+
+
+class ConversationStore:
+    """
+    Bounded, session-keyed store of chat messages.
+
+    Args:
+        max_turns: Messages kept per session, counting user and assistant messages
+        max_tokens: Estimated tokens kept per session
+        idle_seconds: Sessions not touched for this long are dropped
+        max_bytes: Approximate memory ceiling for all stored messages
+        clock: Time source for idle tracking, time.monotonic by default
+    """
+
+    def __init__(self, max_turns: int = 40, max_tokens: int = 8000, idle_seconds: float = 1800,
+                 max_bytes: int = 32 * 1024 * 1024, clock: Callable[[], float] = time.monotonic):
+        if max_turns < 1 or max_tokens < 1 or max_bytes < 1:
+            raise ValueError("Conversation budgets must be positive")
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.idle_seconds = idle_seconds
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # Ordered from least to most recently active
+        self._sessions: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+        self.trimmed = 0
+        self.idle_evictions = 0
+        self.memory_evictions = 0
+
+    def append(self, session_id: str, role: str, content: str) -> Message:
+        """
+        Add a message to a session, trimming the session and the store to their budgets.
+
+        Args:
+            session_id: The session the message belongs to
+            role: "user" or "assistant"
+            content: The message text
+
+        Returns:
+            Message: The stored record
+        """
+        message = Message(role=sys.intern(role), content=content, timestamp=time.time(), tokens=estimate_tokens(content))
+        with self._lock:
+            now = self.clock()
+            self._evict_idle(now)
+            conversation = self._sessions.get(session_id)
+            if conversation is None:
+                conversation = self._sessions[session_id] = Conversation(now)
+            else:
+                self._sessions.move_to_end(session_id)
+            conversation.last_active = now
+            conversation.messages.append(message)
+            conversation.tokens += message.tokens
+            size = _message_size(message)
+            conversation.size += size
+            self._size += size
+            self._trim(conversation)
+            self._enforce_ceiling(session_id)
+        return message
+
+    def _trim(self, conversation: Conversation) -> None:
+        # Always keep the newest message, even if it alone is over the token budget
+        messages = conversation.messages
+        while len(messages) > 1 and (len(messages) > self.max_turns or conversation.tokens > self.max_tokens):
+            dropped = messages.popleft()
+            conversation.tokens -= dropped.tokens
+            size = _message_size(dropped)
+            conversation.size -= size
+            self._size -= size
+            self.trimmed += 1
+
+    def _drop(self, session_id: str) -> None:
+        conversation = self._sessions.pop(session_id)
+        self._size -= conversation.size
+
+    def _evict_idle(self, now: float) -> None:
+        while self._sessions:
+            session_id, conversation = next(iter(self._sessions.items()))
+            if now - conversation.last_active < self.idle_seconds:
+                break
+            self._drop(session_id)
+            self.idle_evictions += 1
+
+    def _enforce_ceiling(self, current_session: str) -> None:
+        while self._size > self.max_bytes and len(self._sessions) > 1:
+            session_id = next(iter(self._sessions))
+            if session_id == current_session:
+                break
+            self._drop(session_id)
+            self.memory_evictions += 1
+            logger.info(f"Conversation store over {self.max_bytes} bytes, evicted session {session_id}")
+
+    def history(self, session_id: str) -> List[Message]:
+        """Return the session's messages, oldest first."""
+        with self._lock:
+            conversation = self._sessions.get(session_id)
+            return list(conversation.messages) if conversation is not None else []
+
+    def evict_idle(self) -> None:
+        with self._lock:
+            self._evict_idle(self.clock())
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """Forget one session, or every session if none is given."""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+                self._size = 0
+            elif session_id in self._sessions:
+                self._drop(session_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "messages": sum(len(conversation.messages) for conversation in self._sessions.values()),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "trimmed": self.trimmed,
+                "idle_evictions": self.idle_evictions,
+                "memory_evictions": self.memory_evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,160 @@
+"""
+SQLite cache of scraped listings.
+
+Entries are keyed by normalised listing URL and are fresh for ttl_seconds.
+Stale entries are kept with the page's ETag and Last-Modified validators, so
+the scraper can ask the site whether the listing changed before scraping it
+again. Once there are more than max_entries rows the least recently read are
+evicted.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+import json
+import logging
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def normalise_listing_url(url: str) -> str:
+    """
+    Reduce a listing URL to its cache key.
+
+    The scheme and host are lower-cased, and the query string, fragment and any
+    trailing slash are dropped, so tracking parameters don't split the cache.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+@dataclass(frozen=True, slots=True)
+class CachedListing:
+    property_data: Dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    fresh: bool
+
+
+class ListingCache:
+    """
+    Disk-backed cache of property_data, shared by threads.
+
+    Args:
+        path: SQLite database file, created if missing; ":memory:" for a private in-memory cache
+        ttl_seconds: Seconds an entry is used without revalidation
+        max_entries: Rows kept before the least recently read are evicted
+        clock: Time source, time.time by default so ages survive restarts
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 21600.0, max_entries: int = 5000,
+                 clock: Callable[[], float] = time.time):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                url TEXT PRIMARY KEY,
+                property_data TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS listings_accessed_at ON listings (accessed_at)")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[CachedListing]:
+        """
+        Look up a listing, fresh or stale.
+
+        Args:
+            url: The listing URL, normalised before lookup
+
+        Returns:
+            Optional[CachedListing]: The cached listing, or None if it isn't cached
+        """
+        key = normalise_listing_url(url)
+        now = self.clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT property_data, etag, last_modified, fetched_at FROM listings WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE listings SET accessed_at = ? WHERE url = ?", (now, key))
+            fresh = now - row[3] < self.ttl_seconds
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return CachedListing(json.loads(row[0]), row[1], row[2], row[3], fresh)
+
+    def put(self, url: str, property_data: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a freshly scraped listing, evicting the least recently read beyond max_entries."""
+        key = normalise_listing_url(url)
+        now = self.clock()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO listings (url, property_data, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(property_data), etag, last_modified, now, now)
+            )
+            evicted = self._connection.execute(
+                "DELETE FROM listings WHERE url IN "
+                "(SELECT url FROM listings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+            ).rowcount
+            self.evictions += evicted
+        if evicted:
+            logger.info(f"Evicted {evicted} listings from the cache")
+
+    def revalidated(self, url: str) -> None:
+        """Mark a stale listing fresh again after the site reported it unchanged."""
+        with self._lock:
+            self._connection.execute("UPDATE listings SET fetched_at = ? WHERE url = ?",
+                                     (self.clock(), normalise_listing_url(url)))
+            self.revalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM listings")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._connection.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.revalidations) / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,108 @@
+"""
+Per-host token-bucket rate limiting for the scraper.
+
+Each host has a bucket of up to burst tokens, refilled at rate tokens per
+second. A request takes a token and goes straight through while any are left;
+once the bucket is empty it waits just long enough for its token to refill.
+Waiting requests reserve their tokens in arrival order, so they are served
+first come, first served.
+"""
+
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Token buckets keyed by host, shared by every thread making requests.
+
+    Args:
+        rate: Tokens added to each host's bucket per second
+        burst: Bucket size, the number of requests a host can take at once after being idle
+        clock: Time source, time.monotonic by default
+        sleep: Called with each wait, time.sleep by default
+    """
+
+    def __init__(self, rate: float = 0.5, burst: int = 2, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = Lock()
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._queued = 0
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self, host: str) -> Dict[str, float]:
+        """Top up a host's bucket for the time since it was last used. Call with the lock held."""
+        now = self.clock()
+        bucket = self._buckets.setdefault(host, {"tokens": float(self.burst), "updated": now})
+        bucket["tokens"] = min(self.burst, bucket["tokens"] + (now - bucket["updated"]) * self.rate)
+        bucket["updated"] = now
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """
+        Take a token for the URL's host, waiting only if the host's bucket is empty.
+
+        Args:
+            url: The URL about to be requested
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            bucket = self._refill(host)
+            # Tokens may go negative: each waiting request reserves the next token to refill
+            bucket["tokens"] -= 1
+            wait_seconds = -bucket["tokens"] / self.rate if bucket["tokens"] < 0 else 0.0
+            self.acquired += 1
+            if wait_seconds > 0:
+                self.waits += 1
+                self.wait_seconds += wait_seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+                self._queued += 1
+        if wait_seconds <= 0:
+            return 0.0
+
+        logger.info(f"Rate limit reached for {host}, waiting {wait_seconds:.2f} seconds")
+        try:
+            self.sleep(wait_seconds)
+        finally:
+            with self._lock:
+                self._queued -= 1
+        return wait_seconds
+
+    def tokens(self, host: str) -> Optional[float]:
+        """Tokens currently in a host's bucket, negative while requests are queued, or None for an unseen host."""
+        with self._lock:
+            if host not in self._buckets:
+                return None
+            return self._refill(host)["tokens"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "queued": self._queued,
+                "mean_wait_seconds": self.wait_seconds / self.waits if self.waits else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "tokens": {host: self._refill(host)["tokens"] for host in list(self._buckets)},
+            }
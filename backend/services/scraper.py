@@ -1,24 +1,51 @@
 import requests
 from bs4 import BeautifulSoup
 import json
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
-import random
 import time
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os
 import logging
+from threading import Lock
+from backend.services.listing_cache import CachedListing, ListingCache
+from backend.services.rate_limiter import HostRateLimiter
+from backend.services.webdriver_pool import WebDriverPool
 
 logger = logging.getLogger(__name__)
 
+# Domain is a Next.js site; the listing is serialised into this script tag for hydration
+PAGE_STATE_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+# Where the listing's photos appear in its HTML without opening the gallery
+GALLERY_IMAGE_SELECTORS = [
+    '[data-testid^="listing-details__gallery"] img',
+    '[data-testid="listing-details__hero"] img',
+    'img.pswp__img',
+]
+
+# How often explicit waits re-check their condition
+CONDITION_POLL_SECONDS = 0.1
+
 class DomainScraper:
-    def __init__(self):
-        """Initialize the Domain.com.au scraper with required headers and configuration."""
+    def __init__(self, pool: Optional[WebDriverPool] = None, page_state: bool = True, request_timeout: float = 10.0,
+                 image_time_budget: float = 10.0, rate_limiter: Optional[HostRateLimiter] = None,
+                 cache: Optional[ListingCache] = None):
+        """
+        Initialize the Domain.com.au scraper with required headers and configuration.
+
+        Args:
+            pool: Headless Chrome drivers shared by concurrent scrapes, a single-driver pool by default
+            page_state: Read listings from the page-state JSON over plain HTTP before falling back to a browser
+            request_timeout: Seconds allowed for the page-state request
+            image_time_budget: Seconds allowed for clicking through the gallery when the page has no image URLs
+            rate_limiter: Per-host request budget shared by concurrent scrapes, HostRateLimiter() by default
+            cache: Scraped listings to reuse for repeat searches; None to always scrape
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
@@ -32,27 +59,25 @@ class DomainScraper:
             'Sec-Fetch-User': '?1',
         }
         self.session = requests.Session()
-        
-        # Initialize Chrome options for Selenium
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in headless mode
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(options=chrome_options)
-        logger.info("Initialized WebDriver")
+        self.pool = pool if pool is not None else WebDriverPool(size=1)
+        self.page_state = page_state
+        self.request_timeout = request_timeout
+        self.image_time_budget = image_time_budget
+        self.rate_limiter = rate_limiter if rate_limiter is not None else HostRateLimiter()
+        self.cache = cache
+        self._lock = Lock()
+        self.page_state_hits = 0
+        self.page_state_misses = 0
 
     def __del__(self):
-        """Cleanup method to ensure WebDriver is closed when the scraper is destroyed."""
-        if hasattr(self, 'driver'):
-            try:
-                self.driver.quit()
-                logger.info("Closed WebDriver")
-            except Exception as e:
-                logger.error(f"Error closing WebDriver: {e}")
+        """Cleanup method to ensure the WebDrivers are closed when the scraper is destroyed."""
+        if hasattr(self, 'pool'):
+            self.pool.close()
 
     def get_property_data(self, url: str) -> Optional[Dict]:
         """
         Scrape property information from a Domain.com.au listing URL.
+        Repeat lookups are answered from the cache, if there is one, while they are fresh or unchanged.
         
         Args:
             url: The Domain.com.au property listing URL
@@ -60,83 +85,253 @@ class DomainScraper:
         Returns:
             Dictionary containing property details or None if failed
         """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            return cached.property_data
+
         try:
-            # Add a random delay between requests (1-3 seconds)
-            time.sleep(random.uniform(1, 3))
-            
-            # Use Selenium to get the page content with JavaScript executed
-            self.driver.get(url)
-            
-            # Wait for the page to load and expand the description
-            wait = WebDriverWait(self.driver, 10)
-            try:
-                # Try to find and click the "Read more" button
-                read_more_button = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="listing-details__description"] button'))
-                )
-                read_more_button.click()
-                # Wait for the content to expand
-                time.sleep(2)
-            except:
-                # If no "Read more" button is found, continue
-                pass
-            
-            # Get the page source after JavaScript execution
-            page_source = self.driver.page_source
-            
-            # Parse the HTML
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Extract property information
-            property_data = {
-                "basic_info": {
-                    "url": url,
-                    "title": self._get_text(soup, 'h3[data-testid="listing-details__description-headline"]'),
-                    "property_type": self._get_property_type(soup),
-                    "price": None  # Initialize price as None
-                },
-                "address": {
-                    "full_address": self._get_address(soup),
-                },
-                "features": {
-                    "bedrooms": self._get_feature_value(soup, "Bed"),
-                    "bathrooms": self._get_feature_value(soup, "Bath"),
-                    "parking": self._get_feature_value(soup, "Parking"),
-                    "property_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__floor-area"]')),
-                    "land_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__land-area"]')),
-                },
-                "description": self._get_text(soup, '[data-testid="listing-details__description"]'),
-                "agent_details": {
-                    "agency_name": self._get_text(soup, '[data-testid="listing-details__agent-agency-name"]'),
-                    "agent_name": self._get_text(soup, '[data-testid="listing-details__agent-enquiry-agent-profile-link"]'),
-                },
-                "inspection_times": self._get_inspection_times(soup),
-                "images": self._get_images(),  # Changed to use Selenium directly
-            }
-            
-            # Try different price selectors
-            price_selectors = [
-                '[data-testid="listing-details__summary-title"]',
-                '[data-testid="listing-details__price"]',
-                '[data-testid="listing-details__price-text"]',
-                '.listing-price',
-            ]
-
-            # Try each selector until we find a valid price
-            for selector in price_selectors:
-                price_element = soup.select_one(selector)
-                if price_element:
-                    price = self._clean_price(price_element.get_text(strip=True))
-                    if price:  # Only set if we got a valid price
-                        property_data["basic_info"]["price"] = price
-                        break
-            
-            return property_data
-            
+            if cached is not None and self._not_modified(url, cached):
+                self.cache.revalidated(url)
+                return cached.property_data
+
+            # Most listings embed their data as JSON, which a plain HTTP request can read without a browser
+            property_data, validators = None, {}
+            if self.page_state:
+                property_data, validators = self._get_page_state_data(url)
+
+            if property_data is None:
+                # Use Selenium to get the page content with JavaScript executed
+                self.rate_limiter.acquire(url)
+                with self.pool.driver() as driver:
+                    property_data = self._scrape(driver, url)
+
         except Exception as e:
             logger.error(f"Error scraping property data: {e}")
             return None
 
+        if self.cache is not None:
+            self.cache.put(url, property_data, **validators)
+        return property_data
+
+    def stats(self) -> Dict:
+        """Usage counters for the page-state fast path, the browser pool and the rate limiter."""
+        with self._lock:
+            hits, misses = self.page_state_hits, self.page_state_misses
+        return {
+            "page_state": {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            },
+            "pool": self.pool.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    def _not_modified(self, url: str, cached: CachedListing) -> bool:
+        """Ask the site whether a stale cached listing has changed, if the page had an ETag or Last-Modified."""
+        headers = {}
+        if cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+        if not headers:
+            return False
+        try:
+            self.rate_limiter.acquire(url)
+            # Stream so a changed page's body isn't downloaded only to be discarded
+            response = self.session.get(url, headers={**self.headers, **headers}, timeout=self.request_timeout, stream=True)
+            response.close()
+            return response.status_code == 304
+        except Exception as e:
+            logger.warning(f"Revalidating the cached listing failed: {e}")
+            return False
+
+    def _get_page_state_data(self, url: str) -> Tuple[Optional[Dict], Dict[str, Optional[str]]]:
+        """
+        Fetch a listing over HTTP and extract its details from the page-state JSON.
+
+        Returns:
+            The property data, or None if that fails, and the page's etag and last_modified validators
+        """
+        property_data, validators = None, {}
+        try:
+            self.rate_limiter.acquire(url)
+            # requests can only decode brotli with an optional package, so don't offer it
+            response = self.session.get(url, headers={**self.headers, 'Accept-Encoding': 'gzip, deflate'},
+                                        timeout=self.request_timeout)
+            response.raise_for_status()
+            state = self._find_page_state(response.text)
+            if state is not None:
+                property_data = self._parse_page_state(state, url)
+            validators = {"etag": response.headers.get('ETag'), "last_modified": response.headers.get('Last-Modified')}
+        except Exception as e:
+            logger.warning(f"Page-state fetch failed, falling back to the browser: {e}")
+
+        with self._lock:
+            if property_data is None:
+                self.page_state_misses += 1
+            else:
+                self.page_state_hits += 1
+        return property_data, validators
+
+    def _find_page_state(self, html: str) -> Optional[Dict]:
+        """Return the page-state JSON embedded in a listing page, if any."""
+        match = PAGE_STATE_PATTERN.search(html)
+        if not match:
+            return None
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            return None
+
+    def _parse_page_state(self, state: Dict, url: str) -> Optional[Dict]:
+        """
+        Build property_data from the listing in Domain's page-state JSON.
+
+        The listing sits at props.pageProps.componentProps; pages without a listingId
+        there (search results, error pages, a changed layout) return None.
+        """
+        listing = state.get("props", {}).get("pageProps", {}).get("componentProps")
+        if not isinstance(listing, dict) or not listing.get("listingId"):
+            return None
+        summary = listing.get("listingSummary") or {}
+
+        description = listing.get("description") or ""
+        if isinstance(description, list):
+            description = "\n".join(description)
+
+        agents = listing.get("agents") or []
+        return {
+            "basic_info": {
+                "url": url,
+                "title": listing.get("headline") or "",
+                "property_type": listing.get("propertyType") or summary.get("propertyType") or "",
+                "price": self._clean_price(str(summary.get("title") or listing.get("price") or "")),
+            },
+            "address": {
+                "full_address": summary.get("address") or listing.get("address") or "",
+            },
+            "features": {
+                "bedrooms": self._to_int(summary.get("beds", listing.get("beds"))),
+                "bathrooms": self._to_int(summary.get("baths", listing.get("baths"))),
+                "parking": self._to_int(summary.get("parking", listing.get("parking"))),
+                "property_size": self._clean_size(str(listing.get("buildingSize") or "")),
+                "land_size": self._clean_size(str(listing.get("landSize") or "")),
+            },
+            "description": description,
+            "agent_details": {
+                "agency_name": listing.get("agencyName") or "",
+                "agent_name": agents[0].get("name", "") if agents else "",
+            },
+            "inspection_times": self._page_state_inspection_times(listing),
+            "images": self._page_state_images(listing),
+        }
+
+    def _to_int(self, value) -> Optional[int]:
+        """Convert a page-state count such as 3 or "3" to an integer."""
+        if value is None:
+            return None
+        number = re.search(r'\d+', str(value))
+        return int(number.group()) if number else None
+
+    def _page_state_inspection_times(self, listing: Dict) -> list:
+        """Inspection times from the page state, as "opening - closing" strings."""
+        times = []
+        for inspection in (listing.get("inspection") or {}).get("inspections") or []:
+            if isinstance(inspection, dict):
+                times.append(" - ".join(str(inspection[key]) for key in ("openingDateTime", "closingDateTime") if inspection.get(key)))
+            else:
+                times.append(str(inspection))
+        return times
+
+    def _page_state_images(self, listing: Dict) -> list:
+        """Full-size gallery image URLs from the page state, without duplicates."""
+        images = []
+        seen_images = set()
+        for slide in (listing.get("gallery") or {}).get("slides") or []:
+            if slide.get("mediaType", "image") != "image":
+                continue
+            src = ((slide.get("images") or {}).get("original") or {}).get("url")
+            if src and src not in seen_images:
+                images.append(src)
+                seen_images.add(src)
+        return images
+
+    def _scrape(self, driver, url: str) -> Dict:
+        """Load a listing in a checked-out driver and extract its details."""
+        driver.get(url)
+
+        # Wait for the description to render and expand it
+        try:
+            description = WebDriverWait(driver, 10, poll_frequency=CONDITION_POLL_SECONDS).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="listing-details__description"]'))
+            )
+            # Try to find and click the "Read more" button
+            read_more_buttons = description.find_elements(By.CSS_SELECTOR, 'button')
+            if read_more_buttons:
+                collapsed_length = len(description.text)
+                read_more_buttons[0].click()
+                # Wait for the content to expand
+                WebDriverWait(driver, 2, poll_frequency=CONDITION_POLL_SECONDS).until(
+                    lambda _: len(description.text) > collapsed_length
+                )
+        except Exception:
+            # If there is no description or it doesn't expand, continue with what has rendered
+            pass
+        
+        # Get the page source after JavaScript execution
+        page_source = driver.page_source
+        
+        # Parse the HTML
+        soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Extract property information
+        property_data = {
+            "basic_info": {
+                "url": url,
+                "title": self._get_text(soup, 'h3[data-testid="listing-details__description-headline"]'),
+                "property_type": self._get_property_type(soup),
+                "price": None  # Initialize price as None
+            },
+            "address": {
+                "full_address": self._get_address(soup),
+            },
+            "features": {
+                "bedrooms": self._get_feature_value(soup, "Bed"),
+                "bathrooms": self._get_feature_value(soup, "Bath"),
+                "parking": self._get_feature_value(soup, "Parking"),
+                "property_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__floor-area"]')),
+                "land_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__land-area"]')),
+            },
+            "description": self._get_text(soup, '[data-testid="listing-details__description"]'),
+            "agent_details": {
+                "agency_name": self._get_text(soup, '[data-testid="listing-details__agent-agency-name"]'),
+                "agent_name": self._get_text(soup, '[data-testid="listing-details__agent-enquiry-agent-profile-link"]'),
+            },
+            "inspection_times": self._get_inspection_times(soup),
+            "images": self._get_images(driver, soup),
+        }
+        
+        # Try different price selectors
+        price_selectors = [
+            '[data-testid="listing-details__summary-title"]',
+            '[data-testid="listing-details__price"]',
+            '[data-testid="listing-details__price-text"]',
+            '.listing-price',
+        ]
+
+        # Try each selector until we find a valid price
+        for selector in price_selectors:
+            price_element = soup.select_one(selector)
+            if price_element:
+                price = self._clean_price(price_element.get_text(strip=True))
+                if price:  # Only set if we got a valid price
+                    property_data["basic_info"]["price"] = price
+                    break
+        
+        return property_data
+
     def _get_text(self, soup: BeautifulSoup, selector: str) -> str:
         """Extract text from an element if it exists."""
         element = soup.select_one(selector)
@@ -275,12 +470,48 @@ class DomainScraper:
             times.append(element.get_text(strip=True))
         return times
 
-    def _get_images(self) -> list:
-        """Extract property images using Selenium to handle dynamic loading."""
+    def _get_images(self, driver, soup: BeautifulSoup) -> list:
+        """
+        Collect the gallery's image URLs in one pass, from the page state or the listing's DOM.
+        Only when neither has any does it click through the gallery, for at most image_time_budget seconds.
+        """
+        images = self._browser_page_state_images(driver)
+        if not images:
+            images = self._dom_images(soup)
+        if not images:
+            images = self._click_through_images(driver, time.monotonic() + self.image_time_budget)
+        return images
+
+    def _browser_page_state_images(self, driver) -> list:
+        """Gallery images from the page state the browser loaded."""
+        try:
+            state = driver.execute_script("return window.__NEXT_DATA__ || null")
+        except Exception as e:
+            logger.info(f"No page state in the browser: {e}")
+            return []
+        if not isinstance(state, dict):
+            return []
+        listing = state.get("props", {}).get("pageProps", {}).get("componentProps")
+        return self._page_state_images(listing) if isinstance(listing, dict) else []
+
+    def _dom_images(self, soup: BeautifulSoup) -> list:
+        """Gallery images already in the listing's HTML, without duplicates."""
+        images = []
+        seen_images = set()
+        for selector in GALLERY_IMAGE_SELECTORS:
+            for img in soup.select(selector):
+                src = img.get('data-src') or img.get('src')
+                if src and not src.startswith('data:') and src not in seen_images:
+                    images.append(src)
+                    seen_images.add(src)
+        return images
+
+    def _click_through_images(self, driver, deadline: Optional[float] = None) -> list:
+        """Extract property images by stepping through the gallery, stopping at the deadline (a time.monotonic value)."""
         images = []
         try:
             logger.info("Starting image extraction process...")
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(driver, 10, poll_frequency=CONDITION_POLL_SECONDS)
             
             # Find and click the Photos button
             logger.info("Looking for Photos button...")
@@ -292,7 +523,7 @@ class DomainScraper:
             
             # Wait for the gallery to load
             logger.info("Waiting for gallery to initialize...")
-            time.sleep(2)  # Give time for the gallery to initialize
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'img[class="pswp__img"]')))
             
             # Find the next button for navigation using its title
             logger.info("Looking for Next button...")
@@ -307,12 +538,15 @@ class DomainScraper:
             no_new_images_count = 0  # Track how many times we've seen no new images
             
             while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.info("Image time budget spent - finished with gallery")
+                    break
                 image_count += 1
                 logger.info(f"\nProcessing image #{image_count}")
                 
                 # Get all visible images and take the last one (rightmost)
                 logger.info("Looking for visible image elements...")
-                visible_images = self.driver.find_elements(By.CSS_SELECTOR, 'img[class="pswp__img"]')
+                visible_images = driver.find_elements(By.CSS_SELECTOR, 'img[class="pswp__img"]')
                 if not visible_images:
                     logger.info("No visible images found")
                     break
@@ -343,11 +577,18 @@ class DomainScraper:
                     logger.info("Attempting to click Next button...")
                     next_button.click()
                     logger.info("Successfully clicked Next button")
-                    time.sleep(0.5)  # Wait for the next image to load
                 except Exception as e:
                     logger.info(f"Could not click Next button: {str(e)}")
                     logger.info("Reached end of gallery")
                     break
+
+                # Wait for the next image to load
+                try:
+                    WebDriverWait(driver, 2, poll_frequency=CONDITION_POLL_SECONDS).until(
+                        lambda d: self._last_gallery_src(d) != src
+                    )
+                except TimeoutException:
+                    logger.info("Gallery image did not change after clicking Next")
             
             logger.info(f"\nImage extraction complete:")
             logger.info(f"Total images processed: {image_count}")
@@ -368,6 +609,11 @@ class DomainScraper:
         
         return images
 
+    def _last_gallery_src(self, driver) -> Optional[str]:
+        """The src of the rightmost image shown in the gallery."""
+        visible_images = driver.find_elements(By.CSS_SELECTOR, 'img[class="pswp__img"]')
+        return visible_images[-1].get_attribute('src') if visible_images else None
+
     def save_results(self, results: Dict, filename: str):
         """
         Save scraping results to a JSON file in the outputs directory.
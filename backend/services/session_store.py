@@ -0,0 +1,123 @@
+"""
+Per-session state for the borrowing endpoints.
+
+Each session holds an immutable BorrowingSession snapshot. Updates build a new
+snapshot and swap it in with a single dict assignment, so requests for different
+sessions never share mutable state and readers never see a half-written result.
+Sessions idle for longer than idle_seconds are dropped, and once there are more
+than max_sessions the least recently used are evicted first.
+The store is in-process: when running several workers, route a session to the
+same worker or replace this with a shared store.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+import logging
+from pathlib import Path
+import sys
+import time
+
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+from backend.models.borrowing_model import BorrowingResult, BorrowingResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_ID = "default"
+
+
+@dataclass(frozen=True, slots=True)
+class BorrowingSession:
+    result: Optional[BorrowingResult] = None
+    response: Optional[BorrowingResponse] = None # result.to_response(), built once per estimate
+    eligible_government_schemes: Tuple = ()
+    schemes_state: Optional[str] = None # State the schemes were checked for, to re-check them when the result changes
+
+
+EMPTY_SESSION = BorrowingSession()
+
+
+class SessionStore:
+    """
+    Bounded in-memory store of BorrowingSession snapshots keyed by session ID.
+
+    Args:
+        max_sessions: Sessions kept before the least recently used are evicted
+        idle_seconds: Sessions not touched for this long are dropped
+        clock: Time source for idle tracking, time.monotonic by default
+    """
+
+    def __init__(self, max_sessions: int = 10000, idle_seconds: float = 1800,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        # Ordered from least to most recently used, with the time each was last used
+        self._sessions: "OrderedDict[str, Tuple[BorrowingSession, float]]" = OrderedDict()
+        self._lock = Lock()
+        self.idle_evictions = 0
+        self.capacity_evictions = 0
+
+    def _evict_idle(self, now: float) -> None:
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            del self._sessions[session_id]
+            self.idle_evictions += 1
+
+    def get(self, session_id: str) -> BorrowingSession:
+        """Return the session's current snapshot, or an empty one for a new or expired session."""
+        with self._lock:
+            now = self.clock()
+            self._evict_idle(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return EMPTY_SESSION
+            self._sessions[session_id] = (entry[0], now)
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def update(self, session_id: str, **changes) -> BorrowingSession:
+        """
+        Replace fields of a session's snapshot.
+
+        Args:
+            session_id: The session to update
+            **changes: BorrowingSession fields to replace
+
+        Returns:
+            BorrowingSession: The new snapshot
+        """
+        with self._lock:
+            now = self.clock()
+            self._evict_idle(now)
+            entry = self._sessions.get(session_id)
+            session = replace(entry[0] if entry is not None else EMPTY_SESSION, **changes)
+            self._sessions[session_id] = (session, now)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                self.capacity_evictions += 1
+                logger.info(f"Session store over {self.max_sessions} sessions, evicted session {evicted}")
+        return session
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "idle_evictions": self.idle_evictions,
+                "capacity_evictions": self.capacity_evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,270 @@
+"""
+A pool of headless Chrome WebDrivers for the scraper.
+
+A WebDriver session is not thread-safe, so each scrape checks out a driver for
+its exclusive use and returns it afterwards. Browsers are started ahead of
+time, checked on checkout, and replaced in the background after max_pages
+pages or once the page's JS heap passes max_memory_mb.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Condition, Thread
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no driver became free within the checkout timeout."""
+
+
+def create_chrome_driver() -> Any:
+    """Start a headless Chrome WebDriver."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')  # Run in headless mode
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    return webdriver.Chrome(options=chrome_options)
+
+
+@dataclass(slots=True)
+class PooledDriver:
+    id: int
+    driver: Any
+    pages: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class WebDriverPool:
+    """
+    Fixed-size pool of WebDrivers with checkout/return.
+
+    Args:
+        size: Number of browsers
+        factory: Creates a driver, create_chrome_driver by default
+        max_pages: Replace a driver after it has loaded this many pages
+        max_memory_mb: Replace a driver once its page's JS heap is larger than this; None to skip the check
+        checkout_timeout: Seconds to wait for a free driver before raising PoolTimeoutError
+        prestart: Start every browser now rather than on first checkout
+    """
+
+    def __init__(self, size: int = 2, factory: Callable[[], Any] = create_chrome_driver, max_pages: int = 50,
+                 max_memory_mb: Optional[float] = 512, checkout_timeout: float = 60.0, prestart: bool = True):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.checkout_timeout = checkout_timeout
+        self._condition = Condition()
+        self._idle: Deque[PooledDriver] = deque()
+        self._live = 0 # Drivers idle, checked out or being started
+        self._waiting = 0
+        self._closed = False
+        self._ids = itertools.count(1)
+        self.created = 0
+        self.recycled = 0
+        self.unhealthy = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        if prestart:
+            self.prestart()
+
+    def prestart(self) -> None:
+        """Start browsers until the pool is full."""
+        while True:
+            with self._condition:
+                if self._closed or self._live >= self.size:
+                    return
+                self._live += 1
+            self._add(self._start())
+
+    def _start(self) -> PooledDriver:
+        try:
+            driver = self.factory()
+        except Exception as e:
+            logger.error(f"Failed to start WebDriver: {e}")
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+        logger.info("Initialized WebDriver")
+        return PooledDriver(id=next(self._ids), driver=driver)
+
+    def _add(self, pooled: PooledDriver) -> None:
+        with self._condition:
+            if not self._closed:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+            self._live -= 1
+        self._quit(pooled)
+
+    def _quit(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+            logger.info("Closed WebDriver")
+        except Exception as e:
+            logger.error(f"Error closing WebDriver: {e}")
+
+    def _healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"WebDriver {pooled.id} failed its health check: {e}")
+            return False
+
+    def _memory_mb(self, pooled: PooledDriver) -> Optional[float]:
+        try:
+            used = pooled.driver.execute_script("return window.performance.memory && window.performance.memory.usedJSHeapSize")
+        except Exception:
+            return None
+        return used / (1024 * 1024) if used else None
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Take a healthy driver for exclusive use, waiting for one to be returned if all are busy.
+
+        Args:
+            timeout: Seconds to wait, checkout_timeout by default
+
+        Returns:
+            PooledDriver: The driver, to be passed back to release
+
+        Raises:
+            PoolTimeoutError: If no driver became free in time
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        while True:
+            with self._condition:
+                waited = False
+                while not self._idle and self._live >= self.size and not self._closed:
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No WebDriver became free within {timeout} seconds")
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._closed:
+                    raise RuntimeError("The WebDriver pool is closed")
+                wait_seconds = time.monotonic() - started
+                self.checkouts += 1
+                if waited:
+                    self.waits += 1
+                self.wait_seconds += wait_seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+                if self._idle:
+                    pooled = self._idle.popleft()
+                else:
+                    # Below size with nothing idle, so start another browser
+                    self._live += 1
+                    pooled = None
+            if pooled is None:
+                return self._start()
+            if self._healthy(pooled):
+                return pooled
+            with self._condition:
+                self.unhealthy += 1
+                self._live -= 1
+            self._quit(pooled)
+
+    def release(self, pooled: PooledDriver, healthy: bool = True) -> None:
+        """
+        Return a driver after use, replacing it if it is broken or worn out.
+
+        Args:
+            pooled: The driver from checkout
+            healthy: False if the caller saw the driver fail
+        """
+        pooled.pages += 1
+        reason = None
+        if not healthy:
+            reason = "it failed"
+        elif pooled.pages >= self.max_pages:
+            reason = f"{pooled.pages} pages"
+        elif self.max_memory_mb is not None:
+            memory_mb = self._memory_mb(pooled)
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                reason = f"{memory_mb:.0f} MB of JS heap"
+        if reason is None:
+            self._add(pooled)
+            return
+
+        logger.info(f"Recycling WebDriver {pooled.id} after {reason}")
+        with self._condition:
+            if healthy:
+                self.recycled += 1
+            else:
+                self.unhealthy += 1
+        self._quit(pooled)
+        # Keep the slot reserved and start the replacement in the background, so the pool stays warm
+        Thread(target=self._replace, name="webdriver-replace", daemon=True).start()
+
+    def _replace(self) -> None:
+        with self._condition:
+            if self._closed:
+                self._live -= 1
+                return
+        try:
+            self._add(self._start())
+        except Exception:
+            # _start has logged the failure and freed the slot, so the next checkout retries
+            pass
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Check out a driver for the duration of a with block."""
+        pooled = self.checkout(timeout)
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            healthy = self._healthy(pooled)
+            raise
+        finally:
+            self.release(pooled, healthy)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": self._live - len(self._idle),
+                "waiting": self._waiting,
+                "created": self.created,
+                "recycled": self.recycled,
+                "unhealthy": self.unhealthy,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "mean_wait_seconds": self.wait_seconds / self.checkouts if self.checkouts else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+    def close(self) -> None:
+        """Quit idle browsers now; drivers still checked out are quit when they are returned."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._live -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
@@ -8,6 +8,7 @@ import BorrowingCalculator from './components/BorrowingCalculator';
 import PropertyAnalysis from './components/PropertyAnalysis';
 import PlanningStage from './components/PlanningStage';
 import { useBudgetCalculation } from './hooks/useBudgetCalculation';
+import { sessionHeaders } from './session';
 
 const initialFormData: HomeLoanFormData = {
   isFirstTimeBuyer: true,
@@ -106,9 +107,7 @@ const fetchPropertyData = async (url: string) => {
 const fetchGovernmentSchemes = async () => {
   const response = await fetch('http://localhost:8000/api/government-schemes', {
     method: 'POST',
-    headers: {
-      'Content-Type': 'application/json',
-    },
+    headers: sessionHeaders,
     body: JSON.stringify({
       state: 'NSW', // TODO: expand this to other states eventually
     }),
@@ -179,7 +178,7 @@ function AppContent() {
     debounceRef.current = setTimeout(() => {
       fetch('http://localhost:8000/api/estimate', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: sessionHeaders,
         body: JSON.stringify(getEstimatePayload(formData)),
       })
         .then(res => res.json())
@@ -2,6 +2,7 @@ import React, { useState, useRef, useEffect, ChangeEvent, FormEvent } from 'reac
 import { ChatMessage } from '../types/chat';
 import ReactMarkdown from 'react-markdown';
 import './Chat.css';
+import { sessionHeaders } from '../session';
 
 interface ChatProps {
     context?: string;
@@ -79,9 +80,7 @@ const Chat: React.FC<ChatProps> = ({ context = '', onAction }) => {
         try {
             const response = await fetch('http://localhost:8000/chat', {
                 method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
+                headers: sessionHeaders,
                 body: JSON.stringify({ message, context }),
             });
 
@@ -0,0 +1,8 @@
+// Identifies this browser tab to the backend, so its borrowing details and chat
+// history are kept separate from other users of the same server.
+export const SESSION_ID = crypto.randomUUID();
+
+export const sessionHeaders = {
+  'Content-Type': 'application/json',
+  'X-Session-ID': SESSION_ID,
+};
@@ -0,0 +1,107 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+import api.routes as routes
+from backend.models.action_schema import validate_actions
+from backend.models.chat_model import ChatModel
+from backend.models.llm_clients import FakeGeminiClient
+from helpers import make_profile
+
+client = TestClient(routes.app)
+
+
+def update(field, value):
+    return {"type": "update_field", "payload": {"field": field, "value": value}}
+
+
+def test_values_are_converted_to_profile_types():
+    validated = validate_actions([
+        update("grossIncome", "95,000"), update("hasHecs", "true"), update("dependents", "2"),
+        update("employmentType", "self-employed"), update("incomeFrequency", "Monthly"),
+        {"type": "suggested_answers", "payload": {"field": "hasHecs", "values": ["Yes", "No"]}},
+    ])
+    assert validated.changes == {
+        "grossIncome": 95000.0, "hasHecs": True, "dependents": 2,
+        "employmentType": "Self-employed", "incomeFrequency": "monthly",
+    }
+    assert len(validated.actions) == 6 and validated.rejected == []
+
+
+@pytest.mark.parametrize("action", [
+    update("grossIncome", "-5"),
+    update("grossIncome", "lots"),
+    update("grossIncome", "nan"),
+    update("dependents", "2.5"),
+    update("interestRate", "0"),
+    update("hasHecs", "maybe"),
+    update("incomeFrequency", "fortnightly"),
+    update("favouriteColour", "blue"),
+    {"type": "delete_everything", "payload": {}},
+    "not an action",
+])
+def test_invalid_actions_are_dropped(action):
+    validated = validate_actions([action, update("age", "40")])
+    assert validated.changes == {"age": 40}
+    assert len(validated.rejected) == 1
+
+
+def chat(session_id: str, reply: dict, monkeypatch) -> dict:
+    monkeypatch.setattr(routes, "chat_model", ChatModel(api_key=None, client=FakeGeminiClient(reply=json.dumps(reply)),
+                                                        response_cache_ttl=None, fast_path=False))
+    response = client.post("/chat", json={"message": "Can you update my details?", "context": ""},
+                           headers={"X-Session-ID": session_id})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_chat_applies_updates_and_returns_the_new_estimate(monkeypatch):
+    session_id = "action-schema-apply"
+    before = client.post("/api/estimate", json=make_profile().model_dump(), headers={"X-Session-ID": session_id}).json()
+    reply = {"response": "Updated", "actions": [update("grossIncome", "150000"), update("hasHecs", "maybe")]}
+    body = chat(session_id, reply, monkeypatch)
+
+    assert body["estimate"]["estimate"] > before["estimate"]
+    assert body["actions"] == [update("grossIncome", 150000.0)]
+    session = routes.session_store.get(session_id)
+    assert session.result.details.grossIncome == 150000
+    # The same result as estimating the updated profile from scratch
+    expected = client.post("/api/estimate", json=make_profile(grossIncome=150000).model_dump(), headers={"X-Session-ID": "action-schema-fresh"}).json()
+    assert body["estimate"] == expected
+
+
+def test_chat_updates_recheck_government_schemes(monkeypatch):
+    session_id = "action-schema-schemes"
+    client.post("/api/estimate", json=make_profile(grossIncome=60000).model_dump(), headers={"X-Session-ID": session_id})
+    client.post("/api/government-schemes", json={"state": "NSW"}, headers={"X-Session-ID": session_id})
+    income_requirement = lambda session: session.eligible_government_schemes[0].eligibilityRequirements[-1][1]
+    assert income_requirement(routes.session_store.get(session_id)) is True
+
+    chat(session_id, {"response": "Updated", "actions": [update("grossIncome", "200000")]}, monkeypatch)
+    assert income_requirement(routes.session_store.get(session_id)) is False
+
+
+def test_chat_answers_even_when_the_estimate_cannot_be_updated(monkeypatch):
+    session_id = "action-schema-unappliable"
+    client.post("/api/estimate", json=make_profile().model_dump(), headers={"X-Session-ID": session_id})
+
+    def fail(graph, changes):
+        raise ZeroDivisionError("float division by zero")
+    monkeypatch.setattr(routes.BorrowingGraph, "apply", fail)
+    body = chat(session_id, {"response": "At 1% you could borrow more", "actions": [update("interestRate", "1")]}, monkeypatch)
+    assert body["response"] == "At 1% you could borrow more"
+    assert body["estimate"] is None and body["actions"] == [update("interestRate", 1.0)]
+
+
+def test_chat_without_an_estimate_returns_actions_only(monkeypatch):
+    body = chat("action-schema-new", {"response": "Noted", "actions": [update("dependents", "2")]}, monkeypatch)
+    assert body["estimate"] is None
+    assert body["actions"] == [update("dependents", 2)]
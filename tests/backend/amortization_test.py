@@ -0,0 +1,68 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.amortization import amortization_schedule, iter_schedule_batches, scheduled_repayment, SCHEDULE_COLUMNS
+from models.batch_borrowing import BatchBorrowingModel
+from api.routes import app
+from helpers import make_profile
+
+
+def collect(*args, **kwargs):
+    return [row for batch in iter_schedule_batches(*args, **kwargs) for row in batch]
+
+
+def test_repayment_matches_borrowing_model():
+    result = BatchBorrowingModel().calculate([make_profile()])[0]
+    assert scheduled_repayment(result.borrowing_power, 6.0, 30) == pytest.approx(result.loan_repayment)
+
+
+def test_plain_schedule_repays_principal_over_term():
+    rows = collect([500000], [6.0], [30])
+    assert len(rows) == 360
+    assert rows[-1][1] == 360
+    assert rows[-1][5] == pytest.approx(0, abs=0.01)
+    assert sum(row[3] for row in rows) == pytest.approx(500000, abs=1)
+    assert rows[-1][6] == pytest.approx(sum(row[4] for row in rows), abs=1)
+
+
+def test_extra_repayments_and_offset_reduce_interest():
+    rows = collect([500000] * 3, [6.0] * 3, [30] * 3, [0, 1000, 0], [0, 0, 100000])
+    by_scenario = {scenario: [row for row in rows if row[0] == scenario] for scenario in range(3)}
+    plain, extra, offset = (by_scenario[scenario][-1] for scenario in range(3))
+    assert len(by_scenario[1]) < 360
+    assert len(by_scenario[2]) < 360
+    assert extra[6] < plain[6]
+    assert offset[6] < plain[6]
+
+
+def test_schedule_is_generated_in_chunks():
+    chunks = amortization_schedule(np.full(1000, 400000.0), np.full(1000, 5.0), np.full(1000, 30.0), chunk_months=12)
+    first = next(chunks)
+    assert first["balance"].shape == (1000, 12)
+    assert sum(1 for _ in chunks) == 29
+
+
+def test_streaming_endpoint_formats():
+    client = TestClient(app)
+    scenarios = [{"principal": 300000, "interestRate": 5.5, "loanTerm": 25}, {"principal": 200000, "interestRate": 0, "loanTerm": 10}]
+
+    with client.stream("POST", "/api/amortization", json={"scenarios": scenarios}) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert len(lines) == 300 + 120
+    assert set(lines[0]) == set(SCHEDULE_COLUMNS)
+
+    response = client.post("/api/amortization", json={"scenarios": scenarios, "format": "csv"})
+    csv_lines = response.text.strip().split("\n")
+    assert csv_lines[0] == ",".join(SCHEDULE_COLUMNS)
+    assert len(csv_lines) == 1 + 300 + 120
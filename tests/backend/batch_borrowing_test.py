@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.borrowing_model import BorrowingModel
+from models.batch_borrowing import BatchBorrowingModel
+from helpers import make_profile, random_profiles
+
+
+def test_batch_matches_scalar_model():
+    """Every batch row should match BorrowingModel.update_details for the same profile."""
+    profiles = random_profiles(300)
+    scalar_model = BorrowingModel()
+    batch_results = BatchBorrowingModel().calculate(profiles)
+
+    assert len(batch_results) == len(profiles)
+    for profile, batch_result in zip(profiles, batch_results):
+        scalar_model.update_details(profile)
+        expected = scalar_model.get_borrowing_response().model_dump()
+        actual = batch_result.model_dump()
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-6), key
+            else:
+                assert actual[key] == value, key
+
+
+def test_batch_handles_negative_net_income():
+    result = BatchBorrowingModel().calculate([make_profile(grossIncome=20000, livingExpenses=5000)])[0]
+    assert result.borrowing_power == 0
+    assert result.loan_repayment == 0
+
+
+def test_batch_rejects_unknown_borrowing_type():
+    with pytest.raises(ValueError):
+        BatchBorrowingModel().calculate([make_profile(borrowingType="Trust")])
+
+
+def test_batch_empty():
+    assert BatchBorrowingModel().calculate([]) == []
+
+
+def test_sensitivity_grid_matches_individual_estimates():
+    model = BatchBorrowingModel()
+    profile = make_profile(hasHecs=True, borrowingType="Couple", secondPersonIncome=60000)
+    axes = {
+        "interestRate": np.array([4.0, 6.0, 8.0]),
+        "loanTerm": np.array([20.0, 30.0]),
+        "grossIncome": np.array([60000.0, 120000.0]),
+        "livingExpenses": np.array([1000.0, 5000.0]),
+        "creditCardLimits": np.array([0.0, 20000.0]),
+    }
+    grid = model.calculate_grid(profile, axes)
+    assert grid["borrowing_power"].shape == (3, 2, 2, 2, 2)
+
+    for index in np.ndindex(grid["borrowing_power"].shape):
+        overrides = {field: float(values[i]) for (field, values), i in zip(axes.items(), index)}
+        overrides["loanTerm"] = int(overrides["loanTerm"])
+        expected = model.calculate([profile.model_copy(update=overrides)])[0]
+        assert grid["borrowing_power"][index] == pytest.approx(expected.borrowing_power)
+        assert grid["loan_repayment"][index] == pytest.approx(expected.loan_repayment)
+
+
+def test_sensitivity_grid_rejects_invalid_axes():
+    model = BatchBorrowingModel()
+    with pytest.raises(ValueError):
+        model.calculate_grid(make_profile(), {})
+    with pytest.raises(ValueError):
+        model.calculate_grid(make_profile(), {"age": np.array([30.0])})
+    with pytest.raises(ValueError):
+        model.calculate_grid(make_profile(), {field: np.arange(20.0) for field in ["interestRate", "loanTerm", "grossIncome", "livingExpenses"]})
+
+
+def test_batch_mixed_financial_years():
+    profiles = [make_profile(hasHecs=True, financialYear=year) for year in ["2023-24", "2024-25", None]]
+    scalar_model = BorrowingModel()
+    results = BatchBorrowingModel().calculate(profiles)
+    for profile, result in zip(profiles, results):
+        scalar_model.update_details(profile)
+        assert result.borrowing_power == scalar_model.get_borrowing_response().borrowing_power
+    assert results[0].borrowing_power != results[1].borrowing_power
+    assert results[1].borrowing_power == results[2].borrowing_power
+
+
+def test_borrowing_result_is_immutable():
+    from dataclasses import FrozenInstanceError
+    from models.borrowing_model import calculate_borrowing, load_assumptions
+
+    result = calculate_borrowing(make_profile(), load_assumptions())
+    with pytest.raises(FrozenInstanceError):
+        result.total_expense = 0
+    assert not hasattr(result, "__dict__")
@@ -0,0 +1,50 @@
+"""
+Benchmark the vectorized batch borrowing engine against the scalar BorrowingModel.
+
+Run from the project root:
+    python tests/backend/benchmarks/batch_borrowing_benchmark.py [rows]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.borrowing_model import BorrowingModel
+from models.batch_borrowing import BatchBorrowingModel
+from helpers import random_profiles
+
+
+def benchmark(rows: int) -> None:
+    profiles = random_profiles(rows)
+
+    scalar_model = BorrowingModel()
+    start = time.perf_counter()
+    for profile in profiles:
+        scalar_model.update_details(profile)
+        scalar_model.get_borrowing_response()
+    scalar_seconds = time.perf_counter() - start
+
+    batch_model = BatchBorrowingModel()
+    start = time.perf_counter()
+    columns = batch_model.to_columns(profiles)
+    batch_model.calculate_columns(columns)
+    engine_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_model.calculate(profiles)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"rows: {rows}")
+    print(f"scalar BorrowingModel:        {rows / scalar_seconds:>12,.0f} rows/sec")
+    print(f"batch engine (columns only):  {rows / engine_seconds:>12,.0f} rows/sec")
+    print(f"batch with BorrowingResponse: {rows / batch_seconds:>12,.0f} rows/sec")
+    print(f"speedup (with responses):     {scalar_seconds / batch_seconds:>12.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
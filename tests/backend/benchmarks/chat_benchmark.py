@@ -0,0 +1,118 @@
+"""
+Benchmark the chat pipeline offline, with a fake or replayed Gemini client.
+
+Measures the per-turn overhead of prompt building, response parsing and action
+validation, then end-to-end /chat throughput through the ASGI app.
+
+Run from the project root:
+    python tests/backend/benchmarks/chat_benchmark.py [--requests 200] [--concurrency 16] [--latency 0.2] [--replay chat.jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+import api.routes as routes
+from backend.api.models import ChatResponse
+from backend.models.chat_model import ChatModel
+from backend.models.llm_clients import FakeGeminiClient, ReplayClient
+from backend.models.stream_parser import ChatResponseStreamParser
+
+REPLY = json.dumps({
+    "response": "With a gross income of $95,000 and two dependents, your estimated borrowing power is about $520,000. "
+                "Do you have any HECS debt?",
+    "actions": [
+        {"type": "update_field", "payload": {"field": "grossIncome", "value": "95000"}},
+        {"type": "update_field", "payload": {"field": "dependents", "value": "2"}},
+        {"type": "suggested_answers", "payload": {"field": "hasHecs", "values": ["Yes", "No"]}},
+    ],
+})
+
+
+def per_call(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations
+
+
+def benchmark_overheads(iterations: int) -> None:
+    chat_model = ChatModel(api_key=None, client=FakeGeminiClient(reply=REPLY), response_cache_ttl=None)
+    for i in range(20):
+        chat_model.chat(f"Turn {i}: my income is {90000 + i * 1000} a year", context="Earns 95k", session_id="bench")
+    history = chat_model.conversations.history("bench")
+
+    build = per_call(lambda: chat_model._build_prompt("What can I borrow?", "Earns 95k", None, [], history), iterations)
+    response = chat_model.client.models.generate_content(model="m", contents="", config=None)
+    parse = per_call(lambda: chat_model._parse_response(response), iterations)
+
+    def stream_parse():
+        parser = ChatResponseStreamParser()
+        for start in range(0, len(REPLY), 16):
+            parser.feed(REPLY[start:start + 16])
+        parser.finish()
+    streamed = per_call(stream_parse, iterations)
+    validate = per_call(lambda: ChatResponse.model_validate_json(REPLY), iterations)
+
+    print(f"prompt build (20-turn history): {build * 1e6:>10.1f} us/turn")
+    print(f"response parse:                 {parse * 1e6:>10.1f} us/turn")
+    print(f"streamed response parse:        {streamed * 1e6:>10.1f} us/turn")
+    print(f"ChatResponse validation:        {validate * 1e6:>10.1f} us/turn")
+
+
+async def benchmark_throughput(client, requests: int, concurrency: int) -> None:
+    routes.chat_model = ChatModel(api_key=None, client=client, max_concurrent_requests=concurrency, response_cache_ttl=None)
+    transport = httpx.ASGITransport(app=routes.app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+        async def one(i: int):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await http.post("/chat", json={"message": f"Question {i}", "context": ""},
+                                           headers={"X-Session-ID": f"bench-{i % concurrency}"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        seconds = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"/chat requests: {requests}, concurrency: {concurrency}")
+    print(f"throughput:                     {requests / seconds:>10.1f} req/sec")
+    print(f"latency p50:                    {statistics.median(latencies) * 1000:>10.1f} ms")
+    print(f"latency p95:                    {latencies[int(len(latencies) * 0.95) - 1] * 1000:>10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated model latency in seconds")
+    parser.add_argument("--iterations", type=int, default=2000, help="Iterations for the overhead measurements")
+    parser.add_argument("--replay", help="Replay a recording (with --latency per call) instead of the fake client")
+    args = parser.parse_args()
+
+    benchmark_overheads(args.iterations)
+    if args.replay:
+        client = ReplayClient(args.replay, latency=args.latency, fallback=REPLY)
+    else:
+        client = FakeGeminiClient(reply=REPLY, base_latency=args.latency)
+    asyncio.run(benchmark_throughput(client, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark gallery image extraction offline, with fake browsers.
+
+Compares clicking through the gallery photo by photo, where the fake browser
+takes --click-latency seconds to show each photo, against reading every image
+URL in one pass from the page state or the listing's HTML.
+
+Run from the project root:
+    python tests/backend/benchmarks/scraper_benchmark.py [--photos 30] [--click-latency 0.25]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from bs4 import BeautifulSoup
+from backend.services.scraper import DomainScraper
+from backend.services.webdriver_pool import WebDriverPool
+from scraper_helpers import FakeFactory, FakeGalleryDriver, gallery_photos
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--photos", type=int, default=30)
+    parser.add_argument("--click-latency", type=float, default=0.25)
+    args = parser.parse_args()
+
+    photos = gallery_photos(args.photos)
+    scraper = DomainScraper(pool=WebDriverPool(size=1, factory=FakeFactory(), prestart=False), page_state=False)
+    state = {"props": {"pageProps": {"componentProps": {"gallery": {"slides": [
+        {"mediaType": "image", "images": {"original": {"url": url}}} for url in photos
+    ]}}}}}
+    gallery_html = "<div data-testid=\"listing-details__gallery-thumbnails\">" + "".join(
+        f'<img src="{url}">' for url in photos
+    ) + "</div>"
+    empty = BeautifulSoup("", "html.parser")
+
+    def driver(**kwargs):
+        return FakeGalleryDriver(photos, click_seconds=args.click_latency, **kwargs)
+
+    before, clicked = timed(lambda: scraper._click_through_images(driver()))
+    from_state, state_images = timed(lambda: scraper._get_images(driver(page_state=state), empty))
+    from_dom, dom_images = timed(lambda: scraper._get_images(driver(), BeautifulSoup(gallery_html, "html.parser")))
+    assert clicked == state_images == dom_images == photos
+
+    print(f"Gallery of {args.photos} photos")
+    print(f"  click through (before): {before:8.3f} s")
+    print(f"  page state (after):     {from_state * 1000:8.3f} ms")
+    print(f"  listing HTML (after):   {from_dom * 1000:8.3f} ms")
+    print(f"  speed-up:               {before / max(from_state, from_dom):8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
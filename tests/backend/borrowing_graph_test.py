@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.borrowing_model import calculate_borrowing, load_assumptions
+from models.borrowing_graph import BorrowingGraph
+from helpers import make_profile, random_profiles
+
+assumptions = load_assumptions()
+
+
+@pytest.mark.parametrize("changes, recomputed", [
+    ({"interestRate": 7.5}, ("borrowing",)),
+    ({"dependents": 2}, ("living_expenses", "total_expense", "borrowing")),
+    ({"rentBoard": 400}, ("total_expense", "borrowing")),
+    ({"hasHecs": True}, ("loan_repayments", "total_expense", "borrowing")),
+    ({"grossIncome": 120000}, ("income", "loan_repayments", "borrowing")),
+    ({"grossIncome": 120000, "hasHecs": True}, ("income", "loan_repayments", "total_expense", "borrowing")),
+    ({"age": 45}, ()),
+])
+def test_only_affected_stages_are_recomputed(changes, recomputed):
+    graph = BorrowingGraph.from_details(make_profile(), assumptions)
+    update = graph.apply(changes)
+    assert update.recomputed == recomputed
+    assert update.result == calculate_borrowing(make_profile(**changes), assumptions)
+
+
+def test_unchanged_stage_output_stops_propagation():
+    # Stated expenses stay below the HEM benchmark, so total expenses do not move
+    graph = BorrowingGraph.from_details(make_profile(livingExpenses=100), assumptions)
+    update = graph.apply({"livingExpenses": 200})
+    assert update.recomputed == ("living_expenses", "total_expense")
+    assert update.changed == {"stated_living_expenses": 2400}
+
+
+def test_reports_changed_outputs():
+    graph = BorrowingGraph.from_details(make_profile(), assumptions)
+    before = graph.result.to_response()
+    update = graph.apply({"interestRate": 7.5})
+    assert set(update.changed) == {"borrowing_power", "loan_repayment"}
+    assert update.changed["borrowing_power"] < before.borrowing_power
+    assert graph.result is update.result
+
+    assert graph.apply({"interestRate": 7.5}).changed == {}
+
+
+def test_matches_full_recalculation_for_random_deltas():
+    fields = ("hasHecs", "dependents", "grossIncome", "borrowingType", "loanPurpose")
+    profiles = random_profiles(50, seed=3)
+    for profile, other in zip(profiles, reversed(profiles)):
+        graph = BorrowingGraph(calculate_borrowing(profile, assumptions), assumptions)
+        for field in fields:
+            graph.apply({field: getattr(other, field)})
+        expected = profile.model_copy(update={field: getattr(other, field) for field in fields})
+        assert graph.result == calculate_borrowing(expected, assumptions)
+
+
+def test_invalid_change_is_rejected():
+    graph = BorrowingGraph.from_details(make_profile(), assumptions)
+    with pytest.raises(ValueError):
+        graph.apply({"dependents": "several"})
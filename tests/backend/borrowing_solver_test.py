@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.batch_borrowing import BatchBorrowingModel
+from models.borrowing_solver import BorrowingSolver
+from helpers import make_profile
+
+TARGETS = np.array([300000.0, 600000.0, 900000.0])
+
+
+def borrowing_power(profile, **overrides) -> float:
+    return BatchBorrowingModel().calculate([profile.model_copy(update=overrides)])[0].borrowing_power
+
+
+@pytest.mark.parametrize("frequency,has_hecs", [("yearly", False), ("yearly", True), ("monthly", True)])
+def test_solve_gross_income(frequency, has_hecs):
+    profile = make_profile(incomeFrequency=frequency, hasHecs=has_hecs)
+    incomes = BorrowingSolver().solve(profile, "grossIncome", TARGETS)
+    for target, income in zip(TARGETS, incomes):
+        assert borrowing_power(profile, grossIncome=income) >= target
+        assert borrowing_power(profile, grossIncome=income * 0.999) < target
+
+
+def test_solve_gross_income_finds_the_smallest_income_across_hecs_brackets():
+    # Entering a higher HECS bracket lowers borrowing power, so a higher income can fall short of a lower one
+    profile = make_profile(hasHecs=True)
+    targets = np.array([312648.0, 400000.0, 700000.0])
+    incomes = BorrowingSolver().solve(profile, "grossIncome", targets)
+    assert incomes[0] <= 66500
+
+    model = BatchBorrowingModel()
+    columns = model.to_columns([profile])
+    for target, income in zip(targets, incomes):
+        assert borrowing_power(profile, grossIncome=income) >= target
+        lower = np.linspace(0, income, 20001)[:-1]
+        assert (model.calculate_columns({**columns, "grossIncome": lower})["borrowing_power"] < target).all()
+
+
+def test_solve_living_expenses():
+    profile = make_profile(grossIncome=250000)
+    expenses = BorrowingSolver().solve(profile, "livingExpenses", TARGETS)
+    for target, expense in zip(TARGETS, expenses):
+        assert borrowing_power(profile, livingExpenses=expense) == pytest.approx(target, abs=1)
+
+
+def test_solve_living_expenses_below_hem_is_unreachable():
+    solutions = BorrowingSolver().solve(make_profile(grossIncome=80000), "livingExpenses", np.array([5000000.0]))
+    assert np.isnan(solutions[0])
+
+
+def test_solve_interest_rate():
+    profile = make_profile(grossIncome=150000)
+    rates = BorrowingSolver().solve(profile, "interestRate", TARGETS)
+    for target, rate in zip(TARGETS, rates):
+        assert borrowing_power(profile, interestRate=rate) >= target
+        assert borrowing_power(profile, interestRate=rate + 0.01) < target
+
+
+def test_solve_loan_term():
+    profile = make_profile(grossIncome=120000)
+    terms = BorrowingSolver().solve(profile, "loanTerm", np.array([300000.0, 600000.0, 5000000.0]))
+    assert np.isnan(terms[2])
+    for target, term in zip(TARGETS[:2], terms[:2]):
+        assert borrowing_power(profile, loanTerm=int(term)) >= target
+        assert borrowing_power(profile, loanTerm=int(term) - 1) < target
+
+
+def test_solve_rejects_unknown_field():
+    with pytest.raises(ValueError):
+        BorrowingSolver().solve(make_profile(), "age", TARGETS)
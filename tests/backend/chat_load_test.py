@@ -0,0 +1,113 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+import api.routes as routes
+from backend.models.chat_model import ChatModel, ChatTimeoutError
+from backend.models.llm_clients import FakeGeminiClient
+from helpers import make_profile
+
+CHAT_LATENCY = 0.3
+
+
+@pytest.fixture
+def slow_chat_model(monkeypatch):
+    chat_model = ChatModel(api_key=None, client=FakeGeminiClient(base_latency=CHAT_LATENCY), max_concurrent_requests=8)
+    monkeypatch.setattr(routes, "chat_model", chat_model)
+    return chat_model
+
+
+async def timed_estimate(http: httpx.AsyncClient, income: int) -> float:
+    started = time.perf_counter()
+    response = await http.post("/api/estimate", json=make_profile(grossIncome=income).model_dump(),
+                               headers={"X-Session-ID": "chat-load-estimate"})
+    assert response.status_code == 200
+    return time.perf_counter() - started
+
+
+def test_estimates_are_not_blocked_by_chats_in_flight(slow_chat_model):
+    async def run():
+        transport = httpx.ASGITransport(app=routes.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            chats = [
+                asyncio.create_task(http.post("/chat", json={"message": f"Question {i}", "context": ""},
+                                              headers={"X-Session-ID": f"chat-load-{i}"}))
+                for i in range(32)
+            ]
+            await asyncio.sleep(0.05)
+            latencies = [await timed_estimate(http, 80000 + i) for i in range(20)]
+            in_flight = sum(not chat.done() for chat in chats)
+            responses = await asyncio.gather(*chats)
+            return latencies, in_flight, responses
+
+    latencies, in_flight, responses = asyncio.run(run())
+    assert all(response.status_code == 200 for response in responses)
+    # Every estimate finished while chats were still waiting on the model
+    assert in_flight > 0
+    assert max(latencies) < CHAT_LATENCY / 2
+
+
+def test_concurrency_is_limited():
+    client = FakeGeminiClient(base_latency=0.05)
+    active = 0
+    peak = 0
+    generate_content = client.aio.models.generate_content
+
+    async def counting_generate_content(**kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            return await generate_content(**kwargs)
+        finally:
+            active -= 1
+
+    client.aio.models.generate_content = counting_generate_content
+    chat_model = ChatModel(api_key=None, client=client, max_concurrent_requests=3)
+
+    async def run():
+        return await asyncio.gather(*(chat_model.achat(f"Question {i}", session_id=str(i)) for i in range(12)))
+
+    results = asyncio.run(run())
+    assert len(results) == 12
+    assert peak == 3
+
+
+def test_timeout_raises_and_keeps_history_consistent():
+    chat_model = ChatModel(api_key=None, client=FakeGeminiClient(base_latency=1.0), request_timeout=0.05)
+    with pytest.raises(ChatTimeoutError):
+        asyncio.run(chat_model.achat("Hello", session_id="timeout"))
+    # The unanswered question isn't kept, so the next turn doesn't follow a dangling question
+    assert chat_model.conversations.history("timeout") == []
+
+
+def test_concurrent_turns_in_a_session_each_see_their_own_question():
+    client = FakeGeminiClient(base_latency=0.05)
+    chat_model = ChatModel(api_key=None, client=client, response_cache_ttl=None, context_cache_ttl=None)
+    questions = ["What is lenders mortgage insurance?", "How does HECS affect my borrowing?"]
+
+    async def run():
+        return await asyncio.gather(*(chat_model.achat(question, session_id="concurrent") for question in questions))
+
+    asyncio.run(run())
+    # Each prompt ends with its own question, and no question is repeated or lost
+    assert {max(questions, key=call["contents"].rfind) for call in client.calls} == set(questions)
+    assert all(call["contents"].count(question) <= 1 for call in client.calls for question in questions)
+
+
+def test_clients_without_async_api_use_the_thread_pool():
+    client = FakeGeminiClient()
+    del client.aio
+    chat_model = ChatModel(api_key=None, client=client)
+    response_text, actions = asyncio.run(chat_model.achat("Hello"))
+    assert response_text == "Thanks, I have noted that." and actions == []
+    assert chat_model._executor is not None
@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.models.chat_model import ChatModel
+from backend.models.context_cache import PromptContextCache
+from backend.models.llm_clients import FakeGeminiClient
+from helpers import FakeClock
+
+
+class FailingCaches:
+    def create(self, *, model, config=None):
+        raise ValueError("Cached content is too small")
+
+
+def test_cache_is_created_once_and_refreshed_before_expiry():
+    client = FakeGeminiClient()
+    clock = FakeClock()
+    cache = PromptContextCache(client, "model", "static prefix", ttl_seconds=600, refresh_margin=60, clock=clock)
+    name = cache.name()
+    assert name in client.cached_contents
+    clock.now = 500
+    assert cache.name() == name
+    assert cache.refreshed == 0
+
+    clock.now = 560
+    assert cache.name() == name
+    assert cache.refreshed == 1 and cache.created == 1
+
+    # Refreshed at 560, so still alive at 1000
+    clock.now = 1000
+    assert cache.name() == name
+
+
+def test_missing_cache_is_recreated():
+    client = FakeGeminiClient()
+    clock = FakeClock()
+    cache = PromptContextCache(client, "model", "static prefix", ttl_seconds=600, refresh_margin=60, clock=clock)
+    first = cache.name()
+    client.caches.delete(name=first)
+    clock.now = 550
+    second = cache.name()
+    assert second != first and cache.created == 2
+
+
+def test_failed_create_falls_back_and_retries_later():
+    client = FakeGeminiClient()
+    client.caches = FailingCaches()
+    clock = FakeClock()
+    cache = PromptContextCache(client, "model", "static prefix", retry_after=120, clock=clock)
+    assert cache.name() is None
+    clock.now = 60
+    assert cache.name() is None
+    assert cache.failures == 1
+    clock.now = 130
+    assert cache.name() is None
+    assert cache.failures == 2
+
+
+def test_chat_sends_only_the_dynamic_part():
+    client = FakeGeminiClient()
+    chat_model = ChatModel(api_key=None, client=client)
+    chat_model.chat("What can I borrow?", session_id="a")
+    chat_model.chat("And with a partner?", session_id="a")
+
+    assert len(client.cached_contents) == 1
+    for call in client.calls:
+        assert call["cached_content"] is not None
+        assert "Valid field names" not in call["contents"]
+    assert client.calls[-1]["contents"].endswith("Current question: And with a partner?\n")
+    assert "User: What can I borrow?" in client.calls[-1]["contents"]
+    metrics = chat_model.metrics()
+    assert metrics["cached_turns"] == 2 and metrics["uncached_turns"] == 0
+    assert metrics["input_tokens_saved"] >= 2 * chat_model.prompt_builder.prefix_tokens
+    assert metrics["context_cache_created"] == 1
+
+
+def test_expired_cache_falls_back_to_full_prompt():
+    client = FakeGeminiClient()
+    chat_model = ChatModel(api_key=None, client=client)
+    chat_model.chat("Hello", session_id="a")
+    client.cached_contents.clear()
+    chat_model.chat("Hello again", session_id="a")
+
+    assert client.calls[-2]["cached_content"] is not None
+    assert client.calls[-1]["cached_content"] is None
+    assert "Valid field names" in client.calls[-1]["contents"]
+    assert chat_model.metrics()["uncached_turns"] == 1
+
+
+def test_cached_turns_are_faster_with_simulated_latency():
+    latencies = []
+    cached = FakeGeminiClient(seconds_per_token=1e-3, sleep=latencies.append)
+    uncached = FakeGeminiClient(seconds_per_token=1e-3, sleep=latencies.append)
+    ChatModel(api_key=None, client=cached).chat("Hello")
+    ChatModel(api_key=None, client=uncached, context_cache_ttl=None).chat("Hello")
+    assert latencies[0] < latencies[1]
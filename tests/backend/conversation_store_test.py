@@ -0,0 +1,113 @@
+import sys
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.services.conversation_store import ConversationStore, estimate_tokens
+from backend.models.chat_model import ChatModel
+from helpers import FakeClock
+
+
+def test_turn_budget_keeps_latest_messages():
+    store = ConversationStore(max_turns=4)
+    for i in range(10):
+        store.append("a", "user", f"message {i}")
+    assert [message.content for message in store.history("a")] == [f"message {i}" for i in range(6, 10)]
+    assert store.stats()["trimmed"] == 6
+
+
+def test_token_budget_trims_oldest_but_keeps_newest():
+    store = ConversationStore(max_tokens=50)
+    store.append("a", "user", "x" * 120)
+    store.append("a", "assistant", "y" * 120)
+    assert [message.content[0] for message in store.history("a")] == ["y"]
+
+    store.append("a", "user", "z" * 1000)
+    history = store.history("a")
+    assert len(history) == 1 and history[0].tokens == estimate_tokens("z" * 1000)
+
+
+def test_sessions_are_isolated():
+    store = ConversationStore()
+    store.append("a", "user", "hello from a")
+    store.append("b", "user", "hello from b")
+    assert [message.content for message in store.history("a")] == ["hello from a"]
+    assert store.history("missing") == []
+    store.clear("a")
+    assert store.history("a") == [] and len(store) == 1
+
+
+def test_idle_sessions_are_evicted():
+    clock = FakeClock()
+    store = ConversationStore(idle_seconds=60, clock=clock)
+    store.append("old", "user", "hi")
+    clock.now = 30
+    store.append("recent", "user", "hi")
+    clock.now = 70
+    store.evict_idle()
+    assert store.history("old") == []
+    assert len(store.history("recent")) == 1
+    assert store.stats()["idle_evictions"] == 1
+
+
+def test_memory_ceiling_evicts_least_recently_active():
+    store = ConversationStore(max_bytes=4000)
+    for session in ("a", "b", "c"):
+        store.append(session, "user", "x" * 1000)
+    store.append("a", "assistant", "ok")
+    store.append("d", "user", "x" * 1000)
+    assert store.history("b") == []
+    assert store.history("a") and store.history("d")
+    assert store.stats()["bytes"] <= 4000
+
+
+def test_memory_is_bounded_under_soak():
+    store = ConversationStore(max_turns=20, max_tokens=2000, max_bytes=256 * 1024)
+
+    def soak(turns, offset):
+        for i in range(turns):
+            session = f"session-{(offset + i) % 500}"
+            store.append(session, "user", f"What if my income was {offset + i} a year? " * 5)
+            store.append(session, "assistant", f"Your borrowing power would change by {i} dollars. " * 10)
+
+    tracemalloc.start()
+    try:
+        soak(5000, 0)
+        warm, _ = tracemalloc.get_traced_memory()
+        soak(20000, 5000)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert store.stats()["bytes"] <= 256 * 1024
+    assert store.stats()["memory_evictions"] > 0
+    # Four times the work after warm-up should not grow memory beyond noise
+    assert current - warm < 256 * 1024
+
+
+def test_chat_model_keeps_history_per_session():
+    prompts = []
+
+    def generate_content(contents, model, config):
+        prompts.append(contents)
+        return SimpleNamespace(text='{"response": "Noted", "actions": []}')
+
+    chat_model = ChatModel(api_key=None, conversations=ConversationStore(max_turns=4))
+    chat_model.client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+
+    chat_model.chat("I earn 90k", session_id="a")
+    chat_model.chat("How do two kids affect that?", session_id="b")
+    assert "I earn 90k" not in prompts[-1]
+    assert chat_model.last_prompt_stats.turns_included == 0
+    assert [message.content for message in chat_model.conversations.history("a")] == ["I earn 90k", "Noted"]
+
+    chat_model.chat("Hello")
+    history = chat_model.message_history
+    assert len(history) == len(chat_model.system_messages) + 2
+    assert history[-2]["role"] == "user" and history[-2]["content"] == "Hello"
+    assert history[-1]["role"] == "assistant"
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.borrowing_model import calculate_borrowing, load_assumptions
+from models.estimate_cache import EstimateCache, DataFileVersion, profile_hash
+from helpers import FakeClock, make_profile
+
+assumptions = load_assumptions()
+
+
+def compute(request):
+    return calculate_borrowing(request, assumptions)
+
+
+def test_equivalent_profiles_share_a_key():
+    yearly = make_profile(grossIncome=52000, otherIncome=5200, incomeFrequency="yearly")
+    weekly = make_profile(grossIncome=1000, otherIncome=100, incomeFrequency="weekly")
+    assert profile_hash(yearly) == profile_hash(weekly)
+    # Second person income and rental income are ignored for individual owner-occupiers
+    assert profile_hash(yearly) == profile_hash(yearly.model_copy(update={"secondPersonIncome": 90000, "rentalIncome": 500}))
+    assert profile_hash(yearly) != profile_hash(yearly.model_copy(update={"hasHecs": True}))
+    assert profile_hash(yearly) == profile_hash(yearly.model_copy(update={"financialYear": "2024-25"}))
+
+
+def test_hit_returns_result_for_the_new_request():
+    cache = EstimateCache()
+    yearly = make_profile(grossIncome=52000, incomeFrequency="yearly")
+    weekly = make_profile(grossIncome=1000, incomeFrequency="weekly")
+    first = cache.get_or_compute(yearly, compute)
+    second = cache.get_or_compute(weekly, compute)
+    assert second.borrowing_power == first.borrowing_power
+    assert second.details is weekly
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = EstimateCache(max_size=2, ttl_seconds=10, clock=clock)
+    profiles = [make_profile(grossIncome=income) for income in (60000, 70000, 80000)]
+    for profile in profiles[:2]:
+        cache.get_or_compute(profile, compute)
+    cache.get_or_compute(profiles[0], compute)  # profiles[1] is now least recently used
+    cache.get_or_compute(profiles[2], compute)
+    assert cache.get(profiles[1]) is None
+    assert cache.get(profiles[0]) is not None
+    assert cache.stats()["evictions"] == 1
+
+    clock.now = 11
+    assert cache.get(profiles[0]) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_version_change_invalidates(tmp_path):
+    data_file = tmp_path / "assumptions.json"
+    data_file.write_text('{"version": 1}')
+    reloads = []
+    cache = EstimateCache(version=DataFileVersion([data_file], check_interval=0), on_invalidate=lambda: reloads.append(True))
+    profile = make_profile()
+    cache.get_or_compute(profile, compute)
+    assert cache.get(profile) is not None
+
+    data_file.write_text('{"version": 22}')
+    assert cache.get(profile) is None
+    assert cache.stats()["invalidations"] == 1
+    assert reloads == [True]
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.api.models import ChatResponse
+from backend.models.chat_model import ChatModel
+from backend.models.field_extractor import FieldExtractor
+from backend.models.llm_clients import FakeGeminiClient
+
+
+def updates(message, previous_answer=None):
+    extracted = FieldExtractor().extract(message, previous_answer)
+    if extracted is None:
+        return None
+    return {action["payload"]["field"]: action["payload"]["value"] for action in extracted[1]}
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("I earn 95k a year", {"grossIncome": "95000", "incomeFrequency": "yearly"}),
+    ("I earn $1,500 a fortnight", {"grossIncome": "39000", "incomeFrequency": "yearly"}),
+    ("my salary is 2000 per week", {"grossIncome": "2000", "incomeFrequency": "weekly"}),
+    ("My partner earns 80k per annum", {"secondPersonIncome": "80000", "secondPersonIncomeFrequency": "yearly"}),
+    ("2 kids", {"dependents": "2"}),
+    ("I don't have any kids", {"dependents": "0"}),
+    ("no HECS", {"hasHecs": "false"}),
+    ("I have a HECS debt", {"hasHecs": "true"}),
+    ("I'm not a first home buyer", {"isFirstTimeBuyer": "false"}),
+    ("living expenses are 600 a fortnight", {"livingExpenses": "1300"}),
+    ("we get 2,600 a month in rental income", {"rentalIncome": "600"}),
+    ("I'm 32 years old", {"age": "32"}),
+    ("30 year loan at 6.2%", None),
+    ("30 year loan", {"loanTerm": "30"}),
+    ("I'm self-employed", {"employmentType": "Self-employed"}),
+    ("credit card limit of 5000", {"creditCardLimits": "5000"}),
+    ("I have a $2,000 credit card", {"creditCardLimits": "2000"}),
+    ("car loan repayments of $450 a month", {"loanRepayment": "450"}),
+    ("car loan repayments of 450 dollars a month", {"loanRepayment": "450"}),
+    ("I earn 95k a year, no HECS and two kids",
+     {"grossIncome": "95000", "incomeFrequency": "yearly", "hasHecs": "false", "dependents": "2"}),
+])
+def test_extracts_fields(message, expected):
+    assert updates(message) == expected
+
+
+@pytest.mark.parametrize("message", [
+    "What can I borrow?",
+    "I earn 95k",  # No frequency
+    "I earn 90k after tax",
+    "I earn 95k a year and 100k a year",
+    "I have HECS and no HECS",
+    "Hello",
+    "My partner is a nurse",
+    "I have 2 credit cards",  # A count of cards, not a limit
+    "I have 3 credit cards",
+    "2 repayments a month",
+])
+def test_ambiguous_messages_fall_through(message):
+    assert updates(message) is None
+
+
+def test_yes_or_no_answers_the_last_question():
+    assert updates("Yes", "Do you have any HECS debt?") == {"hasHecs": "true"}
+    assert updates("nope", "Are you a first home buyer?") == {"isFirstTimeBuyer": "false"}
+    assert updates("Yes", "Shall I explain LMI?") is None
+    assert updates("Yes") is None
+
+
+def test_actions_match_the_chat_response_schema():
+    response_text, actions = FieldExtractor().extract("I earn 1k a week, 2 kids and no HECS")
+    ChatResponse(response=response_text, actions=actions)
+    assert response_text == "Thanks, I've updated your gross income to $1,000 a week, dependents to 2 and HECS debt to no."
+
+
+def test_chat_skips_the_model_for_data_entry():
+    client = FakeGeminiClient(base_latency=0.02)
+    chat_model = ChatModel(api_key=None, client=client, response_cache_ttl=None)
+    chat_model.chat("What can I borrow?", session_id="a")
+    response_text, actions = chat_model.chat("I earn 95k a year", session_id="a")
+    asyncio.run(chat_model.achat("2 kids", session_id="a"))
+    assert len(client.calls) == 1
+    assert actions[0]["payload"] == {"field": "grossIncome", "value": "95000"}
+    assert [message.role for message in chat_model.conversations.history("a")] == ["user", "assistant"] * 3
+
+    metrics = chat_model.metrics()
+    assert metrics["fast_path_hits"] == 2 and metrics["fast_path_misses"] == 1
+    assert metrics["fast_path_latency_saved"] > 0
+
+    disabled = ChatModel(api_key=None, client=client, fast_path=False)
+    disabled.chat("I earn 95k a year")
+    assert len(client.calls) == 2
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.borrowing_model import load_government_schemes
+from models.government_schemes import SchemeRulesEngine
+from helpers import make_profile
+
+engine = SchemeRulesEngine(load_government_schemes())
+
+
+def test_single_profile_labels_and_results():
+    schemes = engine.check("NSW", make_profile(borrowingType="Individual"), 100000)
+    assert [scheme.name for scheme in schemes] == ["First Home Buyers Assistance Scheme", "First Home Super Saver Scheme"]
+    assert schemes[0].eligibilityRequirements == [
+        ("Owner-occupied", True),
+        ("First time buyer", True),
+        ("Household income below $125,000", True),
+    ]
+
+
+def test_thresholds_come_from_the_scheme_file():
+    schemes = {
+        "VIC": {"first_home_schemes": {"Grant": {
+            "name": "Grant", "eligibility": "", "offer": "",
+            "eligibilityRequirements": {"borrowingType": {"Individual": {"householdIncome": 90000}, "Couple": {"householdIncome": 150000}}},
+        }}}
+    }
+    requirement = SchemeRulesEngine(schemes).check("VIC", make_profile(borrowingType="Couple"), 140000)[0].eligibilityRequirements[0]
+    assert requirement == ("Household income below $150,000", True)
+
+
+def test_vectorized_evaluation_across_profiles():
+    profiles = [
+        make_profile(borrowingType="Individual", isFirstTimeBuyer=True, loanPurpose="Owner-occupied"),
+        make_profile(borrowingType="Individual", isFirstTimeBuyer=False, loanPurpose="Investor"),
+        make_profile(borrowingType="Couple", isFirstTimeBuyer=True, loanPurpose="Owner-occupied"),
+        make_profile(borrowingType="Couple", isFirstTimeBuyer=True, loanPurpose="Owner-occupied"),
+    ]
+    incomes = np.array([125000, 80000, 150000, 250000])
+    results = engine.evaluate(profiles, incomes, ["NSW"] * 4)
+    met = [[met for _, met in result[0].eligibilityRequirements] for result in results]
+    assert met == [[True, True, True], [False, False, True], [True, True, True], [True, True, False]]
+    assert results[3][0].eligibilityRequirements[2][0] == "Household income below $200,000"
+    for profile, income, result in zip(profiles, incomes, results):
+        assert result == engine.check("NSW", profile, income)
+
+
+def test_unknown_state():
+    with pytest.raises(ValueError):
+        engine.check("TAS", make_profile(), 100000)
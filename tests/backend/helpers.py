@@ -0,0 +1,82 @@
+"""
+Helpers shared by the backend tests and benchmarks.
+
+Test modules import these by name, with tests/backend on sys.path.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+from api.models import EstimateRequest
+
+
+class FakeClock:
+    """A time source that only moves when now is set."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_profile(**overrides) -> EstimateRequest:
+    profile = dict(
+        isFirstTimeBuyer=True,
+        grossIncome=95000,
+        incomeFrequency="yearly",
+        otherIncome=0,
+        otherIncomeFrequency="yearly",
+        secondPersonIncome=0,
+        secondPersonIncomeFrequency="yearly",
+        secondPersonOtherIncome=0,
+        secondPersonOtherIncomeFrequency="yearly",
+        rentalIncome=0,
+        livingExpenses=2000,
+        rentBoard=0,
+        dependents=0,
+        creditCardLimits=0,
+        loanRepayment=0,
+        hasHecs=False,
+        age=30,
+        employmentType="Full-time",
+        loanPurpose="Owner-occupied",
+        loanTerm=30,
+        interestRate=6.0,
+        borrowingType="Individual",
+    )
+    profile.update(overrides)
+    return EstimateRequest(**profile)
+
+
+def random_profiles(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    income_ranges = {"weekly": (500, 4000), "monthly": (2000, 20000), "yearly": (0, 400000)}
+    profiles = []
+    for i in range(n):
+        frequency = list(income_ranges)[i % 3]
+        profiles.append(make_profile(
+            grossIncome=float(rng.uniform(*income_ranges[frequency])),
+            incomeFrequency=frequency,
+            otherIncome=float(rng.uniform(0, 500)),
+            secondPersonIncome=float(rng.uniform(0, 150000)),
+            secondPersonOtherIncome=float(rng.uniform(0, 10000)),
+            rentalIncome=float(rng.uniform(0, 900)),
+            livingExpenses=float(rng.uniform(0, 6000)),
+            rentBoard=float(rng.uniform(0, 3000)),
+            dependents=int(rng.integers(0, 6)),
+            creditCardLimits=float(rng.uniform(0, 30000)),
+            loanRepayment=float(rng.uniform(0, 1500)),
+            hasHecs=bool(rng.integers(0, 2)),
+            loanPurpose="Investor" if rng.integers(0, 2) else "Owner-occupied",
+            loanTerm=int(rng.integers(10, 31)),
+            interestRate=float(rng.uniform(3, 9)),
+            borrowingType="Couple" if rng.integers(0, 2) else "Individual",
+        ))
+    return profiles
@@ -0,0 +1,108 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.services.listing_cache import ListingCache, normalise_listing_url
+from helpers import FakeClock
+from scraper_helpers import FIXTURES, LISTING_URL, FakeSession, make_scraper
+
+PROPERTY_DATA = {"basic_info": {"url": LISTING_URL, "price": 1250000}, "images": ["https://rimh2.domainstatic.com.au/photo-1.jpg"]}
+
+
+@pytest.mark.parametrize("url", [
+    LISTING_URL,
+    LISTING_URL + "/",
+    LISTING_URL + "?utm_source=newsletter#gallery",
+    LISTING_URL.replace("www.domain.com.au", "WWW.Domain.com.au").replace("https", "HTTPS"),
+])
+def test_urls_are_normalised(url):
+    assert normalise_listing_url(url) == LISTING_URL
+
+
+def test_entries_are_fresh_until_the_ttl_passes():
+    clock = FakeClock()
+    cache = ListingCache(":memory:", ttl_seconds=60, clock=clock)
+    assert cache.get(LISTING_URL) is None
+    cache.put(LISTING_URL + "?ref=search", PROPERTY_DATA, etag='"v1"')
+
+    cached = cache.get(LISTING_URL)
+    assert cached.fresh and cached.property_data == PROPERTY_DATA and cached.etag == '"v1"'
+    clock.now = 61
+    assert not cache.get(LISTING_URL).fresh
+    cache.revalidated(LISTING_URL)
+    assert cache.get(LISTING_URL).fresh
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"], stats["revalidations"]) == (2, 1, 1, 1)
+
+
+def test_least_recently_read_entries_are_evicted():
+    clock = FakeClock()
+    cache = ListingCache(":memory:", max_entries=2, clock=clock)
+    for i in range(2):
+        clock.now = i
+        cache.put(f"{LISTING_URL}-{i}", PROPERTY_DATA)
+    clock.now = 2
+    cache.get(f"{LISTING_URL}-0")
+    clock.now = 3
+    cache.put(f"{LISTING_URL}-2", PROPERTY_DATA)
+
+    assert cache.get(f"{LISTING_URL}-1") is None
+    assert cache.get(f"{LISTING_URL}-0") is not None and cache.get(f"{LISTING_URL}-2") is not None
+    assert cache.stats()["size"] == 2 and cache.stats()["evictions"] == 1
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cache" / "listings.sqlite3")
+    cache = ListingCache(path)
+    cache.put(LISTING_URL, PROPERTY_DATA)
+    cache.close()
+    assert ListingCache(path).get(LISTING_URL).property_data == PROPERTY_DATA
+
+
+def test_repeat_searches_are_answered_from_the_cache():
+    session = FakeSession((FIXTURES / "domain_listing.html").read_text())
+    scraper, _ = make_scraper(session, cache=ListingCache(":memory:"))
+    first = scraper.get_property_data(LISTING_URL)
+
+    started = time.perf_counter()
+    assert scraper.get_property_data(LISTING_URL + "?ref=search") == first
+    assert time.perf_counter() - started < 0.05
+    assert len(session.urls) == 1
+    assert scraper.stats()["cache"]["hits"] == 1
+
+
+def test_stale_entries_are_revalidated_with_the_etag():
+    clock = FakeClock()
+    session = FakeSession((FIXTURES / "domain_listing.html").read_text(), etag='"v1"')
+    scraper, _ = make_scraper(session, cache=ListingCache(":memory:", ttl_seconds=60, clock=clock))
+    first = scraper.get_property_data(LISTING_URL)
+
+    # Unchanged: one conditional request, answered 304, and the cached copy is reused
+    clock.now = 61
+    assert scraper.get_property_data(LISTING_URL) == first
+    assert len(session.urls) == 2 and scraper.stats()["cache"]["revalidations"] == 1
+
+    # Changed: the listing is scraped again
+    clock.now = 200
+    session.etag = '"v2"'
+    assert scraper.get_property_data(LISTING_URL) == first
+    assert len(session.urls) == 4
+    assert scraper.cache.get(LISTING_URL).etag == '"v2"'
+
+
+def test_failed_scrapes_are_not_cached():
+    def chrome_fails():
+        raise RuntimeError("chrome failed to start")
+
+    scraper, _ = make_scraper(FakeSession(error=ConnectionError("connection reset")), cache=ListingCache(":memory:"))
+    scraper.pool.factory = chrome_fails
+    assert scraper.get_property_data(LISTING_URL) is None
+    assert scraper.cache.stats()["size"] == 0
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.models.chat_model import ChatModel
+from backend.models.llm_clients import (
+    FakeGeminiClient, RecordingClient, ReplayClient, ReplayMissError, create_llm_client,
+)
+
+QUESTIONS = ["How much can I borrow on 95k a year?", "Does having two kids change that?", "What can I borrow?"]
+
+
+def numbered_replies():
+    count = 0
+
+    def reply(prompt):
+        nonlocal count
+        count += 1
+        return json.dumps({"response": f"Answer {count}", "actions": []})
+    return reply
+
+
+def run_conversation(chat_model: ChatModel):
+    answers = [chat_model.chat(QUESTIONS[0], session_id="s")[0]]
+    answers.append(asyncio.run(chat_model.achat(QUESTIONS[1], session_id="s"))[0])
+
+    async def stream():
+        return [data async for event, data in chat_model.astream_chat(QUESTIONS[2], session_id="s") if event == "done"][0]
+    answers.append(asyncio.run(stream()))
+    return answers
+
+
+def test_record_then_replay_is_deterministic(tmp_path):
+    path = tmp_path / "chat.jsonl"
+    recorded = run_conversation(ChatModel(api_key=None, client=RecordingClient(FakeGeminiClient(reply=numbered_replies()), path)))
+    assert recorded == ["Answer 1", "Answer 2", "Answer 3"]
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 3 and all(line["cached"] for line in lines)
+
+    for _ in range(2):
+        replay = ReplayClient(path)
+        assert run_conversation(ChatModel(api_key=None, client=replay)) == recorded
+        assert replay.misses == 0
+
+
+def test_replay_miss(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+    with pytest.raises(ReplayMissError):
+        ChatModel(api_key=None, client=ReplayClient(path)).chat("Hello")
+
+    fallback = '{"response": "Offline", "actions": []}'
+    assert ChatModel(api_key=None, client=ReplayClient(path, fallback=fallback)).chat("Hello")[0] == "Offline"
+
+
+def test_replay_latency(tmp_path):
+    path = tmp_path / "chat.jsonl"
+    ChatModel(api_key=None, client=RecordingClient(FakeGeminiClient(), path)).chat("Hello")
+    exchange = json.loads(path.read_text())
+    exchange["latency"] = 0.25
+    path.write_text(json.dumps(exchange) + "\n")
+
+    sleeps = []
+    ChatModel(api_key=None, client=ReplayClient(path, latency=None, sleep=sleeps.append)).chat("Hello")
+    ChatModel(api_key=None, client=ReplayClient(path, latency=0.1, sleep=sleeps.append)).chat("Hello")
+    assert sleeps == [0.25, 0.1]
+
+
+def test_create_llm_client(tmp_path):
+    assert create_llm_client("gemini") is None
+    assert isinstance(create_llm_client("fake", latency=0.5), FakeGeminiClient)
+    with pytest.raises(ValueError):
+        create_llm_client("replay")
+    with pytest.raises(ValueError):
+        create_llm_client("offline")
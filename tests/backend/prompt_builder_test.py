@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.models.prompt_builder import PromptBuilder
+from backend.services.conversation_store import ConversationStore
+
+
+def conversation(turns: int, length: int = 200):
+    store = ConversationStore(max_turns=10000, max_tokens=10**9)
+    for i in range(turns):
+        store.append("a", "user", f"question {i} " + "q" * length)
+        store.append("a", "assistant", f"answer {i} " + "a" * length)
+    return store.history("a")
+
+
+def test_static_prefix_is_rendered_once():
+    builder = PromptBuilder(["Be helpful.", "Be brief."])
+    first = builder.build("What can I borrow?", [])
+    second = builder.build("And with a partner?", conversation(2))
+    assert first.prefix is second.prefix
+    assert first.prefix.startswith("System: Be helpful.\nSystem: Be brief.")
+    assert "Valid field names" in first.prefix
+    assert first.stats.prefix_tokens == second.stats.prefix_tokens
+
+
+def test_short_history_is_included_in_full():
+    prompt = PromptBuilder(["Be helpful."]).build("Next?", conversation(3), context="Earns 90k")
+    assert prompt.stats.turns_included == 6
+    assert prompt.stats.turns_summarised == prompt.stats.turns_dropped == 0
+    assert "question 0" in prompt.dynamic and "answer 2" in prompt.dynamic
+    assert prompt.dynamic.endswith("Current question: Next?\n")
+    assert "Chat history: Earns 90k" in prompt.dynamic
+
+
+def test_long_history_is_summarised_within_budget():
+    builder = PromptBuilder(["Be helpful."], max_tokens=2000, summary_chars=40)
+    prompt = builder.build("Next?", conversation(100))
+    stats = prompt.stats
+    assert stats.total_tokens <= 2000
+    assert stats.turns_included + stats.turns_summarised + stats.turns_dropped == 200
+    assert stats.turns_summarised > 0 and stats.turns_dropped > 0
+    # The newest turns are kept verbatim
+    assert "answer 99 " + "a" * 200 in prompt.dynamic
+    assert "Earlier conversation (summarised):" in prompt.dynamic
+    assert "question 0" not in prompt.dynamic
+
+
+def test_history_budget_shrinks_with_large_details():
+    builder = PromptBuilder(["Be helpful."], max_tokens=3000)
+    small = builder.build("Next?", conversation(50)).stats
+    large = builder.build("Next?", conversation(50), context="x" * 4000).stats
+    assert large.turns_included < small.turns_included
+    assert large.total_tokens <= 3000
@@ -0,0 +1,72 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.services.rate_limiter import HostRateLimiter
+from helpers import FakeClock
+
+LISTING = "https://www.domain.com.au/1-example-street-marrickville-nsw-2204-2019123456"
+
+
+def make_limiter(**kwargs):
+    clock = FakeClock()
+    sleeps = []
+    return HostRateLimiter(clock=clock, sleep=sleeps.append, **kwargs), clock, sleeps
+
+
+def test_requests_within_the_burst_are_not_delayed():
+    limiter, clock, sleeps = make_limiter(rate=0.5, burst=3)
+    assert [limiter.acquire(LISTING) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert sleeps == []
+    assert limiter.tokens("www.domain.com.au") == 0
+
+
+def test_an_empty_bucket_waits_only_for_the_next_token():
+    limiter, clock, sleeps = make_limiter(rate=0.5, burst=1)
+    limiter.acquire(LISTING)
+    assert limiter.acquire(LISTING) == pytest.approx(2.0)
+    # A third request queued behind the second waits for the token after it
+    assert limiter.acquire(LISTING) == pytest.approx(4.0)
+
+    # Once the budget has refilled, requests go straight through again
+    clock.now = 100
+    assert limiter.acquire(LISTING) == 0.0
+    assert sleeps == [pytest.approx(2.0), pytest.approx(4.0)]
+
+
+def test_each_host_has_its_own_bucket():
+    limiter, clock, sleeps = make_limiter(rate=1, burst=1)
+    limiter.acquire(LISTING)
+    assert limiter.acquire("https://maps.googleapis.com/maps/api/distancematrix/json") == 0.0
+    assert limiter.acquire(LISTING) == pytest.approx(1.0)
+    assert set(limiter.stats()["tokens"]) == {"www.domain.com.au", "maps.googleapis.com"}
+
+
+def test_stats_report_waits_and_queue_depth():
+    limiter = HostRateLimiter(rate=20, burst=1)
+    threads = [threading.Thread(target=limiter.acquire, args=(LISTING,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    assert limiter.stats()["queued"] > 0
+    for thread in threads:
+        thread.join()
+
+    stats = limiter.stats()
+    assert stats["acquired"] == 4 and stats["waits"] == 3 and stats["queued"] == 0
+    assert stats["max_wait_seconds"] == pytest.approx(0.15, abs=0.01)
+    assert stats["mean_wait_seconds"] == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"burst": 0}])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        HostRateLimiter(**kwargs)
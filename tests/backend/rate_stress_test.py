@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from models.rate_stress import StressTester, StressTestSettings, simulate_repayments
+from models.amortization import scheduled_repayment
+from api.routes import app
+from helpers import make_profile
+
+
+def test_constant_rates_match_scheduled_repayment():
+    rates = np.full((3, 5), 6.0)
+    repayments = simulate_repayments(500000, 30, rates)
+    assert repayments == pytest.approx(np.full((3, 5), scheduled_repayment(500000, 6.0, 30) * 12))
+
+
+def test_seeded_runs_are_reproducible_across_workers():
+    profiles = [make_profile(grossIncome=income) for income in range(60000, 160000, 5000)]
+    settings = StressTestSettings(paths=500, seed=42)
+    inline = StressTester(max_workers=0, chunk_size=4).run(profiles, settings)
+    pooled_tester = StressTester(max_workers=2, chunk_size=4)
+    try:
+        pooled = pooled_tester.run(profiles, settings)
+    finally:
+        pooled_tester.shutdown()
+    assert inline == pooled
+    assert inline != StressTester().run(profiles, StressTestSettings(paths=500, seed=43))
+
+
+def test_zero_volatility_never_exceeds_at_borrowing_power():
+    # Borrowing power is sized with a 3% buffer, so repayments at the current rate fit within net income
+    result = StressTester().run([make_profile()], StressTestSettings(paths=100, volatility=0, seed=1))[0]
+    assert result.probability_exceeds_income == 0
+
+
+def test_larger_loans_and_volatility_raise_exceedance():
+    profile = make_profile()
+    tester = StressTester()
+    calm = tester.run([profile], StressTestSettings(paths=2000, volatility=0.5, seed=7))[0]
+    wild = tester.run([profile], StressTestSettings(paths=2000, volatility=3, seed=7))[0]
+    stretched = tester.run([profile], StressTestSettings(paths=2000, volatility=0.5, seed=7), [800000])[0]
+    assert wild.probability_exceeds_income > calm.probability_exceeds_income
+    assert stretched.probability_exceeds_income > calm.probability_exceeds_income
+    assert len(calm.yearly_exceedance_probability) == 5
+    assert set(calm.rate_percentiles) == {"p5", "p50", "p95"}
+
+
+def test_stress_endpoint():
+    client = TestClient(app)
+    response = client.post("/api/estimate/stress", json={"profile": make_profile().model_dump(), "options": {"paths": 200, "seed": 3}})
+    assert response.status_code == 200
+    assert 0 <= response.json()["probability_exceeds_income"] <= 1
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.models.chat_model import FALLBACK_REPLY, ChatModel, ChatTimeoutError
+from backend.models.llm_clients import DEFAULT_REPLY, FakeGeminiClient
+from backend.models.resilience import CallTimeoutError, CircuitBreaker, ResilienceSettings, ResilientClient, request_deadline
+from helpers import FakeClock
+
+
+class ScriptedClient(FakeGeminiClient):
+    """Fake client whose calls fail or take the given time, in order."""
+
+    def __init__(self, script, **kwargs):
+        super().__init__(**kwargs)
+        self.script = list(script)
+
+    def _reply(self, model, prompt, cached, input_tokens):
+        step = self.script.pop(0) if self.script else 0.0
+        if isinstance(step, Exception):
+            raise step
+        return DEFAULT_REPLY, step
+
+
+def generate(client):
+    return client.models.generate_content(model="m", contents="Hello", config=None)
+
+
+def agenerate(client):
+    return asyncio.run(client.aio.models.generate_content(model="m", contents="Hello", config=None))
+
+
+def test_transient_errors_are_retried_with_jittered_backoff():
+    sleeps = []
+    fake = ScriptedClient([ConnectionError("reset"), ConnectionError("reset"), 0.0])
+    client = ResilientClient(fake, ResilienceSettings(retries=2, backoff=0.2), jitter=lambda: 0.5, sleep=sleeps.append)
+    assert generate(client).text == DEFAULT_REPLY
+    assert sleeps == [0.1, 0.2]
+    assert client.stats()["retries"] == 2 and client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retries_are_bounded_and_other_errors_are_not_retried():
+    fake = ScriptedClient([ConnectionError("reset")] * 3)
+    client = ResilientClient(fake, ResilienceSettings(retries=1), sleep=lambda seconds: None)
+    with pytest.raises(ConnectionError):
+        generate(client)
+    assert len(fake.calls) == 2
+
+    fake = ScriptedClient([ValueError("bad request")])
+    client = ResilientClient(fake, ResilienceSettings(retries=3), sleep=lambda seconds: None)
+    with pytest.raises(ValueError):
+        generate(client)
+    assert len(fake.calls) == 1
+
+
+@pytest.mark.parametrize("call", [generate, agenerate])
+def test_each_attempt_has_a_deadline(call):
+    client = ResilientClient(ScriptedClient([1.0]), ResilienceSettings(deadline=0.05, retries=0))
+    started = time.perf_counter()
+    with pytest.raises(CallTimeoutError):
+        call(client)
+    assert time.perf_counter() - started < 0.5
+    assert client.stats()["timeouts"] == 1
+
+
+def test_retries_only_use_the_time_left_in_the_request():
+    fake = ScriptedClient([1.0] * 3)
+    client = ResilientClient(fake, ResilienceSettings(deadline=15, retries=2, backoff=0))
+    started = time.perf_counter()
+    with request_deadline(started + 0.1), pytest.raises(CallTimeoutError):
+        generate(client)
+    assert time.perf_counter() - started < 0.5
+    assert client.stats()["retries"] == 0
+
+
+def test_slow_requests_are_hedged_after_p95():
+    fake = ScriptedClient([0.01] * 20 + [2.0, 0.01])
+    client = ResilientClient(fake, ResilienceSettings(hedge=True, hedge_min_samples=20))
+    for _ in range(20):
+        agenerate(client)
+    started = time.perf_counter()
+    assert agenerate(client).text == DEFAULT_REPLY
+    assert time.perf_counter() - started < 1.0
+    stats = client.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+def test_open_circuit_fails_fast_to_a_canned_reply():
+    clock = FakeClock()
+    fake = ScriptedClient([ConnectionError("down")] * 2)
+    client = ResilientClient(fake, ResilienceSettings(retries=0, failure_threshold=2, reset_after=30), clock=clock)
+    chat_model = ChatModel(api_key=None, client=client, resilience=None, response_cache_ttl=None, fast_path=False)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            chat_model.chat("What can I borrow?", session_id="s")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    assert chat_model.chat("What can I borrow?", session_id="s") == (FALLBACK_REPLY, [])
+    assert asyncio.run(chat_model.achat("What can I borrow?", session_id="s")) == (FALLBACK_REPLY, [])
+    assert len(fake.calls) == 2
+    assert chat_model.metrics()["circuit_short_circuits"] == 2
+    # Failed and short-circuited turns leave no unanswered questions in the history
+    assert chat_model.conversations.history("s") == []
+
+    # After reset_after a trial call goes through and closes the circuit
+    clock.now = 31
+    response_text, actions = chat_model.chat("What can I borrow?", session_id="s")
+    assert response_text == json.loads(DEFAULT_REPLY)["response"]
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_a_cancelled_trial_call_does_not_keep_the_circuit_open():
+    clock = FakeClock()
+    fake = ScriptedClient([1.0, 0.0])
+    client = ResilientClient(fake, ResilienceSettings(failure_threshold=1, reset_after=30), clock=clock)
+    client.breaker.record_failure()
+    clock.now = 31
+
+    async def cancelled_trial():
+        await asyncio.wait_for(client.aio.models.generate_content(model="m", contents="Hello", config=None), timeout=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(cancelled_trial())
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert agenerate(client).text == DEFAULT_REPLY
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_streaming_sends_the_canned_reply_while_the_circuit_is_open():
+    client = ResilientClient(FakeGeminiClient(), ResilienceSettings(failure_threshold=1))
+    client.breaker.record_failure()
+    chat_model = ChatModel(api_key=None, client=client, resilience=None)
+
+    async def stream():
+        return [event async for event in chat_model.astream_chat("What can I borrow?")]
+    assert asyncio.run(stream()) == [("token", FALLBACK_REPLY), ("actions", []), ("done", FALLBACK_REPLY)]
+
+
+def test_model_timeouts_surface_as_chat_timeouts():
+    chat_model = ChatModel(api_key=None, client=ScriptedClient([1.0]), resilience=ResilienceSettings(deadline=0.05, retries=0))
+    with pytest.raises(ChatTimeoutError):
+        asyncio.run(chat_model.achat("What can I borrow?"))
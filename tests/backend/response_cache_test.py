@@ -0,0 +1,85 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.models.chat_model import ChatModel
+from backend.models.llm_clients import FakeGeminiClient
+from backend.models.response_cache import ResponseCache, normalise_question, state_hash
+from helpers import FakeClock
+
+
+def test_normalise_question():
+    assert normalise_question("  What is LMI?? ") == normalise_question("what is   lmi")
+    assert normalise_question("What is a fixed-rate mortgage?") == "what is a fixed rate mortgage"
+
+
+def test_profile_independent_questions_ignore_state():
+    cache = ResponseCache(profile_independent=["What is LMI?"])
+    key = cache.key("what is lmi", lambda: state_hash("Earns 90k", None, [], None))
+    assert key == ("what is lmi", None)
+    cache.put(key, "Lenders mortgage insurance...", [])
+    assert cache.get(cache.key("What is LMI?", lambda: "other state")) == ("Lenders mortgage insurance...", [])
+
+
+def test_profile_dependent_answers_are_keyed_by_state():
+    cache = ResponseCache()
+    first = cache.key("Can I afford 800k?", lambda: state_hash("Earns 90k", None, [], None))
+    second = cache.key("Can I afford 800k?", lambda: state_hash("Earns 150k", None, [], None))
+    cache.put(first, "Not quite", [])
+    assert cache.get(first) == ("Not quite", [])
+    assert cache.get(second) is None
+
+
+def test_lru_and_ttl_eviction():
+    clock = FakeClock()
+    cache = ResponseCache(max_size=2, ttl_seconds=60, clock=clock)
+    for question in ("a", "b"):
+        cache.put((question, "s"), question.upper(), [])
+    cache.get(("a", "s"))
+    cache.put(("c", "s"), "C", [])
+    assert cache.get(("b", "s")) is None
+    assert cache.get(("a", "s")) == ("A", [])
+    clock.now = 61
+    assert cache.get(("a", "s")) is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["expirations"] == 1
+
+
+def test_profile_independent_answers_never_carry_field_updates():
+    cache = ResponseCache(profile_independent=["What is HEM?"])
+    key = cache.key("What is HEM?", lambda: "state")
+    cache.put(key, "HEM is...", [{"type": "update_field", "payload": {"field": "dependents", "value": "2"}}])
+    assert cache.get(key) is None
+
+
+def test_generic_questions_skip_the_model_across_sessions():
+    client = FakeGeminiClient()
+    chat_model = ChatModel(api_key=None, client=client)
+    chat_model.chat("What is LMI?", context="Earns 90k", session_id="a")
+    chat_model.chat("what is lmi", context="Earns 150k", session_id="b")
+    asyncio.run(chat_model.achat("What is LMI?", session_id="c"))
+    assert len(client.calls) == 1
+    # The cached answer is still recorded in each session's conversation
+    assert [message.role for message in chat_model.conversations.history("b")] == ["user", "assistant"]
+    assert chat_model.metrics()["response_cache_hits"] == 2
+
+
+def test_profile_dependent_questions_reuse_answers_for_the_same_state_only():
+    client = FakeGeminiClient()
+    chat_model = ChatModel(api_key=None, client=client)
+    chat_model.chat("Can I afford 800k?", context="Earns 90k", session_id="a")
+    chat_model.chat("Can I afford 800k?", context="Earns 90k", session_id="b")
+    chat_model.chat("Can I afford 800k?", context="Earns 150k", session_id="c")
+    assert len(client.calls) == 2
+
+
+def test_response_cache_can_be_disabled():
+    client = FakeGeminiClient()
+    chat_model = ChatModel(api_key=None, client=client, response_cache_ttl=None)
+    chat_model.chat("What is LMI?", session_id="a")
+    chat_model.chat("What is LMI?", session_id="b")
+    assert len(client.calls) == 2
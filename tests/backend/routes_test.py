@@ -0,0 +1,93 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+import api.routes as routes
+from api.routes import app
+from helpers import make_profile
+
+client = TestClient(app)
+
+
+def estimate(session_id: str, **overrides) -> dict:
+    response = client.post(
+        "/api/estimate",
+        json=make_profile(**overrides).model_dump(),
+        headers={"X-Session-ID": session_id}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_sessions_do_not_share_results():
+    low = estimate("routes-test-low", grossIncome=60000)
+    high = estimate("routes-test-high", grossIncome=200000)
+    assert low["estimate"] < high["estimate"]
+
+    low_schemes = client.post("/api/government-schemes", json={"state": "NSW"}, headers={"X-Session-ID": "routes-test-low"})
+    high_schemes = client.post("/api/government-schemes", json={"state": "NSW"}, headers={"X-Session-ID": "routes-test-high"})
+    income_requirement = lambda response: response.json()["schemes"][0]["eligibilityRequirements"][-1]
+    assert income_requirement(low_schemes)[1] is True
+    assert income_requirement(high_schemes)[1] is False
+
+
+def test_government_schemes_without_estimate():
+    response = client.post("/api/government-schemes", json={"state": "NSW"}, headers={"X-Session-ID": "routes-test-empty"})
+    assert response.status_code == 400
+
+
+def test_requests_without_a_session_id_are_given_their_own_session():
+    first = client.post("/api/estimate", json=make_profile(grossIncome=60000).model_dump())
+    second = client.post("/api/estimate", json=make_profile(grossIncome=200000).model_dump())
+    assert first.headers["X-Session-ID"] != second.headers["X-Session-ID"]
+
+    # The issued ID carries the session's estimate into later requests
+    schemes = client.post("/api/government-schemes", json={"state": "NSW"},
+                          headers={"X-Session-ID": first.headers["X-Session-ID"]})
+    assert schemes.status_code == 200 and "X-Session-ID" not in schemes.headers
+    assert client.post("/api/government-schemes", json={"state": "NSW"}).status_code == 400
+
+
+def test_concurrent_estimates_are_isolated():
+    incomes = [50000 + 5000 * i for i in range(40)]
+    expected = {income: estimate("routes-test-expected", grossIncome=income)["estimate"] for income in incomes}
+
+    def run(income):
+        return income, estimate(f"routes-test-concurrent-{income}", grossIncome=income)["estimate"]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for income, result in executor.map(run, incomes * 5):
+            assert result == expected[income]
+
+
+def test_scraper_stats_do_not_start_the_scraper():
+    manager = routes.ServiceManager()
+    app.dependency_overrides[routes.get_service_manager] = lambda: manager
+    try:
+        response = client.get("/property/scraper/stats")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.json() == {"started": False, "page_state": None, "pool": None, "rate_limiter": None, "cache": None}
+    assert manager._scraper is None
+
+
+def test_batch_government_schemes_are_bounded():
+    item = {"state": "NSW", "profile": make_profile().model_dump()}
+    assert client.post("/api/government-schemes/batch", json={"items": [item]}).status_code == 200
+    assert client.post("/api/government-schemes/batch", json={"items": []}).status_code == 422
+    assert client.post("/api/government-schemes/batch", json={"items": [item] * 1001}).status_code == 422
+
+
+def test_batch_estimates_are_bounded():
+    profile = make_profile().model_dump()
+    assert client.post("/api/estimate/batch", json={"profiles": [profile]}).status_code == 200
+    assert client.post("/api/estimate/batch", json={"profiles": []}).status_code == 422
+    assert client.post("/api/estimate/batch", json={"profiles": [profile] * 1001}).status_code == 422
@@ -0,0 +1,161 @@
+"""
+Fake browsers, pages and scrapers shared by the scraper tests and benchmarks.
+"""
+
+import itertools
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+from backend.services.rate_limiter import HostRateLimiter
+from backend.services.scraper import DomainScraper
+from backend.services.webdriver_pool import WebDriverPool
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LISTING_URL = "https://www.domain.com.au/1-example-street-marrickville-nsw-2204-2019123456"
+
+LISTING_HTML = """
+<html><body>
+<h3 data-testid="listing-details__description-headline">Sunny family home</h3>
+<div data-testid="listing-summary-address">1 Example St, Sydney NSW 2000</div>
+<div data-testid="listing-details__summary-title">$1,250,000</div>
+</body></html>
+"""
+
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver; loading a page takes page_seconds."""
+
+    ids = itertools.count(1)
+
+    def __init__(self, page_seconds=0.0, heap_mb=10, page_source=LISTING_HTML, page_state=None):
+        self.id = next(self.ids)
+        self.page_seconds = page_seconds
+        self.heap_mb = heap_mb
+        self.alive = True
+        self.quit_called = False
+        self.page_source = page_source
+        self.page_state = page_state
+
+    def get(self, url):
+        if not self.alive:
+            raise ConnectionError("chrome not reachable")
+        time.sleep(self.page_seconds)
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise ConnectionError("chrome not reachable")
+        if "__NEXT_DATA__" in script:
+            return self.page_state
+        if "usedJSHeapSize" in script:
+            return self.heap_mb * 1024 * 1024
+        return 1
+
+    def find_element(self, by, value):
+        raise RuntimeError(f"No element matches {value}")
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(**self.kwargs)
+        self.drivers.append(driver)
+        return driver
+
+
+class FakeSession:
+    """Serves a fixed page, or raises the given error, in place of requests.Session."""
+
+    def __init__(self, text="", error=None, etag=None):
+        self.text = text
+        self.error = error
+        self.etag = etag
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.urls.append(url)
+        if self.error is not None:
+            raise self.error
+        status_code = 304 if self.etag and (headers or {}).get('If-None-Match') == self.etag else 200
+        return SimpleNamespace(text=self.text, status_code=status_code, headers={'ETag': self.etag} if self.etag else {},
+                               raise_for_status=lambda: None, close=lambda: None)
+
+
+class FakeElement:
+    def __init__(self, on_click=None, **attributes):
+        self.on_click = on_click
+        self.attributes = attributes
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.on_click()
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakeGalleryDriver(FakeDriver):
+    """A listing whose photos can only be found by stepping through a looping PhotoSwipe gallery."""
+
+    def __init__(self, photos, click_seconds=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.photos = photos
+        self.click_seconds = click_seconds
+        self.index = None
+        self.clicks = 0
+
+    def find_element(self, by, value):
+        if "photos" in value:
+            return FakeElement(self._open)
+        if self.index is not None and "Next" in value:
+            return FakeElement(self._next)
+        if self.index is not None and "pswp__img" in value:
+            return self.find_elements(by, value)[-1]
+        if self.index is not None and "close" in value:
+            return FakeElement(self._close)
+        raise RuntimeError(f"No element matches {value}")
+
+    def find_elements(self, by, value):
+        if self.index is None:
+            return []
+        return [FakeElement(src=self.photos[self.index], alt="")]
+
+    def _open(self):
+        time.sleep(self.click_seconds)
+        self.index = 0
+
+    def _next(self):
+        time.sleep(self.click_seconds)
+        self.clicks += 1
+        self.index = (self.index + 1) % len(self.photos)
+
+    def _close(self):
+        self.index = None
+
+
+def gallery_photos(count):
+    return [f"https://rimh2.domainstatic.com.au/photo-{i}.jpg" for i in range(1, count + 1)]
+
+
+def make_scraper(session, cache=None):
+    factory = FakeFactory()
+    scraper = DomainScraper(pool=WebDriverPool(size=1, factory=factory, prestart=False),
+                            rate_limiter=HostRateLimiter(rate=1000, burst=100), cache=cache)
+    scraper.session = session
+    return scraper, factory
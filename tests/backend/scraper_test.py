@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from scraper_helpers import FIXTURES, LISTING_URL, FakeGalleryDriver, FakeSession, gallery_photos, make_scraper
+
+
+def test_listings_are_read_from_the_page_state_without_a_browser():
+    scraper, factory = make_scraper(FakeSession((FIXTURES / "domain_listing.html").read_text()))
+    property_data = scraper.get_property_data(LISTING_URL)
+
+    assert factory.drivers == []
+    assert property_data["basic_info"] == {
+        "url": LISTING_URL, "title": "Sunny family home close to the park", "property_type": "House", "price": 1250000,
+    }
+    assert property_data["address"]["full_address"] == "1 Example Street, Marrickville NSW 2204"
+    assert property_data["features"] == {"bedrooms": 4, "bathrooms": 2, "parking": 1, "property_size": 180.0, "land_size": 450.0}
+    assert property_data["description"] == "A light-filled four bedroom home.\nWalk to the station and the park."
+    assert property_data["agent_details"] == {"agency_name": "Example Realty", "agent_name": "Sam Agent"}
+    assert property_data["inspection_times"] == ["2024-05-04T10:00:00 - 2024-05-04T10:30:00"]
+    assert property_data["images"] == [f"https://rimh2.domainstatic.com.au/photo-{i}.jpg" for i in (1, 2, 3)]
+    stats = scraper.stats()
+    assert stats["page_state"] == {"hits": 1, "misses": 0, "hit_rate": 1.0}
+    assert stats["rate_limiter"]["acquired"] == 1 and stats["rate_limiter"]["waits"] == 0
+
+
+@pytest.mark.parametrize("session", [
+    FakeSession("<html><body>No page state here</body></html>"),
+    FakeSession('<script id="__NEXT_DATA__" type="application/json">{"props": {"pageProps": {}}}</script>'),
+    FakeSession('<script id="__NEXT_DATA__" type="application/json">{not json</script>'),
+    FakeSession(error=requests.ConnectionError("connection reset")),
+])
+def test_the_browser_is_used_when_the_page_state_is_missing(session):
+    scraper, factory = make_scraper(session)
+    property_data = scraper.get_property_data(LISTING_URL)
+
+    assert len(factory.drivers) == 1
+    assert property_data["basic_info"]["price"] == 1250000
+    assert scraper.stats()["page_state"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+
+
+def test_gallery_images_come_from_the_browsers_page_state_in_one_pass():
+    state = {"props": {"pageProps": {"componentProps": {"gallery": {"slides": [
+        {"mediaType": "image", "images": {"original": {"url": url}}} for url in gallery_photos(30) * 2
+    ]}}}}}
+    scraper, _ = make_scraper(FakeSession())
+    driver = FakeGalleryDriver(gallery_photos(30), page_state=state)
+    assert scraper._get_images(driver, BeautifulSoup("", "html.parser")) == gallery_photos(30)
+    assert driver.clicks == 0
+
+
+def test_gallery_images_come_from_the_dom_when_there_is_no_page_state():
+    scraper, _ = make_scraper(FakeSession())
+    soup = BeautifulSoup((FIXTURES / "domain_listing_gallery.html").read_text(), "html.parser")
+    driver = FakeGalleryDriver(gallery_photos(3))
+    assert scraper._get_images(driver, soup) == gallery_photos(3)
+    assert driver.clicks == 0
+
+
+def test_clicking_through_the_gallery_is_a_bounded_last_resort():
+    scraper, _ = make_scraper(FakeSession())
+    driver = FakeGalleryDriver(gallery_photos(4))
+    assert scraper._get_images(driver, BeautifulSoup("", "html.parser")) == gallery_photos(4)
+    assert driver.index is None
+
+    scraper.image_time_budget = 0
+    assert scraper._get_images(FakeGalleryDriver(gallery_photos(4)), BeautifulSoup("", "html.parser")) == []
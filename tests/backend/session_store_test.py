@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.services.session_store import EMPTY_SESSION, SessionStore
+from helpers import FakeClock
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = SessionStore(max_sessions=2, clock=FakeClock())
+    store.update("a", eligible_government_schemes=("a",))
+    store.update("b", eligible_government_schemes=("b",))
+    store.get("a")
+    store.update("c", eligible_government_schemes=("c",))
+
+    assert store.get("b") is EMPTY_SESSION
+    assert store.get("a").eligible_government_schemes == ("a",)
+    assert len(store) == 2 and store.stats()["capacity_evictions"] == 1
+
+
+def test_idle_sessions_are_dropped():
+    clock = FakeClock()
+    store = SessionStore(idle_seconds=60, clock=clock)
+    store.update("idle", eligible_government_schemes=("idle",))
+    clock.now = 30
+    store.update("active", eligible_government_schemes=("active",))
+    clock.now = 61
+
+    assert store.get("idle") is EMPTY_SESSION
+    assert store.get("active").eligible_government_schemes == ("active",)
+    assert store.stats()["idle_evictions"] == 1
+
+
+def test_max_sessions_must_be_positive():
+    with pytest.raises(ValueError):
+        SessionStore(max_sessions=0)
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+import api.routes as routes
+from backend.models.chat_model import ChatModel
+from backend.models.llm_clients import FakeGeminiClient
+from backend.models.stream_parser import ChatResponseStreamParser
+
+DOCUMENT = json.dumps({
+    "response": 'Fixed rates stay the same, "locked" for 1–5 years.\nRates: 6% 😀 \\ done',
+    "actions": [{"type": "suggested_answers", "payload": {"response": "ignored", "answers": ["Yes", "No"]}}],
+})
+
+
+def parse(document: str, chunk_size: int):
+    parser = ChatResponseStreamParser()
+    streamed = "".join(parser.feed(document[i:i + chunk_size]) for i in range(0, len(document), chunk_size))
+    return streamed, parser.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, len(DOCUMENT)])
+def test_streamed_text_matches_full_parse(chunk_size):
+    expected = json.loads(DOCUMENT)
+    streamed, (response_text, actions) = parse(DOCUMENT, chunk_size)
+    assert streamed == expected["response"]
+    assert response_text == expected["response"]
+    assert actions == expected["actions"]
+
+
+def test_non_ascii_escapes_split_across_chunks():
+    document = json.dumps({"response": "café 😀", "actions": []}, ensure_ascii=True)
+    for chunk_size in range(1, 8):
+        assert parse(document, chunk_size)[0] == "café 😀"
+
+
+def test_actions_before_response():
+    document = '{"actions": [{"type": "update_field", "payload": {"field": "hasHecs", "value": "true"}}], "response": "Updated"}'
+    streamed, (response_text, actions) = parse(document, 4)
+    assert streamed == response_text == "Updated"
+    assert actions[0]["payload"]["field"] == "hasHecs"
+
+
+def test_text_is_emitted_before_the_document_completes():
+    parser = ChatResponseStreamParser()
+    assert parser.feed('{"respo') == ""
+    assert parser.feed('nse": "Hel') == "Hel"
+    assert parser.feed('lo') == "lo"
+
+
+def test_invalid_json_falls_back_to_raw_text():
+    streamed, (response_text, actions) = parse("Sorry, something went wrong", 5)
+    assert streamed == ""
+    assert response_text == "Sorry, something went wrong" and actions == []
+
+
+def test_stream_endpoint_sends_tokens_then_actions(monkeypatch):
+    reply = json.dumps({"response": "A fixed-rate mortgage keeps the same rate for a set term.", "actions": [
+        {"type": "suggested_answers", "payload": {"field": "hasHecs", "values": ["Yes", "No"]}}
+    ]})
+    client = FakeGeminiClient(reply=reply, base_latency=0.05, stream_chunk_chars=8, chunk_interval=0.02)
+    monkeypatch.setattr(routes, "chat_model", ChatModel(api_key=None, client=client))
+
+    async def run():
+        transport = httpx.ASGITransport(app=routes.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            response = await http.post("/chat/stream", json={"message": "What is a fixed-rate mortgage?", "context": ""},
+                                       headers={"X-Session-ID": "stream-test"})
+            return response.headers["content-type"], response.text
+
+    content_type, body = asyncio.run(run())
+    assert content_type.startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in body.strip().split("\n\n")
+    ]
+    names = [name for name, _ in events]
+    assert names.count("token") > 1
+    assert names[-2:] == ["actions", "done"]
+    assert "".join(data["text"] for name, data in events if name == "token") == json.loads(reply)["response"]
+    assert events[-2][1]["actions"] == json.loads(reply)["actions"]
+    history = routes.chat_model.conversations.history("stream-test")
+    assert [message.role for message in history] == ["user", "assistant"]
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+from models.tax_rates import calculate_tax, calculate_tax_array, get_tax_table, available_financial_years
+from models.hec_rates import calculate_hecs_repayment, calculate_hecs_repayment_array
+
+INCOMES = np.array([0, 18200, 18201, 45000, 60000, 135000, 150000, 190000, 250000, 54435, 54436, 159663, 200000], dtype=float)
+
+
+def test_cumulative_tax_is_precomputed_from_brackets():
+    # These were hard-coded in the original 2024-25 table
+    assert get_tax_table("2024-25").brackets.base_amounts == pytest.approx([0, 0, 4288, 31288, 51638])
+    assert get_tax_table("2023-24").brackets.base_amounts == pytest.approx([0, 0, 5092, 29467, 51667])
+
+
+def test_tax_values():
+    assert calculate_tax(18200) == pytest.approx(18200 * 0.02)
+    assert calculate_tax(100000) == pytest.approx(4288 + 55000 * 0.3 + 2000)
+    assert calculate_tax(100000, "2023-24") == pytest.approx(5092 + 55000 * 0.325 + 2000)
+    assert calculate_tax(300000) == pytest.approx(51638 + 110000 * 0.45 + 6000)
+
+
+def test_hecs_values():
+    assert calculate_hecs_repayment(54435) == 0
+    assert calculate_hecs_repayment(54436) == pytest.approx(544.36)
+    assert calculate_hecs_repayment(200000) == pytest.approx(20000)
+    assert calculate_hecs_repayment(60000, "2023-24") == pytest.approx(60000 * 0.02)
+
+
+@pytest.mark.parametrize("financial_year", available_financial_years())
+def test_array_variants_match_scalar(financial_year):
+    np.testing.assert_allclose(
+        calculate_tax_array(INCOMES, financial_year),
+        [calculate_tax(income, financial_year) for income in INCOMES]
+    )
+    np.testing.assert_allclose(
+        calculate_hecs_repayment_array(INCOMES, financial_year),
+        [calculate_hecs_repayment(income, financial_year) for income in INCOMES]
+    )
+
+
+def test_tables_are_compiled_once():
+    assert get_tax_table("2024-25") is get_tax_table("2024-25")
+
+
+def test_invalid_financial_year():
+    with pytest.raises(ValueError):
+        calculate_tax(50000, "1999-00")
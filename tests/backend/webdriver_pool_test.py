@@ -0,0 +1,130 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add the project root and backend directories to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+sys.path.append(project_root + '/backend')
+sys.path.append(project_root + '/tests/backend')
+from backend.services.rate_limiter import HostRateLimiter
+from backend.services.scraper import DomainScraper
+from backend.services.webdriver_pool import PoolTimeoutError, WebDriverPool
+from scraper_helpers import FakeFactory
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_browsers_are_started_up_front_and_reused():
+    factory = FakeFactory()
+    pool = WebDriverPool(size=2, factory=factory)
+    assert len(factory.drivers) == 2
+    for _ in range(5):
+        with pool.driver() as driver:
+            assert driver in factory.drivers
+    stats = pool.stats()
+    assert stats["created"] == 2 and stats["checkouts"] == 5 and stats["idle"] == 2 and stats["in_use"] == 0
+
+
+def test_dead_browsers_are_replaced_on_checkout():
+    factory = FakeFactory()
+    pool = WebDriverPool(size=1, factory=factory)
+    factory.drivers[0].alive = False
+    with pool.driver() as driver:
+        assert driver is factory.drivers[1]
+    assert factory.drivers[0].quit_called
+    assert pool.stats()["unhealthy"] == 1
+
+
+def test_browsers_are_recycled_after_max_pages():
+    factory = FakeFactory()
+    pool = WebDriverPool(size=1, factory=factory, max_pages=3)
+    for _ in range(3):
+        with pool.driver() as driver:
+            assert driver is factory.drivers[0]
+    wait_for(lambda: pool.stats()["idle"] == 1)
+    assert factory.drivers[0].quit_called and len(factory.drivers) == 2
+    assert pool.stats()["recycled"] == 1
+
+
+def test_browsers_are_recycled_above_the_memory_threshold():
+    factory = FakeFactory(heap_mb=600)
+    pool = WebDriverPool(size=1, factory=factory, max_memory_mb=512)
+    with pool.driver():
+        pass
+    wait_for(lambda: len(factory.drivers) == 2 and pool.stats()["idle"] == 1)
+    assert factory.drivers[0].quit_called
+
+    pool = WebDriverPool(size=1, factory=FakeFactory(heap_mb=600), max_memory_mb=None)
+    with pool.driver():
+        pass
+    assert pool.stats()["recycled"] == 0
+
+
+def test_a_failed_scrape_replaces_the_browser_only_if_it_died():
+    factory = FakeFactory()
+    pool = WebDriverPool(size=1, factory=factory)
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("page layout changed")
+    assert pool.stats()["unhealthy"] == 0
+
+    with pytest.raises(ConnectionError):
+        with pool.driver() as driver:
+            driver.alive = False
+            driver.get("https://www.domain.com.au/1")
+    wait_for(lambda: pool.stats()["idle"] == 1)
+    assert pool.stats()["unhealthy"] == 1 and len(factory.drivers) == 2
+
+
+def test_checkout_waits_for_a_free_browser_and_times_out():
+    pool = WebDriverPool(size=1, factory=FakeFactory())
+    pooled = pool.checkout()
+    with pytest.raises(PoolTimeoutError):
+        pool.checkout(timeout=0.05)
+
+    threading.Timer(0.1, pool.release, args=(pooled,)).start()
+    assert pool.checkout(timeout=2).driver is pooled.driver
+    stats = pool.stats()
+    assert stats["waits"] == 1 and stats["max_wait_seconds"] >= 0.1
+
+
+def test_close_quits_idle_and_returned_browsers():
+    factory = FakeFactory()
+    pool = WebDriverPool(size=2, factory=factory)
+    pooled = pool.checkout()
+    pool.close()
+    assert [driver.quit_called for driver in factory.drivers].count(True) == 1
+    pool.release(pooled)
+    assert all(driver.quit_called for driver in factory.drivers)
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+
+
+def scrape_all(scraper, urls):
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return list(executor.map(scraper.get_property_data, urls))
+
+
+def test_scraper_throughput_scales_with_pool_size():
+    urls = [f"https://www.domain.com.au/listing-{i}" for i in range(8)]
+    elapsed = {}
+    for size in (1, 4):
+        scraper = DomainScraper(pool=WebDriverPool(size=size, factory=FakeFactory(page_seconds=0.05)), page_state=False,
+                                rate_limiter=HostRateLimiter(rate=1000, burst=100))
+        started = time.perf_counter()
+        results = scrape_all(scraper, urls)
+        elapsed[size] = time.perf_counter() - started
+        assert [result["basic_info"]["url"] for result in results] == urls
+        assert results[0]["basic_info"]["price"] == 1250000
+        assert scraper.stats()["pool"]["checkouts"] == 8
+    assert elapsed[4] < elapsed[1] / 2